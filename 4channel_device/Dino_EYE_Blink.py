@@ -1,30 +1,19 @@
-import serial
-import pyautogui
-      
-# =================== USER SETTINGS ===================
-SERIAL_PORT = "COM11"  # Change to match your Arduino port (e.g., "COM3" on Windows, "/dev/ttyUSB0" on Linux/Mac)
-BAUD_RATE = 500000    # Must match the Arduino's baud 
-
-                      
-
-# =================== SETUP SERIAL ===================     
-try:
-    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-    print(f"Listening on {SERIAL_PORT} at {BAUD_RATE} baud...")
-except serial.SerialException as e:
-    print(f"Error: {e}")
-    exit()                         
-
-# =================== MAIN LOOP ===================
-while True:                                           
-    try:
-        line = ser.readline().decode("utf-8").strip()  # Read serial data
-        if line == "BLINK":
-            print("Eye Blink Detected! Pressing SPACEBAR...")
-            pyautogui.press("space")  # Simulate spacebar press
-    except Exception as e:       
-        print(f"Error: {e}")
-        break
-
-# Close serial connection when done
-ser.close()         
\ No newline at end of file
+from eeg_core.blink import FakeKeySink, run
+
+# =================== USER SETTINGS ===================
+SERIAL_PORT = "COM11"  # Change to match your Arduino port (e.g., "COM3" on Windows, "/dev/ttyUSB0" on Linux/Mac)
+BAUD_RATE = 500000    # Must match the Arduino's baud rate
+FS = 512              # Sampling rate of the Arduino stream (raw mode)
+# "firmware": eye_blink.ino detects blinks and prints BLINK
+# "raw":      the Arduino streams Time,Fp1,Fp2 (try.ino) and blinks are detected
+#             here; SERIAL_PORT may also be a recorded CSV or "synthetic"
+MODE = "firmware"
+KEY = "space"
+DRY_RUN = False       # True: log key presses instead of sending them
+
+# =================== MAIN LOOP ===================
+# Key presses happen on a separate thread, so a slow press never stalls the
+# serial reads; Ctrl+C stops and prints the blink-to-keypress latencies
+if __name__ == "__main__":
+    run(SERIAL_PORT, mode=MODE, fs=FS, baud_rate=BAUD_RATE, key=KEY,
+        press=FakeKeySink() if DRY_RUN else None)
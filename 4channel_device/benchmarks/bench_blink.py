@@ -0,0 +1,148 @@
+"""
+Benchmark: host-side blink detection and key dispatch (eeg_core.blink).
+
+Detection: synthetic Fp1 with known blink onsets (eeg_core.sources
+SyntheticEEG) at several blink amplitudes and noise levels, fed in
+BLOCK-sample blocks to BlinkDetector with the adaptive threshold and with a
+fixed FIXED_UV threshold. Reports recall, false positives per minute, the
+onset error and the time per block.
+
+Dispatch: DURATION seconds of real-time synthetic signal through an
+AcquisitionEngine, pressing a FakeKeySink that takes PRESS_SECONDS (like
+pyautogui's default 0.1 s pause) either inline on the acquisition thread,
+as the old read loop did, or through KeyDispatcher. Reports the
+blink-to-keypress latency histogram and how long the acquisition thread was
+held up per block.
+
+Firmware mode: FIRMWARE_BLINKS "BLINK" lines replayed to `run(mode=
+"firmware")` in RECORD_BYTES-byte pieces, so most lines arrive split over
+two reads, as they do when a serial read times out mid-line. Every blink
+must still be pressed.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_blink
+"""
+
+import time
+
+import numpy as np
+
+from eeg_core.acquisition import AcquisitionEngine
+from eeg_core.acquisition import READ_TIMEOUT
+from eeg_core.blink import BlinkDetector, FakeKeySink, KeyDispatcher, format_histogram, latency_histogram, run
+from eeg_core.replay import ReplayPort
+from eeg_core.sources import SyntheticEEG, SyntheticPort
+
+# =================== USER SETTINGS ===================
+FS = 512
+MINUTES = 10               # of signal per detection scenario
+BLOCK = 16                 # samples per block
+SCENARIOS = ((100.0, 3.0), (100.0, 10.0), (60.0, 3.0), (300.0, 10.0))  # (blink uV, noise uV)
+FIXED_UV = 50.0
+MATCH_MS = (-50, 300)      # detection counts if within this window of a true onset
+DURATION = 30              # seconds per dispatch mode
+PRESS_SECONDS = 0.1
+FIRMWARE_BLINKS = 10
+FIRMWARE_INTERVAL = 0.5    # s between BLINK lines (more than the debounce)
+RECORD_BYTES = 4           # bytes released per replayed record
+SEED = 0
+
+
+class RecordedEEG(SyntheticEEG):
+    """SyntheticEEG remembering every blink onset it draws."""
+
+    def reset(self):
+        self.onsets = []
+        super().reset()
+
+    def _draw_blink(self, after):
+        onset = super()._draw_blink(after)
+        self.onsets.append(onset)
+        return onset
+
+
+def detect(blink_uv, noise_uv, **detector_kwargs):
+    eeg = RecordedEEG(FS, noise_uv=noise_uv, blink_uv=blink_uv, seed=SEED)
+    detector = BlinkDetector(FS, **detector_kwargs)
+    found, worst, start = [], 0.0, time.perf_counter()
+    for _ in range(MINUTES * 60 * FS // BLOCK):
+        block = eeg.generate(BLOCK)
+        t0 = time.perf_counter()
+        found += [blink.sample for blink in detector.process(block[:, 1], block[:, 0])]
+        worst = max(worst, time.perf_counter() - t0)
+    per_block = (time.perf_counter() - start) / (MINUTES * 60 * FS // BLOCK)
+
+    # Onsets inside the warm-up can't be detected; leave them out
+    truth = np.array([t for t in eeg.onsets if detector.warmup <= t < eeg.position])
+    found = np.array(found)
+    lo, hi = (int(ms * FS / 1000) for ms in MATCH_MS)
+    matched, errors, used = 0, [], np.zeros(len(found), dtype=bool)
+    for onset in truth:  # each detection matches one onset at most
+        hits = np.flatnonzero((found >= onset + lo) & (found <= onset + hi) & ~used)
+        if len(hits):
+            used[hits[0]] = True
+            matched += 1
+            errors.append((found[hits[0]] - onset) / FS * 1000)
+    false = len(found) - matched
+    return matched / max(len(truth), 1), false / MINUTES, np.median(errors) if errors else np.nan, per_block, worst
+
+
+def dispatch(inline):
+    sink = FakeKeySink(PRESS_SECONDS)
+    engine = AcquisitionEngine(SyntheticPort(FS, speed=1.0, duration=DURATION, seed=SEED), fs=FS)
+    detector = BlinkDetector(FS)
+    dispatcher = KeyDispatcher(sink)
+    latencies, held = [], []
+
+    def on_block(block):
+        arrival = time.perf_counter()
+        blinks = detector.process(block[:, 1], block[:, 0], arrival)
+        if inline:
+            for blink in blinks:
+                latencies.append(time.perf_counter() - blink.arrival)
+                sink("space")
+        elif blinks:
+            dispatcher.submit(blinks)
+        held.append(time.perf_counter() - arrival)
+
+    if not inline:
+        dispatcher.start()
+    engine.add_listener(on_block)
+    with engine:
+        while engine.running:
+            time.sleep(0.1)
+    dispatcher.stop()
+    if not inline:
+        latencies = list(dispatcher.latencies)
+    return np.array(latencies), np.array(held), engine.stats()
+
+
+def main():
+    print(f"Detection: {MINUTES} min per scenario, {BLOCK}-sample blocks, adaptive vs fixed {FIXED_UV:g} uV")
+    for blink_uv, noise_uv in SCENARIOS:
+        print(f"blinks {blink_uv:5.0f} uV, noise {noise_uv:4.1f} uV")
+        for name, kwargs in (("adaptive", {}), ("fixed", {"k": 0.0, "min_uv": FIXED_UV})):
+            recall, false, error, per_block, worst = detect(blink_uv, noise_uv, **kwargs)
+            print(f"  {name:8s} recall {recall:6.1%}  false {false:5.2f}/min  onset {error:+6.1f} ms  "
+                  f"{per_block * 1e6:6.1f} us/block (worst {worst * 1e3:.2f} ms)")
+
+    print(f"\nDispatch: {DURATION} s real time, key press takes {PRESS_SECONDS * 1e3:.0f} ms")
+    for name, inline in (("inline", True), ("dispatcher", False)):
+        latencies, held, stats = dispatch(inline)
+        print(f"{name}: {len(latencies)} presses, acquisition thread held p50 {np.median(held) * 1e3:.2f} ms, "
+              f"max {held.max() * 1e3:.1f} ms, longest gap between reads {stats['block_interval_max_ms']:.0f} ms")
+        if len(latencies):
+            print(format_histogram(latency_histogram(latencies)))
+
+    print(f"\nFirmware mode: {FIRMWARE_BLINKS} BLINK lines every {FIRMWARE_INTERVAL:g} s, "
+          f"replayed {RECORD_BYTES} bytes at a time")
+    records_per_second = 1000
+    line = b"BLINK\n".ljust(int(FIRMWARE_INTERVAL * records_per_second * RECORD_BYTES), b"\n")
+    port = ReplayPort(line * FIRMWARE_BLINKS, fs=records_per_second, record_size=RECORD_BYTES,
+                      timeout=READ_TIMEOUT)
+    stats = run(port, mode="firmware", press=FakeKeySink(0.0))
+    assert stats["pressed"] == FIRMWARE_BLINKS, stats
+
+
+if __name__ == "__main__":
+    main()
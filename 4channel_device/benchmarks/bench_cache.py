@@ -0,0 +1,51 @@
+"""
+Benchmark: cold vs cached feature store (eeg_core.cache).
+
+Writes bench_training's synthetic labelled recording to a temporary
+directory and times FeatureCache.feature_store on it: the first call
+builds the store (bandpass + notch + windows + features), the second finds
+it by content hash. Then the CSV is touched (same bytes, new mtime, so it
+is rehashed but still hits), a parameter is changed (a miss), and the cache
+is shrunk below two entries to show LRU eviction.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_cache
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.bench_training import write_recording
+from eeg_core.cache import FeatureCache
+
+# =================== USER SETTINGS ===================
+FS = 256
+CHUNK_ROWS = 100_000
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    store = fn()
+    print(f"{label:<34} {time.perf_counter() - start:8.3f} s  {len(store)} windows")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "eeg_emotion_data.csv")
+        write_recording(path)
+        print(f"{os.path.getsize(path) / 1e6:.1f} MB CSV")
+        cache = FeatureCache(os.path.join(tmp, "cache"))
+        timed("cold (build)", lambda: cache.feature_store(path, fs=FS, chunk_rows=CHUNK_ROWS))
+        timed("warm (hit)", lambda: cache.feature_store(path, fs=FS, chunk_rows=CHUNK_ROWS))
+        os.utime(path)
+        timed("touched CSV (rehash, hit)", lambda: cache.feature_store(path, fs=FS, chunk_rows=CHUNK_ROWS))
+        timed("step_size 125 (miss)",
+              lambda: cache.feature_store(path, fs=FS, step_size=125, chunk_rows=CHUNK_ROWS))
+        cache.max_bytes = max(e["bytes"] for e in cache.index["entries"].values())
+        timed("shrunk cache (hit, evicts 125)", lambda: cache.feature_store(path, fs=FS, chunk_rows=CHUNK_ROWS))
+        print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: feature cost as the channel count grows.
+
+The per-channel reference is the previous `extract_features`: pandas
+moments, scipy skew/kurtosis and one `welch` call per channel. The schema
+version computes every statistic across a (samples, channels) array at
+once, so its Python overhead is paid once per window instead of once per
+channel. RollingFeatures (the live path) is timed per one-hop block. Every
+channel count is checked against the reference before timings are reported.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_channels
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from eeg_core.live import RollingFeatures
+from eeg_core.pipeline import FS, _trapezoid, extract_features
+from eeg_core.schema import ChannelSchema
+
+# =================== USER SETTINGS ===================
+CHANNEL_COUNTS = (2, 4, 8, 16)
+WINDOW_SECONDS = 2.0
+HOP_SECONDS = 0.5
+REPEATS = 200
+
+
+def loop_features(df_window, fs, channels):
+    """The per-channel implementation, kept as the reference."""
+    from scipy.signal import welch
+    from scipy.stats import kurtosis, skew
+
+    def compute_alpha_power(signal):
+        f, Pxx = welch(signal, fs=fs, nperseg=min(len(signal), int(fs)))
+        alpha_mask = (f >= 8) & (f <= 13)
+        return _trapezoid(Pxx[alpha_mask], x=f[alpha_mask])
+
+    features = {}
+    for ch in channels:
+        features[f"{ch}_mean"] = df_window[ch].mean()
+        features[f"{ch}_std"] = df_window[ch].std()
+        features[f"{ch}_skew"] = skew(df_window[ch])
+        features[f"{ch}_kurtosis"] = kurtosis(df_window[ch])
+    for ch in channels:
+        features[f"{ch}_alpha_power"] = compute_alpha_power(df_window[ch].values)
+    return features
+
+
+def per_call_us(fn, repeats=REPEATS):
+    fn()  # warm-up (lazy imports, caches)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    window = int(WINDOW_SECONDS * FS)
+    hop = int(HOP_SECONDS * FS)
+    t = np.arange(window) / FS
+    print(f"{WINDOW_SECONDS:g} s window @ {FS} Hz, {REPEATS} calls each (us per call / per channel)")
+    print(f"{'channels':>8} {'per-channel':>18} {'schema':>18} {'speed-up':>9} {'rolling hop':>18}")
+
+    for n in CHANNEL_COUNTS:
+        schema = ChannelSchema.of(n)
+        signals = 20 * np.sin(2 * np.pi * 10 * t)[:, None] + rng.normal(0, 10, (window, n))
+        df = pd.DataFrame(signals, columns=list(schema.channels))
+
+        reference = loop_features(df, FS, schema.channels)
+        features = extract_features(df, fs=FS, schema=schema)
+        for name in schema.feature_names:
+            assert np.isclose(features[name], reference[name], rtol=1e-9, atol=1e-12), name
+
+        loop_us = per_call_us(lambda: loop_features(df, FS, schema.channels))
+        schema_us = per_call_us(lambda: extract_features(df, fs=FS, schema=schema))
+
+        rolling = RollingFeatures(FS, WINDOW_SECONDS, HOP_SECONDS, schema=schema)
+        stream = rng.normal(0, 10, ((REPEATS + 1) * hop + window, n))
+        rolling.update(stream[:window])
+        blocks = iter(range(window, len(stream) - hop + 1, hop))
+        rolling_us = per_call_us(lambda: rolling.update(stream[next(blocks):][:hop]))
+
+        print(f"{n:>8} {loop_us:>9.0f} /{loop_us / n:>7.0f} {schema_us:>9.0f} /{schema_us / n:>7.0f} "
+              f"{loop_us / schema_us:>8.1f}x {rolling_us:>9.0f} /{rolling_us / n:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: fused NumPy SVC (eeg_core.fused) vs the sklearn calls.
+
+Per call on one feature row, times the old classify_stress body
+(scaler.transform, svm.predict, svm.decision_function and
+label_encoder.inverse_transform on a one-row DataFrame) against
+classify_stress on the fused path and FusedSVC.predict on a plain array,
+then a BATCH-row batch through sklearn vs FusedSVC. Labels and ratings are
+checked to be identical and the largest margin difference is reported.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_fused
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from eeg_core.fused import FusedSVC
+from eeg_core.pipeline import FEATURE_NAMES, classify_stress, load_model_components, stress_rating
+
+# =================== USER SETTINGS ===================
+CALLS = 2000
+BATCH = 100_000
+MODEL_DIR = "."
+
+
+def per_call(fn, rows):
+    start = time.perf_counter()
+    for row in rows:
+        fn(row)
+    return (time.perf_counter() - start) / len(rows)
+
+
+def main():
+    scaler, svm_model, label_encoder = load_model_components(MODEL_DIR)
+    fused = FusedSVC.from_components(scaler, svm_model, label_encoder)
+    rng = np.random.default_rng(0)
+    X = scaler.mean_ + rng.standard_normal((BATCH, len(FEATURE_NAMES))) * scaler.scale_
+    frames = [pd.DataFrame(X[[i]], columns=FEATURE_NAMES) for i in range(CALLS)]
+
+    def sklearn_classify(df):
+        X_scaled = scaler.transform(df)
+        label = label_encoder.inverse_transform(svm_model.predict(X_scaled))[0]
+        return label, stress_rating(label, svm_model.decision_function(X_scaled)[0])
+
+    old = per_call(sklearn_classify, frames)
+    new = per_call(lambda df: classify_stress(df, scaler, svm_model, label_encoder), frames)
+    raw = per_call(fused.predict, X[:CALLS])
+    print(f"one row, {CALLS} calls")
+    print(f"  sklearn (4 calls)        {old * 1e6:8.1f} us/call")
+    print(f"  classify_stress (fused)  {new * 1e6:8.1f} us/call  {old / new:5.1f}x")
+    print(f"  FusedSVC.predict (array) {raw * 1e6:8.1f} us/call  {old / raw:5.1f}x")
+    mismatches = sum(sklearn_classify(df) != classify_stress(df, scaler, svm_model, label_encoder)
+                     for df in frames)
+    print(f"  label/rating mismatches: {mismatches}")
+
+    df = pd.DataFrame(X, columns=FEATURE_NAMES)
+    start = time.perf_counter()
+    X_scaled = scaler.transform(df)
+    ref_labels = label_encoder.inverse_transform(svm_model.predict(X_scaled))
+    ref_margins = svm_model.decision_function(X_scaled)
+    old = time.perf_counter() - start
+    start = time.perf_counter()
+    labels, margins = fused.predict(X)
+    new = time.perf_counter() - start
+    print(f"batch of {BATCH} rows")
+    print(f"  sklearn {old * 1000:8.1f} ms   fused {new * 1000:8.1f} ms   {old / new:5.1f}x")
+    print(f"  labels identical: {bool((labels == ref_labels).all())}, "
+          f"max |margin diff| {np.abs(margins - ref_margins).max():.1e}, "
+          f"bit-identical margins {np.mean(margins == ref_margins):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: many devices through one AcquisitionHub vs a thread pair each.
+
+DURATION seconds of synthetic EEG are encoded once and replayed in real
+time on every device (ReplayPort with the serial port's READ_TIMEOUT, so
+signal generation is not measured), for each device count in DEVICES:
+
+    hub       eeg_core.hub.AcquisitionHub: one event loop reading all
+              devices, windows of all devices classified in batches
+    threads   an AcquisitionEngine + LivePredictor per device (two threads
+              each), as the single-device apps do
+
+Reports CPU time per device-second of signal (flat = linear scaling), the
+share of samples received, predictions and their latency, and for the hub
+the windows per model call.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_hub
+"""
+
+import time
+import warnings
+
+import numpy as np
+
+from eeg_core.acquisition import READ_TIMEOUT, AcquisitionEngine
+from eeg_core.hub import AcquisitionHub
+from eeg_core.live import LivePredictor
+from eeg_core.pipeline import load_model_components
+from eeg_core.replay import ReplayPort, encode_lines
+from eeg_core.sources import SyntheticEEG
+
+# =================== USER SETTINGS ===================
+FS = 512
+DURATION = 10          # seconds of signal per device
+DEVICES = (1, 4, 16, 32, 64)
+MODEL_DIR = "."
+
+
+def run_hub(data, n):
+    hub = AcquisitionHub(fs=FS, model_dir=MODEL_DIR)
+    for i in range(n):
+        hub.add_port(f"dev{i}", ReplayPort(data, fs=FS, speed=1.0, timeout=READ_TIMEOUT))
+    stats = hub.serve()
+    hub.close()
+    devices = stats["per_device"].values()
+    latencies = np.concatenate([[p.latency for p in d.predictions] for d in hub.devices.values()])
+    return (sum(d["samples_received"] for d in devices), len(latencies), latencies,
+            f"{stats['rows_per_batch']:.1f} windows per model call")
+
+
+def run_threads(data, n):
+    predictors = [LivePredictor(AcquisitionEngine(ReplayPort(data, fs=FS, speed=1.0, timeout=READ_TIMEOUT), fs=FS),
+                                model_dir=MODEL_DIR) for _ in range(n)]
+    results = [[] for _ in predictors]
+    for p in predictors:
+        p.start()
+    while any(p.running for p in predictors):
+        for p, r in zip(predictors, results):
+            r.extend(p.poll())
+        time.sleep(0.05)
+    time.sleep(0.2)  # let the last windows through the prediction threads
+    for p, r in zip(predictors, results):
+        r.extend(p.poll())
+        p.close()
+    latencies = np.array([x.latency for r in results for x in r])
+    return (sum(p.engine.total_samples for p in predictors), len(latencies), latencies,
+            f"{2 * n} threads")
+
+
+def main():
+    warnings.simplefilter("ignore")  # sklearn version warnings on model load
+    load_model_components(MODEL_DIR)  # load and cache once, outside the timings
+    data = encode_lines(SyntheticEEG(FS, seed=0).generate(DURATION * FS))
+    expected = DURATION * FS
+    print(f"{DURATION} s of {FS} Hz signal per device, replayed in real time")
+    for n in DEVICES:
+        for name, run in (("hub", run_hub), ("threads", run_threads)):
+            cpu, wall = time.process_time(), time.perf_counter()
+            samples, predictions, latencies, note = run(data, n)
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+            print(f"{n:3d} devices {name:7s}  CPU {cpu / (n * DURATION) * 1e3:6.2f} ms per device-second "
+                  f"({cpu / wall:5.1%} of a core)  samples {samples / (n * expected):6.1%}  "
+                  f"{predictions:4d} predictions  latency p50 {np.percentile(latencies, 50) * 1e3:6.1f} ms "
+                  f"p95 {np.percentile(latencies, 95) * 1e3:6.1f} ms  | {note}")
+
+
+if __name__ == "__main__":
+    main()
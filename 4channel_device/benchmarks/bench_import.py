@@ -0,0 +1,61 @@
+"""
+Benchmark: cold import time of the Streamlit front ends.
+
+Each app script is executed as a module in a fresh interpreter, after
+`streamlit` itself is loaded (as `streamlit run` does before the script
+starts), and the script reports the wall time plus which heavy dependencies
+the import pulled in. For comparison it also times importing the
+dependencies every app used to import eagerly at module load, which now
+sit behind function-level imports in eeg_core.pipeline.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_import
+"""
+
+import subprocess
+import sys
+
+# =================== USER SETTINGS ===================
+FRONT_ENDS = ["str.py", "str2.py", "str3.py", "streamlit.py"]
+HEAVY_MODULES = ["serial", "scipy.signal", "scipy.stats", "joblib", "fpdf"]
+RUNS = 5
+
+PROBE = """
+import importlib.util, sys, time, warnings
+warnings.simplefilter("ignore")
+cwd = sys.path.pop(0)  # the local streamlit.py would shadow the package
+import streamlit
+sys.path.insert(0, cwd)
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {heavy!r} if m in sys.modules) or "none")
+"""
+
+LOAD_APP = (
+    "spec = importlib.util.spec_from_file_location('app', {path!r}); "
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+)
+
+
+def time_statement(statement):
+    """Best-of-RUNS wall time of `statement` in a fresh interpreter."""
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    best, loaded = float("inf"), ""
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        elapsed, loaded = out.stdout.split()[-2:]
+        best = min(best, float(elapsed))
+    return best, loaded
+
+
+def main():
+    eager, _ = time_statement("import " + ", ".join(HEAVY_MODULES))
+    print(f"eager import of {', '.join(HEAVY_MODULES)}: {eager * 1000:7.1f} ms (now deferred)")
+    for path in FRONT_ENDS:
+        elapsed, loaded = time_statement(LOAD_APP.format(path=path))
+        print(f"{path:<13} cold import {elapsed * 1000:7.1f} ms | heavy modules loaded: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: fit time and memory of the per-sample classifier vs row count.
+
+Generates ROWS synthetic (FP1, FP2) samples with a non-linear, 2:3
+imbalanced class boundary and fits, each in a fresh child process:
+
+    svc          StandardScaler + exact RBF SVC (class_weight="balanced" in
+                 place of SMOTE, which is not needed to show the scaling);
+                 only up to SVC_MAX_ROWS rows
+    nystroem     eeg_core.kernel_sgd.fit_kernel_sgd, Nystroem map
+    rbf_sampler  eeg_core.kernel_sgd.fit_kernel_sgd, random Fourier features
+
+Reports fit time, the child's peak resident memory (ru_maxrss, includes
+the data itself) and balanced accuracy on TEST_ROWS held-out samples.
+
+Run from the 4channel_device directory (Linux/macOS):
+    python -m benchmarks.bench_kernel_sgd
+"""
+
+import multiprocessing as mp
+import resource
+import sys
+import time
+
+import numpy as np
+
+from eeg_core.kernel_sgd import fit_kernel_sgd
+
+# =================== USER SETTINGS ===================
+ROWS = (10_000, 30_000, 100_000, 300_000, 1_000_000, 3_000_000)
+SVC_MAX_ROWS = 30_000
+TEST_ROWS = 20_000
+
+
+def make_data(n, seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0, 40, (n, 2))
+    # Class 1: mostly a ring around the origin, ~40% of the samples
+    radius = np.hypot(X[:, 0], X[:, 1])
+    ring = np.abs(radius - 50) < 15
+    p = 1 / (1 + np.exp(2.5 - 4 * ring))
+    y = (rng.random(n) < p).astype(np.int64)
+    return X, y
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+
+def run(method, n):
+    from sklearn.metrics import balanced_accuracy_score
+
+    X, y = make_data(n, 0)
+    X_test, y_test = make_data(TEST_ROWS, 1)
+    start = time.perf_counter()
+    if method == "svc":
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.svm import SVC
+
+        scaler = StandardScaler().fit(X)
+        model = SVC(kernel="rbf", C=1, gamma="scale", class_weight="balanced").fit(scaler.transform(X), y)
+    else:
+        scaler, model = fit_kernel_sgd(X, y, kernel=method)
+    elapsed = time.perf_counter() - start
+    score = balanced_accuracy_score(y_test, model.predict(scaler.transform(X_test)))
+    return elapsed, peak_rss_mb(), score
+
+
+def main():
+    ctx = mp.get_context("fork")
+    print(f"{'rows':>9} {'method':<12} {'fit s':>8} {'peak MB':>8} {'bal. acc':>8}")
+    for n in ROWS:
+        for method in ("svc", "nystroem", "rbf_sampler"):
+            if method == "svc" and n > SVC_MAX_ROWS:
+                continue
+            with ctx.Pool(1, maxtasksperchild=1) as pool:
+                elapsed, peak, score = pool.apply(run, (method, n))
+            print(f"{n:9d} {method:<12} {elapsed:8.2f} {peak:8.0f} {score:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
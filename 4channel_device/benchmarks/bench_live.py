@@ -0,0 +1,68 @@
+"""
+Benchmark: continuous live prediction on a replayed recording.
+
+Replays RECORDING through a ReplayPort at SPEED times real time into an
+AcquisitionEngine with a LivePredictor attached, as the Streamlit live mode
+does with the Arduino, and reports how many predictions were emitted, the
+sample-arrival-to-label latency, and the largest difference between the
+streamed features and `extract_features` over the same window of the
+causally filtered recording.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_live
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from eeg_core import FEATURE_NAMES, AcquisitionEngine, ReplayPort, extract_features, load_recording
+from eeg_core.filters import filter_offline
+from eeg_core.live import LivePredictor
+
+# =================== USER SETTINGS ===================
+RECORDING = "test.csv"
+FS = 512
+SPEED = 1.0
+WINDOW_SECONDS = 4.0
+HOP_SECONDS = 0.5
+
+
+def main():
+    port = ReplayPort(RECORDING, fs=FS, speed=SPEED)
+    engine = AcquisitionEngine(port, fs=FS)
+    predictor = LivePredictor(engine, window_seconds=WINDOW_SECONDS, hop_seconds=HOP_SECONDS)
+
+    results = []
+    with predictor:
+        while predictor.running:
+            results.extend(predictor.poll())
+            time.sleep(0.05)
+        time.sleep(0.2)  # let the last window through the prediction thread
+        results.extend(predictor.poll())
+
+    # What the engine stored: float32, like the parser produces
+    samples = load_recording(RECORDING, fs=FS).astype(np.float32).astype(np.float64)
+    samples[:, 1:] = filter_offline(samples[:, 1:], fs=FS, zero_phase=False)
+    df = pd.DataFrame(samples, columns=["Timestamp", "FP1", "FP2"])
+    worst = 0.0
+    for p in results:
+        window = df.iloc[p.samples - predictor.window:p.samples]
+        ref = extract_features(window, fs=FS)
+        rel = [abs(p.features[k] - ref[k]) / max(abs(ref[k]), 1e-12) for k in FEATURE_NAMES]
+        worst = max(worst, max(rel))
+
+    stats = predictor.latency_stats()
+    print(f"{RECORDING}: {len(samples)} samples at {FS} Hz, replayed at {SPEED:g}x")
+    print(f"{WINDOW_SECONDS:g} s window every {HOP_SECONDS:g} s: {len(results)} predictions, "
+          f"{predictor.dropped} dropped")
+    print(f"latency sample -> label: p50 {stats['p50_ms']:.2f} ms | p95 {stats['p95_ms']:.2f} ms"
+          f" | max {stats['max_ms']:.2f} ms")
+    print(f"max relative feature difference vs extract_features: {worst:.2e}")
+    if results:
+        print("labels:", " ".join(p.label for p in results))
+
+
+if __name__ == "__main__":
+    main()
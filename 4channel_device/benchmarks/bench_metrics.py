@@ -0,0 +1,90 @@
+"""
+Benchmark: acquisition metrics on a replay with injected faults.
+
+Replays SECONDS of synthetic 512 Hz lines through a ReplayPort that drops
+the line ranges in GAPS, corrupts BAD_LINES lines and runs its clock
+DRIFT_PPM fast, then checks that AcquisitionEngine.stats() reports exactly
+the injected gaps and parse failures and roughly the drift, and writes the
+final snapshot to METRICS_JSON. It then replays RECORDING, a real capture
+whose integer millis() timestamps step by 1-3 ms, and checks that this
+jitter is not reported as gaps. It also times AcquisitionMetrics.on_block
+per block to show the bookkeeping cost on the acquisition thread.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_metrics
+"""
+
+import json
+import time
+
+import numpy as np
+
+from eeg_core import AcquisitionEngine, ReplayPort, encode_lines
+from eeg_core.metrics import AcquisitionMetrics, dump
+
+# =================== USER SETTINGS ===================
+FS = 512
+SECONDS = 20
+SPEED = 1.0
+DRIFT_PPM = 2000          # replay clock offset, simulated device drift
+GAPS = ((1000, 10), (4000, 1), (7000, 150))  # (first line, lines dropped)
+BAD_LINES = 5
+METRICS_JSON = "acquisition_metrics.json"
+RECORDING = "test.csv"    # real 512 Hz capture without lost samples
+BLOCK_SAMPLES = 10        # ~one 20 ms serial read at 512 Hz
+
+
+def main():
+    rng = np.random.default_rng(0)
+    n = SECONDS * FS
+    samples = np.column_stack([np.round(np.arange(n) * 1000.0 / FS),
+                               rng.normal(40, 10, n), rng.normal(-20, 10, n)])
+    lines = encode_lines(samples).split(b"\n")
+    kept = [i for i in range(100, n, 100) if not any(a <= i < a + count for a, count in GAPS)]
+    for i in rng.choice(kept, BAD_LINES, replace=False):
+        lines[i] = lines[i].replace(b",", b";")
+    data = b"\n".join(lines)
+
+    speed = SPEED * (1 + DRIFT_PPM * 1e-6)
+    engine = AcquisitionEngine(ReplayPort(data, fs=FS, speed=speed, gaps=GAPS), fs=FS)
+    print(f"replaying {SECONDS} s at {FS} Hz, {speed:.4f}x, gaps {GAPS}, {BAD_LINES} bad lines")
+    with engine:
+        while engine.running:
+            time.sleep(0.5)
+    stats = engine.stats()
+    dump(stats, METRICS_JSON)
+    print(json.dumps({k: stats[k] for k in ("samples_received", "samples_expected", "samples_missing",
+                                            "gaps", "largest_gap_samples", "parse_failures",
+                                            "effective_rate_hz", "clock_drift_ppm",
+                                            "serial_backlog_max_bytes")}, indent=2))
+    print(f"full snapshot written to {METRICS_JSON}")
+
+    # Corrupted lines lose their timestamps too, so each is also a 1-sample gap
+    dropped = sum(count for _, count in GAPS)
+    assert stats["samples_missing"] == dropped + BAD_LINES, stats["samples_missing"]
+    assert stats["parse_failures"] == BAD_LINES
+    if SPEED == 1.0:
+        print(f"drift: injected {DRIFT_PPM} ppm, measured {stats['clock_drift_ppm']:.0f} ppm")
+
+    engine = AcquisitionEngine(ReplayPort(RECORDING, fs=FS, speed=None), fs=FS)
+    with engine:
+        while engine.running:
+            time.sleep(0.1)
+    stats = engine.stats()
+    print(f"{RECORDING}: {stats['samples_received']} samples, {stats['gaps']} gaps, "
+          f"{stats['samples_missing']} missing")
+    assert stats["gaps"] == 0 and stats["samples_missing"] == 0, stats
+
+    metrics = AcquisitionMetrics(FS)
+    blocks = [samples[i:i + BLOCK_SAMPLES] for i in range(0, n, BLOCK_SAMPLES)]
+    start = time.perf_counter()
+    for block in blocks:
+        metrics.on_read(time.perf_counter(), 0, 250)
+        metrics.on_block(time.perf_counter(), block)
+    per_block = (time.perf_counter() - start) / len(blocks)
+    print(f"metrics overhead: {per_block * 1e6:.1f} us per {BLOCK_SAMPLES}-sample block "
+          f"({per_block * FS / BLOCK_SAMPLES * 100:.2f}% of one core at {FS} Hz)")
+
+
+if __name__ == "__main__":
+    main()
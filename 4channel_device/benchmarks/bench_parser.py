@@ -0,0 +1,59 @@
+"""
+Benchmark: per-line LineParser vs. vectorized BulkLineParser.
+
+Feeds the raw bytes of a recorded file (test.csv by default, including its
+header and the stray prediction row) in fixed-size chunks, the way
+`ser.read(ser.in_waiting)` would hand them over, and reports lines/second.
+The same data is then parsed once more with a ",0" Blink field appended to
+every line, as 123/123.ino prints them, and must give the same rows.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_parser [path/to/recording.csv]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from eeg_core import BulkLineParser, LineParser
+
+# =================== USER SETTINGS ===================
+REPEATS = 20                    # test.csv is copied this many times
+CHUNK_SIZES = [256, 4096, 65536]  # bytes per simulated serial read
+
+
+def run(parser, data, chunk_size):
+    start = time.perf_counter()
+    rows = [parser.feed(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size)]
+    elapsed = time.perf_counter() - start
+    return np.concatenate(rows), elapsed
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "test.csv"
+    with open(path, "rb") as f:
+        data = f.read() * REPEATS
+    n_lines = data.count(b"\n")
+    print(f"{path} x{REPEATS}: {n_lines} lines, {len(data) / 1e6:.1f} MB")
+
+    for chunk_size in CHUNK_SIZES:
+        reference, t_line = run(LineParser(), data, chunk_size)
+        bulk_parser = BulkLineParser()
+        bulk, t_bulk = run(bulk_parser, data, chunk_size)
+        assert np.array_equal(reference, bulk), "parsers disagree"
+        print(
+            f"chunk {chunk_size:>6} B | per-line {n_lines / t_line:>12,.0f} lines/s"
+            f" | bulk {n_lines / t_bulk:>12,.0f} lines/s | speedup {t_line / t_bulk:5.1f}x"
+            f" | rows {len(bulk)} dropped {bulk_parser.dropped} skipped {bulk_parser.skipped}"
+        )
+
+    wide = data.replace(b"\r\n", b"\n").replace(b"\n", b",0\n")
+    bulk_parser = BulkLineParser()
+    bulk, t_bulk = run(bulk_parser, wide, CHUNK_SIZES[1])
+    assert np.array_equal(reference, bulk), "extra Blink field changed the rows"
+    print(f"with Blink field  | bulk {n_lines / t_bulk:>12,.0f} lines/s | rows {len(bulk)} dropped {bulk_parser.dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: prediction history render cost, CSV log vs. PredictionLog.
+
+For growing histories it times what one Streamlit rerun did with
+predictions_log.csv ("Prediction History": read the CSV, show tail(10);
+analytics dashboard: read it, map labels, parse and sort timestamps for the
+chart) against the same sections on eeg_core.predictions.PredictionLog
+(`tail(10)` and hourly `aggregate` over two days). It also times logging
+one prediction per call with save_prediction_to_csv vs. PredictionLog.append.
+Histories are synthetic, one prediction every INTERVAL_SECONDS.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_prediction_log
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from eeg_core.pipeline import save_prediction_to_csv
+from eeg_core.predictions import TIME_FORMAT, PredictionLog, to_seconds
+
+# =================== USER SETTINGS ===================
+HISTORY_ROWS = (1_000, 100_000, 1_000_000)
+INTERVAL_SECONDS = 10
+RENDERS = 5          # reruns timed per history size (best is reported)
+APPENDS = 2_000      # predictions logged in the write test
+
+
+def best_ms(fn, repeats=RENDERS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def csv_history(path):
+    df_hist = pd.read_csv(path)
+    return df_hist[["Timestamp", "Predicted State"]].tail(10)
+
+
+def csv_chart(path):
+    df_hist = pd.read_csv(path)
+    df_hist["State_Numeric"] = df_hist["Predicted State"].apply(lambda x: 0 if x.lower() == "relaxed" else 1)
+    df_hist["Timestamp"] = pd.to_datetime(df_hist["Timestamp"])
+    df_hist.sort_values("Timestamp", inplace=True)
+    return df_hist.set_index("Timestamp")["State_Numeric"]
+
+
+def log_chart(log):
+    counts = log.aggregate(bucket_seconds=3600, n_buckets=48)
+    relaxed = counts[[label for label in counts.columns if label.lower() == "relaxed"]].sum(axis=1)
+    return 1 - relaxed / counts.sum(axis=1)
+
+
+def make_history(n, rng):
+    start = to_seconds(pd.Timestamp("2025-01-01").to_pydatetime())
+    seconds = start + np.arange(n, dtype=np.float64) * INTERVAL_SECONDS
+    labels = np.where(rng.random(n) < 0.4, "Stressed", "Relaxed")
+    return seconds, labels
+
+
+def main():
+    rng = np.random.default_rng(0)
+    workdir = tempfile.mkdtemp(prefix="bench_prediction_log_")
+    try:
+        print(f"{'rows':>9} | {'csv history':>11} {'csv chart':>10} | {'log tail':>9} {'log chart':>10}   (ms per rerun)")
+        for n in HISTORY_ROWS:
+            seconds, labels = make_history(n, rng)
+            csv_path = os.path.join(workdir, f"log_{n}.csv")
+            times = pd.to_datetime(seconds, unit="s").strftime(TIME_FORMAT)
+            pd.DataFrame({"Timestamp": times, "Predicted State": labels}).to_csv(csv_path, index=False)
+            log = PredictionLog(os.path.join(workdir, f"log_{n}.db"))
+            log.extend(zip(seconds.tolist(), labels.tolist()))
+
+            assert log.tail(10).equals(csv_history(csv_path).reset_index(drop=True))
+            print(f"{n:>9} | {best_ms(lambda: csv_history(csv_path)):>11.1f} "
+                  f"{best_ms(lambda: csv_chart(csv_path)):>10.1f} | "
+                  f"{best_ms(lambda: log.tail(10)):>9.2f} {best_ms(lambda: log_chart(log)):>10.2f}")
+            log.close()
+
+        csv_path = os.path.join(workdir, "appends.csv")
+        start = time.perf_counter()
+        for i in range(APPENDS):
+            save_prediction_to_csv("Stressed" if i % 3 else "Relaxed", csv_path)
+        csv_us = (time.perf_counter() - start) / APPENDS * 1e6
+        with PredictionLog(os.path.join(workdir, "appends.db")) as log:
+            start = time.perf_counter()
+            for i in range(APPENDS):
+                log.append("Stressed" if i % 3 else "Relaxed")
+            log.flush()
+            log_us = (time.perf_counter() - start) / APPENDS * 1e6
+            assert len(log.tail(APPENDS)) == APPENDS
+        print(f"\nlogging {APPENDS} predictions: save_prediction_to_csv {csv_us:.1f} us each, "
+              f"PredictionLog.append {log_us:.1f} us each (batches of {log.batch_size})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
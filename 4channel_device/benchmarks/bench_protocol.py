@@ -0,0 +1,70 @@
+"""
+Benchmark: CSV text stream vs. binary frames.
+
+Encodes the samples of a recording both ways and reports the bytes per
+sample, the highest sample rate each format can sustain at the firmware's
+500000 baud (10 bits on the wire per byte), and the host decode throughput
+when fed in serial-read-sized chunks. The int16 stream is decoded once more
+with a CORRUPT_FRAMES fraction of its frames damaged, as on a noisy link.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_protocol [path/to/recording.csv]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from eeg_core import BulkLineParser, FrameDecoder, FrameFormat, encode_frames, encode_lines, load_recording
+
+# =================== USER SETTINGS ===================
+BAUD_RATE = 500000
+REPEATS = 20       # the recording is copied this many times
+CHUNK_SIZE = 4096  # bytes per simulated serial read
+CORRUPT_FRAMES = 0.004  # fraction of frames with a flipped payload byte
+
+
+def decode(parser, data):
+    start = time.perf_counter()
+    out = [parser.feed(data[i:i + CHUNK_SIZE]) for i in range(0, len(data), CHUNK_SIZE)]
+    return np.concatenate(out), time.perf_counter() - start
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "test.csv"
+    samples = np.tile(load_recording(path), (REPEATS, 1))
+    n = len(samples)
+    print(f"{path} x{REPEATS}: {n} samples, 2 channels")
+
+    streams = [
+        ("CSV text", encode_lines(samples, header=False), BulkLineParser()),
+    ]
+    for sample_format in ("int16", "float32"):
+        fmt = FrameFormat(sample_format=sample_format)
+        streams.append((f"binary {sample_format}", encode_frames(samples, fmt), FrameDecoder(fmt)))
+
+    for name, data, parser in streams:
+        decoded, elapsed = decode(parser, data)
+        assert len(decoded) == n, f"{name}: decoded {len(decoded)} of {n} samples"
+        bytes_per_sample = len(data) / n
+        max_rate = BAUD_RATE / 10 / bytes_per_sample
+        print(
+            f"{name:<16} | {bytes_per_sample:5.1f} B/sample | max {max_rate:7,.0f} Hz at {BAUD_RATE} baud"
+            f" | decode {n / elapsed:>12,.0f} samples/s"
+        )
+
+    fmt = FrameFormat()
+    data = bytearray(encode_frames(samples, fmt))
+    corrupt = np.random.default_rng(0).choice(n, int(n * CORRUPT_FRAMES), replace=False)
+    for i in corrupt:
+        data[i * fmt.size + 8] ^= 0xFF
+    decoder = FrameDecoder(fmt)
+    decoded, elapsed = decode(decoder, bytes(data))
+    assert len(decoded) == n - len(corrupt) and decoder.crc_errors == len(corrupt)
+    print(f"{'binary int16':<16} | {len(corrupt)} corrupted frames ({CORRUPT_FRAMES:.1%}) dropped"
+          f" | decode {len(decoded) / elapsed:>12,.0f} samples/s")
+
+
+if __name__ == "__main__":
+    main()
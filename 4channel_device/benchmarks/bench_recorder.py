@@ -0,0 +1,78 @@
+"""
+Benchmark: sustained throughput of the session recorder.
+
+Streams SECONDS of synthetic 512 Hz "Time(ms),Fp1(uV),Fp2(uV)" lines
+through a ReplayPort at SPEED times real time into an AcquisitionEngine +
+SessionRecorder (what collect.py runs), and checks from the device
+timestamps that every sample reached the recording. For comparison it
+times the old collect.py loop body: format and write one CSV row and print
+one status line per sample.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_recorder
+"""
+
+import csv
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from eeg_core import AcquisitionEngine, ReplayPort, encode_lines
+from eeg_core.recorder import SessionRecorder
+from eeg_core.recording import Recording
+
+# =================== USER SETTINGS ===================
+FS = 512
+SECONDS = 60
+SPEED = 20.0   # replay speed-up; 20x = 10240 samples/s
+
+
+def main():
+    rng = np.random.default_rng(0)
+    n = SECONDS * FS
+    samples = np.column_stack([np.round(np.arange(n) * 1000.0 / FS),
+                               rng.normal(40, 10, n), rng.normal(-20, 10, n)])
+    data = encode_lines(samples)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "session.eegrec")
+        engine = AcquisitionEngine(ReplayPort(data, fs=FS, speed=SPEED), fs=FS)
+        start = time.perf_counter()
+        with SessionRecorder(engine, path) as recorder:
+            recorder.start_label("Relaxed")
+            while not engine.port.exhausted:
+                time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+        stats = recorder.total.summary()
+        rows = len(Recording(path))
+    finally:
+        shutil.rmtree(tmp)
+
+    print(f"{SECONDS} s at {FS} Hz replayed at {SPEED:g}x ({FS * SPEED:.0f} samples/s offered)")
+    print(f"recorder: {rows} rows written in {elapsed:.2f} s | received {stats['received']} "
+          f"of {stats['expected']} expected | missing {stats['missing']} | lost {recorder.lost}")
+
+    # Old loop: one csv row + one print per sample
+    sink, console = io.StringIO(), io.StringIO()
+    writer = csv.writer(sink)
+    stdout, sys.stdout = sys.stdout, console
+    start = time.perf_counter()
+    try:
+        for timestamp, fp1, fp2 in samples.astype(str):
+            writer.writerow([timestamp, fp1, fp2, "Relaxed"])
+            print(f"Saved: {timestamp}, {fp1}, {fp2}, Relaxed")
+    finally:
+        sys.stdout = stdout
+    per_sample = (time.perf_counter() - start) / n
+    print(f"old per-sample write+print: {per_sample * 1e6:.1f} us/sample "
+          f"(to an in-memory console; a real terminal is far slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: .eegrec binary recordings vs pandas CSV.
+
+Writes MINUTES of synthetic 2-channel FS Hz data both as CSV (pandas
+`to_csv`) and as an .eegrec recording (RecordingWriter, appended one
+second at a time as the acquisition thread would), then compares:
+
+    write       time to write everything
+    size        bytes on disk
+    read all    CSV `pd.read_csv` vs opening the recording and copying
+                every column into memory
+    slice       SLICE_SECONDS from the middle: CSV must parse the whole
+                file first, the recording maps it and slices (zero-copy)
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_recording
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from eeg_core.recording import Recording, RecordingWriter
+
+# =================== USER SETTINGS ===================
+MINUTES = 30
+FS = 512
+SLICE_SECONDS = 10
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    n = MINUTES * 60 * FS
+    samples = np.column_stack([np.arange(n) * (1000.0 / FS),
+                               rng.normal(40, 10, n).astype(np.float32),
+                               rng.normal(-20, 10, n).astype(np.float32)])
+    t_mid = samples[n // 2, 0]
+    t_range = (t_mid, t_mid + SLICE_SECONDS * 1000)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(tmp, "rec.csv")
+        rec_path = os.path.join(tmp, "rec.eegrec")
+
+        df = pd.DataFrame(samples, columns=["Timestamp", "FP1", "FP2"])
+        _, csv_write = timed(lambda: df.to_csv(csv_path, index=False))
+
+        def write_rec():
+            with RecordingWriter(rec_path, fs=FS) as writer:
+                for start in range(0, n, FS):
+                    writer.append(samples[start:start + FS])
+        _, rec_write = timed(write_rec)
+
+        _, csv_read = timed(lambda: pd.read_csv(csv_path))
+
+        def read_rec():
+            rec = Recording(rec_path)
+            return [np.array(rec.timestamps)] + [np.array(rec.channel(ch)) for ch in rec.channels]
+        _, rec_read = timed(read_rec)
+
+        def slice_csv():
+            data = pd.read_csv(csv_path)
+            return data[(data["Timestamp"] >= t_range[0]) & (data["Timestamp"] < t_range[1])]
+        csv_slice, csv_slice_t = timed(slice_csv)
+        rec_slice, rec_slice_t = timed(lambda: Recording(rec_path).slice_time(*t_range))
+        assert len(csv_slice) == len(rec_slice["FP1"])
+
+        print(f"{MINUTES} min at {FS} Hz, 2 channels ({n} samples)")
+        print(f"{'':<10}{'CSV':>12}{'.eegrec':>12}{'speedup':>10}")
+        print(f"{'write':<10}{csv_write:11.3f}s{rec_write:11.3f}s{csv_write / rec_write:9.0f}x")
+        print(f"{'read all':<10}{csv_read:11.3f}s{rec_read:11.3f}s{csv_read / rec_read:9.0f}x")
+        print(f"{'slice':<10}{csv_slice_t:11.3f}s{rec_slice_t:11.4f}s{csv_slice_t / rec_slice_t:9.0f}x")
+        print(f"{'size':<10}{os.path.getsize(csv_path) / 1e6:10.1f}MB{dir_size(rec_path) / 1e6:10.1f}MB")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: grid search over one process vs the joblib process pool.
+
+Writes a synthetic FeatureStore (SESSIONS recording sessions of
+ROWS_PER_SESSION windows, alternating labels, 10 feature columns) to a
+temporary directory and runs eeg_core.search.grid_search over its
+memory-mapped features with N_JOBS=1 and with every core. Reports wall
+time, the summed per-fold fit time (the serial cost) and checks both runs
+rank the settings identically.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_search
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from eeg_core.search import grid_search
+from eeg_core.training import FeatureStore
+from eeg_core.windows import feature_names
+
+# =================== USER SETTINGS ===================
+SESSIONS = 8
+ROWS_PER_SESSION = 400
+PARAM_GRID = {"kernel": ["rbf"], "C": [0.1, 1, 10, 100], "gamma": ["scale", 0.01, 0.1, 1]}
+CV_FOLDS = 5
+PURGE = 1
+
+
+def write_store(path):
+    rng = np.random.default_rng(0)
+    columns = feature_names(("FP1", "FP2"))
+    with FeatureStore(path, columns=columns) as store:
+        for session in range(SESSIONS):
+            label = ("Relaxed", "Stressed")[session % 2]
+            shift = 0.4 if label == "Stressed" else 0.0
+            drift = np.cumsum(rng.normal(0, 0.05, (ROWS_PER_SESSION, len(columns))), axis=0)
+            store.append(rng.standard_normal((ROWS_PER_SESSION, len(columns))) + drift + shift,
+                         label, session)
+    return FeatureStore(path)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        X, y, groups = write_store(os.path.join(tmp, "store")).load()
+        y = (y == "Stressed").astype(np.int64)
+        print(f"{len(X)} windows, {SESSIONS} sessions, {os.cpu_count()} CPUs")
+        runs = {}
+        for n_jobs in (1, -1):
+            result = grid_search(X, y, groups, PARAM_GRID, n_splits=CV_FOLDS, purge=PURGE, n_jobs=n_jobs)
+            runs[n_jobs] = result
+            print(f"n_jobs={n_jobs:>2}: {len(result.folds)} fits in {result.seconds:6.2f} s wall, "
+                  f"{result.folds['fit_seconds'].sum():6.2f} s summed fit time")
+        print(f"speedup {runs[1].seconds / runs[-1].seconds:.2f}x, "
+              f"same ranking: {list(runs[1].summary.index) == list(runs[-1].summary.index)}")
+        print("best:", runs[-1].best_params)
+        print(runs[-1].summary.to_string())
+
+
+if __name__ == "__main__":
+    main()
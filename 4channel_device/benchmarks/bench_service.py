@@ -0,0 +1,98 @@
+"""
+Load generator for the prediction service (eeg_core.service).
+
+Starts the service on a local port (or uses ADDRESS if set, e.g. a server
+started with `python -m eeg_core.service`), then runs CLIENTS client
+processes that each send single-row /predict requests back to back for
+SECONDS, and reports throughput and p50/p99 latency. Without ADDRESS it
+repeats the run with micro-batching disabled (max_batch=1) for comparison,
+and also times the in-process per-row classify_stress call the apps make.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_service
+"""
+
+import multiprocessing as mp
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from eeg_core.pipeline import FEATURE_NAMES, classify_stress, load_model_components
+from eeg_core.service import PredictionClient, make_server
+
+# =================== USER SETTINGS ===================
+ADDRESS = None      # "127.0.0.1:8765" or a Unix socket path to test a running service
+CLIENTS = 8
+SECONDS = 5.0
+MODEL_DIR = "."
+
+
+def sample_features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    scaler, _, _ = load_model_components(MODEL_DIR)
+    return scaler.mean_ + rng.standard_normal((n, len(FEATURE_NAMES))) * scaler.scale_
+
+
+def client_worker(address, seconds, seed):
+    client = PredictionClient(address)
+    rows = sample_features(256, seed)
+    latencies = []
+    end = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        client.predict(rows[i % len(rows)])
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    client.close()
+    return latencies
+
+
+def run_load(address, label):
+    with mp.get_context("spawn").Pool(CLIENTS) as pool:
+        results = pool.starmap(client_worker, [(address, SECONDS, seed) for seed in range(CLIENTS)])
+    latencies = np.concatenate(results) * 1000
+    print(f"{label:<24}{len(latencies) / SECONDS:10.0f} req/s   p50 {np.percentile(latencies, 50):6.2f} ms"
+          f"   p99 {np.percentile(latencies, 99):6.2f} ms")
+
+
+def serve(max_batch):
+    server = make_server(MODEL_DIR, port=0, max_batch=max_batch)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"{host}:{port}"
+
+
+def main():
+    print(f"{CLIENTS} client processes, single-row requests, {SECONDS:g} s each run")
+    if ADDRESS is not None:
+        run_load(ADDRESS, ADDRESS)
+        print(PredictionClient(ADDRESS).health())
+        return
+
+    for label, max_batch in (("micro-batched", 256), ("unbatched (max_batch=1)", 1)):
+        server, address = serve(max_batch)
+        try:
+            run_load(address, label)
+            stats = server.batcher.stats()
+            print(f"{'':<24}{stats['batches']} decision_function calls, "
+                  f"{stats['mean_batch_rows']:.1f} rows per call")
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.batcher.close()
+
+    scaler, svm_model, label_encoder = load_model_components(MODEL_DIR)
+    rows = pd.DataFrame(sample_features(500), columns=FEATURE_NAMES)
+    start = time.perf_counter()
+    for i in range(len(rows)):
+        classify_stress(rows.iloc[[i]], scaler, svm_model, label_encoder)
+    per_row = (time.perf_counter() - start) / len(rows)
+    print(f"{'in-process classify_stress':<24}{1 / per_row:10.0f} rows/s   {per_row * 1000:.2f} ms per row "
+          f"(one process, no service)")
+
+
+if __name__ == "__main__":
+    main()
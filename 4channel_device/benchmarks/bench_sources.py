@@ -0,0 +1,57 @@
+"""
+Benchmark: data sources at real, accelerated and unthrottled speed.
+
+Times the old eeg_prediction.py simulator (one np.random.normal pair and
+one time.sleep(1/fs) per sample) on OLD_SECONDS of data, then acquires
+SECONDS of signal through eeg_core.sources.read_samples from the synthetic
+source and from a replayed recording at each speed in SPEEDS (None = as
+fast as possible), and reports wall time and effective sample rate.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_sources
+"""
+
+import time
+
+import numpy as np
+
+from eeg_core.sources import SYNTHETIC, SyntheticEEG, read_samples
+
+# =================== USER SETTINGS ===================
+FS = 256
+SECONDS = 20
+OLD_SECONDS = 2
+REPLAY_FILE = "test.csv"  # 10 s at 512 Hz
+SPEEDS = (1.0, 10.0, None)
+
+
+def old_simulator(duration_seconds, fs):
+    rows = []
+    for i in range(duration_seconds * fs):
+        rows.append(((i / fs) * 1000, np.random.normal(0, 1), np.random.normal(0, 1)))
+        time.sleep(1 / fs)
+    return rows
+
+
+def main():
+    SyntheticEEG(FS)  # imports scipy outside the timings
+    start = time.perf_counter()
+    old_simulator(OLD_SECONDS, FS)
+    old = time.perf_counter() - start
+    print(f"old simulator: {OLD_SECONDS} s of data in {old:.2f} s "
+          f"({OLD_SECONDS * FS / old:.0f} samples/s, {old / OLD_SECONDS:.2f}x real time)")
+
+    for source, fs in ((SYNTHETIC, FS), (REPLAY_FILE, 512)):
+        for speed in SPEEDS:
+            seconds = SECONDS if speed is None or speed > 1 else min(SECONDS, 5)
+            start = time.perf_counter()
+            samples = read_samples(source, seconds, fs=fs, speed=speed)
+            elapsed = time.perf_counter() - start
+            got = len(samples) / fs
+            label = "max" if speed is None else f"{speed:g}x"
+            print(f"{source:<10} {label:>4}: {got:5.1f} s of data in {elapsed:6.2f} s "
+                  f"({len(samples) / elapsed:9.0f} samples/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: per-hop cost of continuous alpha-power monitoring.
+
+Compares recomputing `compute_alpha_power` (a full scipy Welch) over the
+last WINDOW_SECONDS of data after every hop with feeding each hop of new
+samples into a StreamingWelch, on a synthetic 2-channel 512 Hz stream.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_spectral
+"""
+
+import time
+
+import numpy as np
+
+from eeg_core import compute_alpha_power
+from eeg_core.spectral import StreamingWelch
+
+# =================== USER SETTINGS ===================
+FS = 512
+WINDOW_SECONDS = 60
+HOP = FS // 2       # new samples per update (the Welch hop)
+N_HOPS = 200
+
+
+def main():
+    rng = np.random.default_rng(0)
+    window = WINDOW_SECONDS * FS
+    stream = rng.normal(0, 10, size=(window + N_HOPS * HOP, 2))
+
+    start = time.perf_counter()
+    for k in range(N_HOPS):
+        recent = stream[k * HOP + HOP:k * HOP + HOP + window]
+        [compute_alpha_power(recent[:, ch], fs=FS) for ch in range(2)]
+    t_full = (time.perf_counter() - start) / N_HOPS
+
+    n_segments = (window - FS) // HOP + 1
+    streaming = StreamingWelch(fs=FS, n_segments=n_segments)
+    streaming.update(stream[:window])
+    start = time.perf_counter()
+    for k in range(N_HOPS):
+        streaming.update(stream[window + k * HOP:window + (k + 1) * HOP])
+        streaming.alpha_power()
+    t_stream = (time.perf_counter() - start) / N_HOPS
+
+    print(f"{WINDOW_SECONDS} s window, hop {HOP} samples, 2 channels")
+    print(f"full welch per hop {t_full * 1e3:7.3f} ms | streaming per hop {t_stream * 1e3:7.3f} ms"
+          f" | speedup {t_full / t_stream:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: peak memory of building the training features.
+
+Writes a synthetic labelled recording of HOURS hours (Timestamp, FP1, FP2,
+Emotion, one session per label switch) to a temporary directory, then
+measures time and peak traced memory of:
+
+    in-memory   the old classification.py path: read the whole CSV, sort by
+                Timestamp, bandpass + notch every channel over the full
+                length, then window features per emotion
+    streamed    eeg_core.training.build_feature_store into an on-disk store
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_training
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from eeg_core.filters import filter_offline
+from eeg_core.training import build_feature_store
+from eeg_core.windows import sliding_window_features
+
+# =================== USER SETTINGS ===================
+HOURS = 0.5
+FS = 256
+SESSION_SECONDS = 180   # collect.py's DURATION
+CHUNK_ROWS = 100_000
+
+
+def write_recording(path):
+    rng = np.random.default_rng(0)
+    n_session = SESSION_SECONDS * FS
+    t = np.arange(n_session) * (1000.0 / FS)
+    for k in range(int(HOURS * 3600 / SESSION_SECONDS)):
+        emotion = ("Relaxed", "Stressed")[k % 2]
+        pd.DataFrame({
+            "Timestamp": t.round() + k * SESSION_SECONDS * 1000,
+            "FP1": rng.normal(40, 10, n_session).round(2),
+            "FP2": rng.normal(-20, 10, n_session).round(2),
+            "Emotion": emotion,
+        }).to_csv(path, mode="a", header=k == 0, index=False)
+
+
+def in_memory(path, store_dir):
+    df = pd.read_csv(path)
+    df = df.sort_values(by="Timestamp").reset_index(drop=True)
+    for ch in ("FP1", "FP2"):
+        df[f"{ch}_processed"] = filter_offline(df[ch].values, fs=FS)
+    blocks = [sliding_window_features(df.loc[df["Emotion"] == label, ["FP1_processed", "FP2_processed"]].values,
+                                      500, 250, fs=FS)
+              for label in df["Emotion"].unique()]
+    return sum(len(b) for b in blocks)
+
+
+def streamed(path, store_dir):
+    return len(build_feature_store(path, store_dir, fs=FS, chunk_rows=CHUNK_ROWS))
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "eeg_emotion_data.csv")
+        write_recording(path)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"{HOURS:g} h at {FS} Hz: {size_mb:.1f} MB CSV")
+        for name, fn in (("in-memory", in_memory), ("streamed", streamed)):
+            rows, elapsed, peak = measure(fn, path, os.path.join(tmp, "store"))
+            print(f"{name:<10} {rows:6d} windows | {elapsed:6.2f} s | peak memory {peak / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: whole-signal wavelet_denoise vs StreamingWaveletDenoiser.
+
+For synthetic single-channel recordings of each length in MINUTES (alpha
+and beta rhythms plus white noise, 256 Hz), compares:
+
+    whole-signal  the old classification.wavelet_denoise: one wavedec /
+                  waverec over the full signal, one sigma and one
+                  sqrt(2 log n) threshold
+    streaming     eeg_core.wavelet.StreamingWaveletDenoiser fed CHUNK-sample
+                  blocks as the live path would, then flushed
+
+and reports time, peak traced memory (in a second, traced run; the
+streaming run scores its output block by block instead of keeping it), the
+threshold used, the RMS error against the clean signal and (streaming) the
+worst time per block and the output delay.
+
+Run from the 4channel_device directory:
+    python -m benchmarks.bench_wavelet
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pywt
+
+from eeg_core.wavelet import StreamingWaveletDenoiser
+
+# =================== USER SETTINGS ===================
+FS = 256
+MINUTES = (10, 60, 240)
+CHUNK = 32        # samples per live block
+LEVEL = 3
+NOISE_UV = 4.0
+
+
+def make_signal(n, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / FS
+    clean = 10 * np.sin(2 * np.pi * 10 * t) + 4 * np.sin(2 * np.pi * 21 * t + 1.0)
+    return clean, clean + rng.normal(0, NOISE_UV, n)
+
+
+def whole_signal_denoise(signal, clean, wavelet="db4", level=LEVEL):
+    coeffs = pywt.wavedec(signal, wavelet, level=level)
+    sigma = np.median(np.abs(coeffs[-1])) / 0.6745
+    threshold = sigma * np.sqrt(2 * np.log(len(signal)))
+    for i in range(1, len(coeffs)):
+        coeffs[i] = pywt.threshold(coeffs[i], threshold, mode="soft")
+    denoised = pywt.waverec(coeffs, wavelet)[:len(signal)]
+    return rms(denoised, clean), threshold
+
+
+def streaming_denoise(signal, clean):
+    denoiser = StreamingWaveletDenoiser(level=LEVEL)
+    squared, done, worst, threshold = 0.0, 0, 0.0, float("nan")
+    for start in range(0, len(signal) + CHUNK, CHUNK):
+        t0 = time.perf_counter()
+        out = denoiser.process(signal[start:start + CHUNK]) if start < len(signal) else denoiser.flush()
+        worst = max(worst, time.perf_counter() - t0)
+        if start < len(signal) <= start + CHUNK:  # last block, before flush() resets sigma
+            threshold = float(denoiser.sigma[0] * denoiser.factor)
+        squared += float(np.sum((out - clean[done:done + len(out)]) ** 2))
+        done += len(out)
+    return np.sqrt(squared / done), threshold, worst, denoiser.delay
+
+
+def measure(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def rms(a, b):
+    return float(np.sqrt(np.mean((a - b) ** 2)))
+
+
+def main():
+    print(f"db4 level {LEVEL}, {CHUNK}-sample blocks, noise {NOISE_UV} uV RMS")
+    for minutes in MINUTES:
+        clean, noisy = make_signal(minutes * 60 * FS)
+        (whole_err, whole_thr), whole_s, whole_peak = measure(whole_signal_denoise, noisy, clean)
+        (stream_err, stream_thr, worst, delay), stream_s, stream_peak = measure(streaming_denoise, noisy, clean)
+        print(f"{minutes:4d} min ({len(noisy)} samples), raw error {rms(noisy, clean):.2f} uV")
+        print(f"  whole-signal {whole_s:7.2f} s  peak {whole_peak / 1e6:8.2f} MB  "
+              f"threshold {whole_thr:6.2f}  error {whole_err:.2f} uV")
+        print(f"  streaming    {stream_s:7.2f} s  peak {stream_peak / 1e6:8.2f} MB  "
+              f"threshold {stream_thr:6.2f}  error {stream_err:.2f} uV  "
+              f"worst block {worst * 1e3:.2f} ms  delay {delay} samples ({delay / FS * 1e3:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
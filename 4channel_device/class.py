@@ -1,96 +1,139 @@
-# eeg_model_training_no_feature_extraction.py
-
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.svm import SVC
-from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
-from imblearn.over_sampling import SMOTE
-import joblib
-from collections import Counter
-
-# 1. Load the dataset
-df = pd.read_csv("eeg_emotion_data.csv")
-
-# OPTIONAL: Verify you only have "Stressed" and "Relaxed". If not, map them:
-# mapping = {
-#     "Happy": "Relaxed",
-#     "Calm": "Relaxed",
-#     "Sad": "Stressed",
-#     "Angry": "Stressed",
-# }
-# df["Emotion"] = df["Emotion"].map(mapping)
-# df = df.dropna(subset=["Emotion"])
-
-# 2. Basic check of label distribution
-print("Label distribution in dataset:")
-print(df["Emotion"].value_counts())
-
-# 3. OPTIONAL: Plot raw EEG signals (FP1) for both emotions
-plt.figure(figsize=(10, 5))
-for emotion in df["Emotion"].unique():
-    subset = df[df["Emotion"] == emotion]
-    plt.plot(subset["Timestamp"], subset["FP1"], label=emotion, alpha=0.7)
-plt.xlabel("Timestamp (ms)")
-plt.ylabel("EEG Signal (FP1)")
-plt.title("Raw EEG Signals")
-plt.legend()
-plt.show()
-
-# 4. Define input (X) and output (y) without feature engineering
-#    We'll use "FP1" and "FP2" as our features; each row is considered one sample.
-X = df[["FP1", "FP2"]].values
-y = df["Emotion"].values
-
-print(f"Feature matrix shape: {X.shape}, Label array shape: {y.shape}")
-
-# 5. Encode labels
-label_encoder = LabelEncoder()
-y_encoded = label_encoder.fit_transform(y)
-print("Label classes encoded as:", list(label_encoder.classes_))
-print("Encoded label distribution:", Counter(y_encoded))
-
-# 6. Train-Test Split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y_encoded, test_size=0.2, random_state=42, stratify=y_encoded
-)
-print("Train distribution:", Counter(y_train))
-print("Test distribution:", Counter(y_test))
-
-# 7. Handle class imbalance with SMOTE
-smote = SMOTE(random_state=42)
-X_train_resampled, y_train_resampled = smote.fit_resample(X_train, y_train)
-print("After SMOTE distribution:", Counter(y_train_resampled))
-
-# 8. Standardize features
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train_resampled)
-X_test_scaled = scaler.transform(X_test)
-
-# 9. Train SVM model
-svm_model = SVC(kernel="rbf", C=1, gamma="scale", random_state=42)
-svm_model.fit(X_train_scaled, y_train_resampled)
-print("SVM model trained.")
-
-# 10. Evaluate model
-y_pred = svm_model.predict(X_test_scaled)
-accuracy = accuracy_score(y_test, y_pred)
-conf_mat = confusion_matrix(y_test, y_pred)
-class_rep = classification_report(y_test, y_pred, target_names=label_encoder.classes_)
-
-print("\nModel Evaluation on Test Set:")
-print("Accuracy:", accuracy)
-print("Confusion Matrix:\n", conf_mat)
-print("Classification Report:\n", class_rep)
-
-# 11. Save model components
-joblib.dump(svm_model, "svm_eeg_model.joblib")
-joblib.dump(scaler, "scaler.joblib")
-joblib.dump(label_encoder, "label_encoder.joblib")
-
-print("\nSaved the following files:")
-print(" - svm_eeg_model.joblib")
-print(" - scaler.joblib")
-print(" - label_encoder.joblib")
+# eeg_model_training_no_feature_extraction.py
+
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.svm import SVC
+from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
+from collections import Counter
+
+from eeg_core.kernel_sgd import fit_kernel_sgd
+from eeg_core.pipeline import MODEL_REGISTRY
+from eeg_core.registry import ModelRegistry
+from eeg_core.schema import DEFAULT_SCHEMA
+from eeg_core.search import grid_search, time_blocked_folds
+from eeg_core.training import label_segments
+
+# Registered separately from the 10-feature window model the apps load
+MODEL_NAME = "stress-raw"
+CHANNELS = list(DEFAULT_SCHEMA.channels)  # EEG columns used as per-sample inputs
+
+# "kernel_sgd": approximate RBF kernel + linear SGD on class-balanced
+#               minibatches (eeg_core.kernel_sgd); scales to millions of samples
+# "svc":        SMOTE + exact RBF SVC; O(n^2), only for short recordings
+MODE = "kernel_sgd"
+KERNEL_MAP = "nystroem"  # or "rbf_sampler"
+N_COMPONENTS = 256       # kernel approximation dimension
+
+# "svc" only: cross-validate PARAM_GRID on time-blocked folds over N_JOBS
+# processes before the final fit (eeg_core.search). Off by default: an RBF
+# SVC on every raw sample takes minutes per fit, times settings x folds.
+SEARCH = False
+PARAM_GRID = {"kernel": ["rbf"], "C": [0.1, 1, 10], "gamma": ["scale", 0.1, 1]}
+CV_FOLDS = 5
+N_JOBS = -1  # all cores
+
+# 1. Load the dataset
+df = pd.read_csv("eeg_emotion_data.csv")
+
+# OPTIONAL: Verify you only have "Stressed" and "Relaxed". If not, map them:
+# mapping = {
+#     "Happy": "Relaxed",
+#     "Calm": "Relaxed",
+#     "Sad": "Stressed",
+#     "Angry": "Stressed",
+# }
+# df["Emotion"] = df["Emotion"].map(mapping)
+# df = df.dropna(subset=["Emotion"])
+
+# 2. Basic check of label distribution
+print("Label distribution in dataset:")
+print(df["Emotion"].value_counts())
+
+# 3. OPTIONAL: Plot raw EEG signals (FP1) for both emotions
+plt.figure(figsize=(10, 5))
+for emotion in df["Emotion"].unique():
+    subset = df[df["Emotion"] == emotion]
+    plt.plot(subset["Timestamp"], subset["FP1"], label=emotion, alpha=0.7)
+plt.xlabel("Timestamp (ms)")
+plt.ylabel("EEG Signal (FP1)")
+plt.title("Raw EEG Signals")
+plt.legend()
+plt.show()
+
+# 4. Define input (X) and output (y) without feature engineering
+#    We'll use the CHANNELS columns as our features; each row is considered one sample.
+X = df[CHANNELS].values
+y = df["Emotion"].values
+
+print(f"Feature matrix shape: {X.shape}, Label array shape: {y.shape}")
+
+# 5. Encode labels
+label_encoder = LabelEncoder()
+y_encoded = label_encoder.fit_transform(y)
+print("Label classes encoded as:", list(label_encoder.classes_))
+print("Encoded label distribution:", Counter(y_encoded))
+
+# 6. Train-Test Split
+#    Held out: the last fifth of every recording session. Neighbouring
+#    samples are nearly identical, so a shuffled split would leak.
+groups = label_segments(df["Timestamp"].values, y)
+train_idx, test_idx = time_blocked_folds(groups, y_encoded, n_splits=5)[-1]
+X_train, X_test = X[train_idx], X[test_idx]
+y_train, y_test = y_encoded[train_idx], y_encoded[test_idx]
+print("Train distribution:", Counter(y_train))
+print("Test distribution:", Counter(y_test))
+
+if MODE == "kernel_sgd":
+    # 7-9. Standardize, map and train on class-balanced minibatches (no SMOTE rows)
+    svm_params = {"mode": MODE, "kernel_map": KERNEL_MAP, "n_components": N_COMPONENTS}
+    scaler, svm_model = fit_kernel_sgd(X_train, y_train, kernel=KERNEL_MAP, n_components=N_COMPONENTS)
+    X_test_scaled = scaler.transform(X_test)
+    print("Kernel SGD model trained.")
+else:
+    from imblearn.over_sampling import SMOTE
+
+    # 7. Handle class imbalance with SMOTE
+    smote = SMOTE(random_state=42)
+    X_train_resampled, y_train_resampled = smote.fit_resample(X_train, y_train)
+    print("After SMOTE distribution:", Counter(y_train_resampled))
+
+    # 8. Standardize features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train_resampled)
+    X_test_scaled = scaler.transform(X_test)
+
+    # 9. Train SVM model (SMOTE is applied inside each training fold only)
+    svm_params = {"kernel": "rbf", "C": 1, "gamma": "scale"}
+    if SEARCH:
+        search = grid_search(X, y_encoded, groups, PARAM_GRID, n_splits=CV_FOLDS, rows=train_idx,
+                             resampler=SMOTE(random_state=42), n_jobs=N_JOBS)
+        print(f"Grid search: {len(search.summary)} settings x {CV_FOLDS} folds in {search.seconds:.1f} s")
+        print("Per fold:\n", search.folds.to_string(index=False))
+        print("Mean over folds (best first):\n", search.summary.to_string())
+        svm_params = search.best_params
+    svm_model = SVC(random_state=42, **svm_params)
+    svm_model.fit(X_train_scaled, y_train_resampled)
+    print("SVM model trained.")
+
+# 10. Evaluate model
+y_pred = svm_model.predict(X_test_scaled)
+accuracy = accuracy_score(y_test, y_pred)
+conf_mat = confusion_matrix(y_test, y_pred)
+class_rep = classification_report(y_test, y_pred, target_names=label_encoder.classes_)
+
+print("\nModel Evaluation on Test Set:")
+print("Accuracy:", accuracy)
+print("Confusion Matrix:\n", conf_mat)
+print("Classification Report:\n", class_rep)
+
+# 11. Register model components (per-sample channel inputs, no windows)
+registry = ModelRegistry(MODEL_REGISTRY)
+version = registry.register(
+    MODEL_NAME, scaler, svm_model, label_encoder,
+    feature_schema=CHANNELS, fs=None, training_data="eeg_emotion_data.csv",
+    metrics={"accuracy": accuracy, "confusion_matrix": conf_mat.tolist()}, svm_params=svm_params,
+)
+
+print(f"\nRegistered {MODEL_NAME} version {version} in {MODEL_REGISTRY}/")
@@ -1,51 +1,55 @@
-import serial
-import csv
-import time
-
-# =================== USER SETTINGS ===================
-SERIAL_PORT = "COM11"  # Change this according to your system
-BAUD_RATE = 500000
-CSV_FILENAME = "eeg_emotion_data.csv"
-DURATION = 180  # Duration in seconds (3 minutes)
-
-# =================== SETUP SERIAL ===================
-try:
-    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-    print(f"Listening on {SERIAL_PORT} at {BAUD_RATE} baud... Press Ctrl+C to stop.")
-except serial.SerialException as e:
-    print(f"Error: {e}")
-    exit()
-
-# =================== CSV SETUP ===================
-with open(CSV_FILENAME, mode="a", newline="") as file:
-    writer = csv.writer(file)
-
-    # Write the header only if the file is empty
-    if file.tell() == 0:
-        writer.writerow(["Timestamp", "FP1", "FP2", "Emotion"])
-
-    try:
-        while True:
-            # =================== ASK FOR EMOTION ===================
-            emotion_label = input("\nEnter the emotion you are experiencing (Stressed, Relaxed): ").strip()
-            print(f"Recording data for emotion: {emotion_label} for {DURATION} seconds...")
-
-            start_time = time.time()
-
-            while time.time() - start_time < DURATION:
-                line = ser.readline().decode("utf-8").strip()
-                if line and "," in line:  # Ensure valid CSV format
-                    values = line.split(",")
-                    if len(values) == 3:  # Ensure exactly 3 values
-                        timestamp, fp1, fp2 = values
-                        writer.writerow([timestamp, fp1, fp2, emotion_label])
-                        print(f"Saved: {timestamp}, {fp1}, {fp2}, {emotion_label}")  # Print for debugging
-
-            print(f"Recording for {emotion_label} completed. Asking for new emotion...\n")
-
-    except KeyboardInterrupt:
-        print("\nData logging stopped.")
-    except Exception as e:
-        print(f"Error: {e}")
-
-ser.close()
+import serial
+import time
+
+from eeg_core import AcquisitionEngine
+from eeg_core.recorder import SessionRecorder
+from eeg_core.recording import export_csv
+
+# =================== USER SETTINGS ===================
+SERIAL_PORT = "COM11"  # Change this according to your system
+BAUD_RATE = 500000
+FS = 512  # Arduino sampling rate (Hz), used to check for dropped samples
+SESSION_PATH = time.strftime("sessions/session_%Y%m%d_%H%M%S.eegrec")  # one recording per run
+CSV_FILENAME = "eeg_emotion_data.csv"  # labelled samples are also appended here (None to skip)
+DURATION = 180  # Duration in seconds (3 minutes)
+
+# =================== SETUP SERIAL ===================
+try:
+    engine = AcquisitionEngine.from_serial(SERIAL_PORT, BAUD_RATE, fs=FS)
+    print(f"Listening on {SERIAL_PORT} at {BAUD_RATE} baud... Press Ctrl+C to stop.")
+except serial.SerialException as e:
+    print(f"Error: {e}")
+    exit()
+
+# =================== RECORD ===================
+# The serial port is drained on a background thread and a writer thread
+# stores large blocks in SESSION_PATH; this loop only sets the labels and
+# prints a status line once per second.
+with SessionRecorder(engine, SESSION_PATH) as recorder:
+    try:
+        while True:
+            # =================== ASK FOR EMOTION ===================
+            emotion_label = input("\nEnter the emotion you are experiencing (Stressed, Relaxed): ").strip()
+            print(f"Recording data for emotion: {emotion_label} for {DURATION} seconds...")
+
+            recorder.start_label(emotion_label)
+            recorder.wait(DURATION)
+            recorder.stop_label()
+
+            print(f"Recording for {emotion_label} completed. Asking for new emotion...\n")
+
+    except KeyboardInterrupt:
+        print("\nData logging stopped.")
+    except Exception as e:
+        print(f"Error: {e}")
+
+# =================== SUMMARY ===================
+for label, stats in recorder.completed:
+    print(f"{label}: received {stats['received']} of {stats['expected']} expected samples "
+          f"({stats['missing']} missing, {stats['gaps']} gaps)")
+print(f"Skipped {engine.parser.dropped} malformed lines, {recorder.lost} samples overwritten before writing.")
+print(f"Session saved to {SESSION_PATH}")
+
+if CSV_FILENAME:
+    export_csv(SESSION_PATH, CSV_FILENAME, append=True, labelled_only=True)
+    print(f"Labelled samples appended to {CSV_FILENAME}")
@@ -0,0 +1,81 @@
+"""
+Shared EEG acquisition and prediction code for the 4-channel device scripts.
+"""
+
+from .acquisition import (
+    COLUMNS,
+    DEFAULT_UI_REFRESH_HZ,
+    READ_TIMEOUT,
+    AcquisitionEngine,
+    RingBuffer,
+)
+from .blink import Blink, BlinkControl, BlinkDetector, FakeKeySink, KeyDispatcher, latency_histogram
+from .cache import FeatureCache
+from .filters import StreamingFilter, design_bandpass, design_notch, filter_offline
+from .framing import FrameDecoder, FrameFormat, encode_frames
+from .fused import FusedSVC, export_model, fused_model
+from .kernel_sgd import KERNEL_MAPS, balanced_batches, fit_kernel_sgd
+from .live import LivePrediction, LivePredictor, RollingFeatures, live_prediction_panel
+from .metrics import AcquisitionMetrics, TimestampStats
+from .moments import RunningMoments, block_moments, merge_moments, remove_moments
+from .parser import BulkLineParser, LineParser
+from .pipeline import (
+    ALPHA_BAND,
+    FEATURE_NAMES,
+    FS,
+    MODEL_FILES,
+    MODEL_NAME,
+    MODEL_NOT_FOUND,
+    MODEL_REGISTRY,
+    classify_batch,
+    classify_stress,
+    collect_eeg_data,
+    compute_alpha_power,
+    extract_features,
+    load_model_components,
+    make_prediction,
+    save_prediction_to_csv,
+    stress_rating,
+)
+from .recorder import SessionRecorder
+from .recording import Recording, RecordingWriter, export_csv, import_csv, is_recording
+from .registry import LoadedModel, ModelRegistry
+from .replay import ReplayPort, encode_lines, load_recording
+from .schema import DEFAULT_SCHEMA, ChannelSchema
+from .search import SearchResult, grid_search, overlap_purge, time_blocked_folds
+from .service import MicroBatcher, PredictionClient, make_server
+from .sources import SYNTHETIC, SyntheticEEG, SyntheticPort, open_port, read_samples
+from .spectral import BANDS, StreamingWelch, band_weights
+from .training import (
+    DEFAULT_STAGES,
+    FeatureStore,
+    build_feature_store,
+    flush_stages,
+    iter_label_segments,
+    label_segments,
+)
+from .wavelet import StreamingWaveletDenoiser
+from .windows import feature_names, sliding_window_features, window_moments
+
+# Imported on first use, so that `import eeg_core` (every app and CLI) does
+# not load asyncio for the hub or sqlite3 for the prediction log
+_LAZY = {
+    "AcquisitionHub": "hub",
+    "HubDevice": "hub",
+    "HubPrediction": "hub",
+    "PREDICTIONS_DB": "predictions",
+    "PredictionLog": "predictions",
+    "log_prediction": "predictions",
+    "open_prediction_log": "predictions",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,232 @@
+"""
+Background serial acquisition for the Arduino EEG stream.
+
+The Arduino sends CSV lines formatted as "Time(ms),Fp1(uV),Fp2(uV)" (a
+column per channel, see eeg_core.schema) at ~512 Hz. Reading those one
+`readline()` at a time on the Streamlit script thread drops samples, so
+the port is drained on a dedicated thread into a preallocated ring buffer
+and the UI only polls it at a bounded rate.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .metrics import AcquisitionMetrics
+from .parser import BulkLineParser
+from .schema import DEFAULT_SCHEMA
+
+# Samples are stored as rows of [Timestamp, FP1, FP2] (schema.columns)
+COLUMNS = DEFAULT_SCHEMA.columns
+DEFAULT_UI_REFRESH_HZ = 4
+# pySerial read timeout: reads return after this long with whatever arrived,
+# which batches ~10 lines per read at 512 Hz instead of one line per read
+READ_TIMEOUT = 0.02
+
+
+# ---------------------------------------------------------------------
+# 1) Ring Buffer
+# ---------------------------------------------------------------------
+class RingBuffer:
+    """
+    Single-producer / single-consumer ring buffer of fixed-width rows.
+
+    Every row is written twice (at i and i + capacity), so the most recent
+    `n <= capacity` rows are always one contiguous slice and can be handed
+    out as zero-copy views. The producer fills the rows before publishing
+    the new `count`, so readers never see a half-written block and no lock
+    is needed.
+
+    A returned view stays valid until the producer wraps around and
+    overwrites it; copy it if you hold on to it longer than that.
+    """
+
+    def __init__(self, capacity, n_columns=len(COLUMNS), dtype=np.float32):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._data = np.zeros((2 * self.capacity, n_columns), dtype=dtype)
+        self._count = 0  # total rows ever written (published last)
+
+    @property
+    def count(self):
+        return self._count
+
+    def write(self, block):
+        """Append a (n, n_columns) block of rows."""
+        n = len(block)
+        if n == 0:
+            return
+        cap = self.capacity
+        total = self._count + n
+        if n > cap:
+            block = block[-cap:]
+            n = cap
+        start = (total - n) % cap
+        first = min(n, cap - start)
+        self._data[start:start + first] = block[:first]
+        self._data[start + cap:start + cap + first] = block[:first]
+        rest = n - first
+        if rest:
+            self._data[:rest] = block[first:]
+            self._data[cap:cap + rest] = block[first:]
+        self._count = total
+
+    def latest(self, n):
+        """Zero-copy view of the most recent `n` rows (fewer if not available)."""
+        count = self._count
+        n = max(0, min(int(n), count, self.capacity))
+        end = count % self.capacity + self.capacity
+        return self._data[end - n:end]
+
+    def read_since(self, cursor):
+        """
+        Zero-copy view of the rows written since `cursor` (an earlier `count`),
+        plus the new cursor. Rows that were already overwritten are skipped.
+        """
+        count = self._count
+        return self.latest(count - cursor), count
+
+
+# ---------------------------------------------------------------------
+# 2) Acquisition Engine
+# ---------------------------------------------------------------------
+class AcquisitionEngine:
+    """
+    Drain a serial port on a background thread into a RingBuffer.
+
+    `port` is anything with pySerial's `read(size)` / `in_waiting` /
+    `close()` interface: a real `serial.Serial`, a pty opened through
+    pySerial, or a `ReplayPort` stand-in for tests.
+
+    `metrics` (eeg_core.metrics.AcquisitionMetrics) is updated on every read;
+    `stats()` returns a snapshot of it plus the parser's failure count.
+
+    `schema` (eeg_core.schema.ChannelSchema) gives the channels after the
+    timestamp on each line; rows are stored as `schema.columns`.
+    """
+
+    def __init__(self, port, fs=512, capacity_seconds=120, parser=None, read_size=4096,
+                 schema=DEFAULT_SCHEMA):
+        self.port = port
+        self.fs = fs
+        self.schema = schema
+        self.read_size = read_size
+        self.parser = parser or BulkLineParser(len(schema.columns))
+        self.buffer = RingBuffer(int(capacity_seconds * fs), len(schema.columns))
+        self.metrics = AcquisitionMetrics(fs)
+        self.error = None
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_serial(cls, port, baud_rate=500000, **kwargs):
+        """Open `port` with pySerial and wrap it in an engine."""
+        import serial  # PySerial
+
+        return cls(serial.Serial(port, baud_rate, timeout=READ_TIMEOUT), **kwargs)
+
+    # -------------------- lifecycle --------------------
+    def start(self):
+        if self.running:
+            return self
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="eeg-acquisition", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.port.close()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        try:
+            metrics = self.metrics
+            while not self._stop.is_set():
+                backlog = self.port.in_waiting
+                chunk = self.port.read(max(self.read_size, backlog))
+                now = time.perf_counter()
+                metrics.on_read(now, backlog, len(chunk))
+                if not chunk:
+                    if getattr(self.port, "exhausted", False):  # end of a replayed recording
+                        break
+                    continue
+                block = self.parser.feed(chunk)
+                if len(block):
+                    metrics.on_block(now, block)
+                    self.buffer.write(block)
+                    for listener in self._listeners:
+                        listener(block)
+        except Exception as e:  # surfaced to the consumer through `error`
+            self.error = e
+
+    # -------------------- consumer API --------------------
+    def add_listener(self, listener):
+        """
+        Call `listener(block)` on the acquisition thread with every parsed
+        (n, 1 + n_channels) block, e.g. to keep running statistics up to
+        date. Listeners must be quick; they run between serial reads.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def stats(self):
+        """Acquisition metrics snapshot (see eeg_core.metrics) as a flat dict."""
+        return dict(self.metrics.snapshot(), parse_failures=self.parser.dropped)
+
+    @property
+    def total_samples(self):
+        return self.buffer.count
+
+    def latest(self, seconds):
+        """Zero-copy view of the last `seconds` of [Timestamp, FP1, FP2] (schema.columns) rows."""
+        return self.buffer.latest(seconds * self.fs)
+
+    def read_since(self, cursor):
+        return self.buffer.read_since(cursor)
+
+    def collect(self, duration_seconds, on_progress=None, refresh_hz=DEFAULT_UI_REFRESH_HZ):
+        """
+        Block the caller for `duration_seconds` while the background thread
+        acquires, calling `on_progress(fraction)` at most `refresh_hz` times
+        per second. Returns a copy of the rows acquired during the window.
+        """
+        self.start()
+        cursor = self.buffer.count
+        start_time = time.time()
+        interval = 1.0 / refresh_hz
+        while True:
+            if self.error is not None:
+                raise self.error
+            elapsed = time.time() - start_time
+            if elapsed >= duration_seconds:
+                break
+            if on_progress is not None:
+                on_progress(min(1.0, elapsed / duration_seconds))
+            time.sleep(min(interval, duration_seconds - elapsed))
+        if on_progress is not None:
+            on_progress(1.0)
+        block, _ = self.buffer.read_since(cursor)
+        return block.copy()
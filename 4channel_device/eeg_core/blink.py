@@ -0,0 +1,374 @@
+"""
+Host-side eye-blink detection and key dispatch.
+
+Dino_EYE_Blink.py and try.py used to wait for the literal "BLINK" line of
+eye_blink.ino and call pyautogui.press on the serial read loop, so a slow
+key press delayed the next read and any exception ended the loop. Here:
+
+    BlinkDetector   finds blinks in the Fp1 sample stream itself (any
+                    [Timestamp, FP1, FP2] source: serial, replayed CSV,
+                    synthetic). Per block, vectorized: the firmware's DC
+                    removal and short-term smoothing (one-pole filters with
+                    carried state), then threshold crossings with a
+                    refractory period. The threshold adapts: K robust
+                    standard deviations (median |x| / 0.6745) of the quiet
+                    samples, tracked with an exponential moving average over
+                    BASELINE_SECONDS, never below MIN_UV.
+    KeyDispatcher   presses the key on its own thread, debounced, so the
+                    acquisition thread never waits on the keyboard; errors
+                    are counted and surfaced through `error`, not fatal.
+                    Each press records the latency from the host receiving
+                    the samples of the blink to the press being sent (the
+                    call, not its return: pyautogui sleeps PAUSE after it).
+    BlinkControl    wires an AcquisitionEngine to both.
+
+`run` is the main loop of both scripts, in "raw" mode (BlinkControl) or
+"firmware" mode (the firmware's BLINK lines, split out of whole reads by
+BlinkLineParser, through the dispatcher).
+FakeKeySink stands in for pyautogui in tests and dry runs.
+"""
+
+import math
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+DC_SECONDS = 2.0         # time constant of the DC removal (firmware DC_ALPHA 0.999 at 512 Hz)
+SMOOTH_SECONDS = 0.01    # time constant of the smoothing (firmware STM_ALPHA 0.8 at 512 Hz)
+K = 5.0                  # threshold in robust standard deviations of the baseline
+MIN_UV = 25.0            # threshold floor
+REFRACTORY_MS = 400.0    # firmware BLINK_RESET_TIME_MS
+BASELINE_SECONDS = 5.0   # memory of the adaptive baseline
+WARMUP_SECONDS = 1.0     # baseline only, no detections, at the start of a stream
+DEBOUNCE_MS = 300.0
+LATENCY_BINS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# One detected blink: `sample` is its index in the stream, `time` the
+# device timestamp (ms) of that sample, `arrival` the host perf_counter()
+# time its block was received
+Blink = namedtuple("Blink", "sample time amplitude threshold arrival")
+
+
+# ---------------------------------------------------------------------
+# 1) Detection
+# ---------------------------------------------------------------------
+class BlinkDetector:
+    """Adaptive-threshold blink detection on one channel, block by block."""
+
+    def __init__(self, fs=512, k=K, min_uv=MIN_UV, refractory_ms=REFRACTORY_MS,
+                 baseline_seconds=BASELINE_SECONDS, warmup_seconds=WARMUP_SECONDS,
+                 dc_seconds=DC_SECONDS, smooth_seconds=SMOOTH_SECONDS):
+        self.fs = fs
+        self.k = k
+        self.min_uv = min_uv
+        self.refractory = int(round(refractory_ms * fs / 1000.0))
+        self.baseline_samples = baseline_seconds * fs
+        self.warmup = int(warmup_seconds * fs)
+        self._dc = math.exp(-1.0 / (dc_seconds * fs))
+        self._smooth = math.exp(-1.0 / (smooth_seconds * fs))
+        self.reset()
+
+    def reset(self):
+        self.position = 0
+        self.blinks = 0
+        self._zi = None
+        self._level = None    # EMA of median |x| of the quiet samples
+        self._above = False   # last sample was above the threshold
+        self._last = -self.refractory  # sample of the last blink
+
+    @property
+    def threshold(self):
+        """Current threshold in uV (inf until the baseline has warmed up)."""
+        if self._level is None or self.position < self.warmup:
+            return math.inf
+        return max(self.min_uv, self.k * self._level / 0.6745)
+
+    def _filter(self, x):
+        from scipy.signal import lfilter
+
+        if self._zi is None:
+            # Start the DC tracker at the first sample instead of ringing up from 0
+            self._zi = [np.array([self._dc * x[0]]), np.zeros(1)]
+        dc, self._zi[0] = lfilter([1.0 - self._dc], [1.0, -self._dc], x, zi=self._zi[0])
+        smooth, self._zi[1] = lfilter([1.0 - self._smooth], [1.0, -self._smooth], x - dc, zi=self._zi[1])
+        return smooth
+
+    def process(self, signal, timestamps=None, arrival=None):
+        """
+        Blinks whose onset (first sample above the threshold) is in this
+        block of `signal` samples, as a list of Blink.
+        """
+        x = np.asarray(signal, dtype=np.float64)
+        if len(x) == 0:
+            return []
+        arrival = time.perf_counter() if arrival is None else arrival
+        magnitude = np.abs(self._filter(x))
+        threshold = self.threshold
+        above = magnitude > threshold
+        onsets = np.flatnonzero(above & ~np.concatenate([[self._above], above[:-1]]))
+
+        events = []
+        for i in onsets:  # a handful per block at most
+            sample = self.position + int(i)
+            if sample - self._last < self.refractory:
+                continue
+            self._last = sample
+            # Peak of the excursion within this block
+            rest = above[i:]
+            end = i + (len(rest) if rest.all() else int(np.argmin(rest)))
+            events.append(Blink(sample, None if timestamps is None else float(timestamps[i]),
+                                float(magnitude[i:end].max()), threshold, arrival))
+        self.blinks += len(events)
+
+        quiet = magnitude[~above]
+        if len(quiet):
+            level = float(np.median(quiet))
+            if self._level is None:
+                self._level = level
+            else:
+                weight = 1.0 - math.exp(-len(quiet) / self.baseline_samples)
+                self._level += weight * (level - self._level)
+        self._above = bool(above[-1])
+        self.position += len(x)
+        return events
+
+
+# ---------------------------------------------------------------------
+# 2) Key Dispatch
+# ---------------------------------------------------------------------
+class FakeKeySink:
+    """Key press stand-in recording (key, perf_counter) calls, with an optional delay per press."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.presses = []
+
+    def __call__(self, key):
+        if self.delay:
+            time.sleep(self.delay)
+        self.presses.append((key, time.perf_counter()))
+
+
+def latency_histogram(latencies, bins_ms=LATENCY_BINS_MS):
+    """[(upper bound ms, count), ...] of latencies in seconds; the last bound is inf."""
+    edges = np.asarray(bins_ms, dtype=np.float64)
+    counts = np.bincount(np.searchsorted(edges, np.asarray(latencies) * 1000.0, side="left"),
+                         minlength=len(edges) + 1)
+    return list(zip([*bins_ms, math.inf], counts.tolist()))
+
+
+def format_histogram(histogram, width=40):
+    total = max(sum(count for _, count in histogram), 1)
+    lines, lower = [], 0
+    for upper, count in histogram:
+        label = f"{lower:g}-{upper:g} ms" if upper != math.inf else f">{lower:g} ms"
+        lines.append(f"{label:>14} {count:6d} {'#' * int(round(width * count / total))}")
+        lower = upper
+    return "\n".join(lines)
+
+
+class KeyDispatcher:
+    """
+    Presses `key` with `press(key)` (default pyautogui.press) on a worker
+    thread for each submitted Blink, skipping those within `debounce_ms` of
+    the last pressed one.
+    """
+
+    def __init__(self, press=None, key="space", debounce_ms=DEBOUNCE_MS, max_pending=16,
+                 on_press=None, max_latencies=10_000):
+        if press is None:
+            import pyautogui
+
+            pyautogui.PAUSE = 0  # no sleep after every call
+            press = pyautogui.press
+        self.press = press
+        self.key = key
+        self.debounce = debounce_ms / 1000.0
+        self.on_press = on_press
+        self.error = None
+        self.pressed = 0
+        self.debounced = 0
+        self.dropped = 0  # blinks submitted while max_pending were waiting
+        self.errors = 0
+        self.latencies = deque(maxlen=max_latencies)
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._last = -math.inf
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="eeg-key-dispatch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, blinks):
+        """Queue blinks for pressing; never blocks the caller."""
+        for blink in blinks:
+            try:
+                self._pending.put_nowait(blink)
+            except queue.Full:
+                self.dropped += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                blink = self._pending.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if blink.arrival - self._last < self.debounce:
+                self.debounced += 1
+                continue
+            sent = time.perf_counter()
+            try:
+                self.press(self.key)
+            except Exception as e:  # keep dispatching; surfaced through `error`
+                self.error = e
+                self.errors += 1
+                continue
+            self._last = blink.arrival
+            self.pressed += 1
+            self.latencies.append(sent - blink.arrival)
+            if self.on_press is not None:
+                self.on_press(blink)
+
+    def stats(self):
+        """Counts and blink-to-keypress latency percentiles (ms) and histogram."""
+        lat = np.asarray(self.latencies) * 1000.0
+        pct = (lambda q: float(np.percentile(lat, q))) if len(lat) else (lambda q: float("nan"))
+        return {"pressed": self.pressed, "debounced": self.debounced, "dropped": self.dropped,
+                "errors": self.errors, "p50_ms": pct(50), "p95_ms": pct(95), "p99_ms": pct(99),
+                "max_ms": float(lat.max()) if len(lat) else float("nan"),
+                "histogram": latency_histogram(self.latencies)}
+
+
+# ---------------------------------------------------------------------
+# 3) Wiring
+# ---------------------------------------------------------------------
+class BlinkLineParser:
+    """
+    Count the "BLINK" lines of eye_blink.ino in a byte stream read in
+    arbitrary chunks. Like LineParser, the incomplete last line is carried
+    to the next `feed`, so a line split across two short reads (the port's
+    READ_TIMEOUT is 20 ms) is still seen whole.
+    """
+
+    def __init__(self):
+        self._partial = b""
+
+    def feed(self, chunk):
+        """Number of complete BLINK lines in `chunk` and the carried bytes."""
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        return sum(line.strip() == b"BLINK" for line in lines)
+
+
+class BlinkControl:
+    """Runs a BlinkDetector on an AcquisitionEngine's FP1 and feeds a KeyDispatcher."""
+
+    def __init__(self, engine, dispatcher, detector=None, channel=1):
+        self.engine = engine
+        self.dispatcher = dispatcher
+        self.detector = detector or BlinkDetector(engine.fs)
+        self.channel = channel  # column of the [Timestamp, FP1, FP2] block
+
+    def _on_block(self, block):
+        arrival = time.perf_counter()
+        blinks = self.detector.process(block[:, self.channel], block[:, 0], arrival)
+        if blinks:
+            self.dispatcher.submit(blinks)
+
+    def start(self):
+        self.detector.reset()
+        self.dispatcher.start()
+        self.engine.add_listener(self._on_block)
+        self.engine.start()
+        return self
+
+    def stop(self):
+        self.engine.remove_listener(self._on_block)
+        self.engine.stop()
+        self.dispatcher.stop()
+
+    def close(self):
+        self.stop()
+        self.engine.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run(source, mode="raw", fs=512, baud_rate=500000, key="space", press=None, speed=1.0,
+        detector_kwargs=None, duration=None):
+    """
+    Press `key` on every blink until Ctrl+C (or `duration` seconds, or the
+    end of a replayed recording), then print the latency histogram.
+
+    mode "raw":      detect blinks in the FP1 stream of `source` (serial port,
+                     recorded CSV, or "synthetic"; see eeg_core.sources)
+    mode "firmware": react to the "BLINK" lines printed by eye_blink.ino
+
+    `source` may also be an open port (anything with pySerial's `read` and
+    `in_waiting`, e.g. a ReplayPort over recorded firmware output).
+    """
+    from .acquisition import AcquisitionEngine
+    from .sources import open_port
+
+    def announce(blink):
+        print("Eye Blink Detected! Pressed", key.upper(),
+              "" if blink.amplitude is None else f"({blink.amplitude:.0f} uV > {blink.threshold:.0f} uV)")
+
+    try:
+        port = source if hasattr(source, "read") else open_port(source, fs, speed, baud_rate)
+    except Exception as e:  # e.g. serial.SerialException for a wrong port
+        print(f"Error: {e}")
+        return None
+    dispatcher = KeyDispatcher(press, key=key, on_press=announce).start()
+    print(f"Listening on {source if isinstance(source, str) else type(source).__name__} ({mode} mode)...")
+    deadline = math.inf if duration is None else time.perf_counter() + duration
+    try:
+        if mode == "raw":
+            engine = AcquisitionEngine(port, fs=fs)
+            with BlinkControl(engine, dispatcher, BlinkDetector(fs, **(detector_kwargs or {}))):
+                while engine.running and engine.error is None and time.perf_counter() < deadline:
+                    time.sleep(0.1)
+            if engine.error is not None:
+                print(f"Error: {engine.error}")
+        else:
+            parser, sample = BlinkLineParser(), 0
+            while time.perf_counter() < deadline and not getattr(port, "exhausted", False):
+                # Blocks up to the port timeout for the first byte, then takes the backlog
+                n_blinks = parser.feed(port.read(max(1, port.in_waiting)))
+                if n_blinks:
+                    arrival = time.perf_counter()
+                    dispatcher.submit([Blink(sample + i, None, None, None, arrival) for i in range(n_blinks)])
+                    sample += n_blinks
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:  # e.g. the serial port went away
+        print(f"Error: {e}")
+    finally:
+        dispatcher.stop()
+        if mode != "raw":
+            port.close()
+
+    stats = dispatcher.stats()
+    print(f"\n{stats['pressed']} key presses, {stats['debounced']} debounced, {stats['errors']} errors | "
+          f"blink-to-keypress p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms")
+    print(format_histogram(stats["histogram"]))
+    if dispatcher.error is not None:
+        print(f"Last key press error: {dispatcher.error}")
+    return stats
@@ -0,0 +1,198 @@
+"""
+Content-addressed on-disk cache for preprocessed signals and features.
+
+classification.py rebuilt its feature store (bandpass -> notch -> windows
+-> features over the whole recording) on every run, even when only the SVM
+settings changed. Results are now stored under a key that hashes
+
+    the SHA-256 of the source recording + every parameter that shapes the
+    output (fs, filter cutoffs/order, notch freq/Q, wavelet and level,
+    window_size, step_size, channels, ...)
+
+so a rerun with the same data and preprocessing reuses them, and changing
+any of those (or appending to the recording) builds a new entry:
+
+    feature_cache/
+        index.json          entries (bytes, last use, hits, params), source
+                            hashes by (size, mtime), hit/miss totals
+        3f9c2a1b.../        one directory per key (a FeatureStore, or
+                            array.npy for a signal)
+
+Source hashes are reused while the file's size and mtime are unchanged.
+When the entries exceed `max_bytes`, the least recently used are deleted.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from .registry import file_sha256
+
+CACHE_DIR = "feature_cache"
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+CACHE_FORMAT = 1  # bump when cached feature code changes, to invalidate old entries
+INDEX = "index.json"
+ARRAY = "array.npy"
+
+
+def _dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+class FeatureCache:
+    """Size-bounded LRU cache of preprocessing results, keyed by content."""
+
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        try:
+            with open(os.path.join(root, INDEX)) as f:
+                self.index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.index = {"entries": {}, "sources": {}, "hits": 0, "misses": 0, "evictions": 0}
+        # Entries whose directory was deleted by hand
+        for key in [k for k in self.index["entries"] if not os.path.isdir(os.path.join(root, k))]:
+            del self.index["entries"][key]
+        self.session = {"hits": 0, "misses": 0}
+
+    def _save(self):
+        tmp = os.path.join(self.root, INDEX + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, os.path.join(self.root, INDEX))
+
+    # -------------------- keys --------------------
+    def source_hash(self, path):
+        """SHA-256 of `path`, rehashed only when its size or mtime changes."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        known = self.index["sources"].get(path)
+        if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            return known["sha256"]
+        digest = file_sha256(path)
+        self.index["sources"][path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def key(self, source, params):
+        """Cache key of `params` (a JSON-serializable dict) applied to the file `source`."""
+        blob = json.dumps({"format": CACHE_FORMAT, "source": self.source_hash(source), "params": params},
+                          sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+    # -------------------- lookups --------------------
+    def entry(self, source, params, build):
+        """
+        Directory of the entry for (source, params). On a miss, `build(path)`
+        is called to fill a fresh directory, which then becomes the entry.
+        """
+        key = self.key(source, params)
+        path = os.path.join(self.root, key)
+        entries = self.index["entries"]
+        if key in entries and os.path.isdir(path):
+            counter = "hits"
+            entries[key]["hits"] += 1
+        else:
+            counter = "misses"
+            staging = os.path.join(self.root, f".build-{key}-{os.getpid()}")
+            shutil.rmtree(staging, ignore_errors=True)
+            try:
+                build(staging)
+                shutil.rmtree(path, ignore_errors=True)
+                os.replace(staging, path)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            entries[key] = {"source": os.path.abspath(source), "params": params,
+                            "bytes": _dir_bytes(path), "created": time.time(), "hits": 0}
+        entries[key]["last_used"] = time.time()
+        self.index[counter] += 1
+        self.session[counter] += 1
+        self._evict(keep=key)
+        self._save()
+        return path
+
+    def array(self, source, params, compute):
+        """Memory-mapped array `compute()` for (source, params), computed on a miss."""
+        def build(path):
+            os.makedirs(path)
+            np.save(os.path.join(path, ARRAY), np.asarray(compute()))
+
+        return np.load(os.path.join(self.entry(source, params, build), ARRAY), mmap_mode="r")
+
+    def feature_store(self, source, **kwargs):
+        """
+        FeatureStore of eeg_core.training.build_feature_store(source, ...,
+        **kwargs), built on a miss. A custom `make_stages` needs
+        `stage_params` describing its stages, since they are part of the key.
+        """
+        from .training import (CHANNELS, DEFAULT_STAGES, LABEL_COLUMN, MAX_GAP_MS, FeatureStore,
+                               build_feature_store)
+
+        if kwargs.get("make_stages") is not None and kwargs.get("stage_params") is None:
+            raise ValueError("a custom make_stages needs stage_params for the cache key")
+        params = {"kind": "feature_store", "fs": kwargs.get("fs", 256),
+                  "window_size": kwargs.get("window_size", 500), "step_size": kwargs.get("step_size", 250),
+                  "channels": list(kwargs.get("channels", CHANNELS)),
+                  "label_column": kwargs.get("label_column", LABEL_COLUMN),
+                  "max_gap_ms": kwargs.get("max_gap_ms", MAX_GAP_MS),
+                  "stages": kwargs.get("stage_params") or DEFAULT_STAGES}
+        path = self.entry(source, params, lambda path: build_feature_store(source, path, **kwargs))
+        return FeatureStore(path)
+
+    # -------------------- housekeeping --------------------
+    def _evict(self, keep=None):
+        entries = self.index["entries"]
+        total = sum(e["bytes"] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            total -= entries.pop(key)["bytes"]
+            self.index["evictions"] += 1
+
+    def clear(self):
+        for key in list(self.index["entries"]):
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+        self.index["entries"] = {}
+        self._save()
+
+    def stats(self):
+        """Hit/miss counts (this process and all time), entries and size on disk."""
+        lookups = self.index["hits"] + self.index["misses"]
+        return {"session_hits": self.session["hits"], "session_misses": self.session["misses"],
+                "hits": self.index["hits"], "misses": self.index["misses"],
+                "hit_rate": self.index["hits"] / lookups if lookups else float("nan"),
+                "evictions": self.index["evictions"], "entries": len(self.index["entries"]),
+                "bytes": sum(e["bytes"] for e in self.index["entries"].values()),
+                "max_bytes": self.max_bytes}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or empty the feature cache.")
+    parser.add_argument("command", choices=("stats", "clear"))
+    parser.add_argument("--root", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    cache = FeatureCache(args.root)
+    if args.command == "clear":
+        cache.clear()
+    stats = cache.stats()
+    print(f"{stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB of {stats['max_bytes'] / 1e6:.0f} MB | "
+          f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions")
+    for key, entry in sorted(cache.index["entries"].items(), key=lambda kv: -kv[1]["last_used"]):
+        print(f"  {key}  {entry['params'].get('kind', 'array'):<13} {entry['bytes'] / 1e6:8.1f} MB  "
+              f"{entry['hits']:4d} hits  {os.path.basename(entry['source'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Bandpass + notch filter bank as second-order sections.
+
+classification.py filters whole recordings with `filtfilt`, which is
+zero-phase but needs the entire signal, and re-designs the filters on every
+call. Here the designs are cached per parameter set and kept as SOS (better
+conditioned than (b, a) for a 0.5 Hz edge). Two modes share them:
+
+    StreamingFilter     causal `sosfilt` over chunks as they arrive, with the
+                        `zi` state carried between chunks, so each sample
+                        is filtered exactly once (live path)
+    filter_offline      zero-phase `sosfiltfilt` over a whole recording
+                        (training), or causal `sosfilt` for comparison
+
+Chunked streaming output equals causal filtering of the whole signal in one
+call; it differs from the zero-phase output only by the filters' phase delay.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .pipeline import FS
+
+# Preprocessing used for training in classification.py
+BANDPASS = (0.5, 50.0)
+BANDPASS_ORDER = 4
+NOTCH_FREQ = 50.0
+NOTCH_QUALITY = 30.0
+
+
+@lru_cache(maxsize=None)
+def design_bandpass(fs, lowcut=BANDPASS[0], highcut=BANDPASS[1], order=BANDPASS_ORDER):
+    """Butterworth bandpass as an (n_sections, 6) SOS array."""
+    from scipy.signal import butter
+
+    sos = butter(order, [lowcut, highcut], btype="band", fs=fs, output="sos")
+    sos.flags.writeable = False  # shared through the cache
+    return sos
+
+
+@lru_cache(maxsize=None)
+def design_notch(fs, freq=NOTCH_FREQ, quality=NOTCH_QUALITY):
+    """IIR notch at `freq` Hz with Q-factor `quality`, as SOS."""
+    from scipy.signal import iirnotch, tf2sos
+
+    b, a = iirnotch(freq, quality, fs=fs)
+    sos = tf2sos(b, a)
+    sos.flags.writeable = False
+    return sos
+
+
+def filter_bank_sos(fs, band=BANDPASS, order=BANDPASS_ORDER, notch=NOTCH_FREQ, quality=NOTCH_QUALITY):
+    """
+    Bandpass followed by the notch as one SOS cascade; `band=None` or
+    `notch=None` leaves that stage out.
+    """
+    stages = []
+    if band is not None:
+        stages.append(design_bandpass(fs, band[0], band[1], order))
+    if notch:
+        stages.append(design_notch(fs, notch, quality))
+    if not stages:
+        raise ValueError("filter bank needs a band and/or a notch")
+    return np.vstack(stages)
+
+
+def filter_offline(signal, fs=FS, band=BANDPASS, order=BANDPASS_ORDER, notch=NOTCH_FREQ,
+                   quality=NOTCH_QUALITY, zero_phase=True):
+    """
+    Filter a whole (n_samples,) or (n_samples, n_channels) recording.
+    `zero_phase=True` runs the cascade forward and backward (training);
+    `zero_phase=False` is the causal response the live path produces.
+    """
+    from scipy.signal import sosfiltfilt
+
+    signal = np.asarray(signal, dtype=np.float64)
+    if zero_phase:
+        return sosfiltfilt(filter_bank_sos(fs, band, order, notch, quality), signal, axis=0)
+    x = signal.reshape(len(signal), -1)
+    stream = StreamingFilter(fs, band, order, notch, quality, n_channels=x.shape[1])
+    return stream.process(x).reshape(signal.shape)
+
+
+class StreamingFilter:
+    """
+    Causal filter bank over a (samples, channels) stream.
+
+    `process(block)` filters only the new samples and keeps the per-section
+    state for the next block. The state is initialised to the steady state
+    for the first sample, so the DC offset of the electrodes does not ring
+    through the bandpass at start-up.
+    """
+
+    def __init__(self, fs=FS, band=BANDPASS, order=BANDPASS_ORDER, notch=NOTCH_FREQ,
+                 quality=NOTCH_QUALITY, n_channels=2):
+        self.fs = fs
+        self.n_channels = n_channels
+        self.sos = filter_bank_sos(fs, band, order, notch, quality)
+        self.reset()
+
+    def reset(self):
+        self._zi = None
+
+    def process(self, block):
+        """Filter a (n, n_channels) block; returns a float64 array of the same shape."""
+        from scipy.signal import sosfilt, sosfilt_zi
+
+        x = np.asarray(block, dtype=np.float64).reshape(-1, self.n_channels)
+        if len(x) == 0:
+            return x
+        if self._zi is None:
+            # (n_sections, 2, n_channels), scaled by each channel's first sample
+            self._zi = sosfilt_zi(self.sos)[:, :, None] * x[0]
+        y, self._zi = sosfilt(self.sos, x, axis=0, zi=self._zi)
+        return y
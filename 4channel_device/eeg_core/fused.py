@@ -0,0 +1,132 @@
+"""
+Fused NumPy predictor for the StandardScaler + RBF SVC model.
+
+Classifying one window through sklearn costs four validated calls
+(scaler.transform, svm.predict, svm.decision_function,
+label_encoder.inverse_transform) plus a DataFrame conversion, for a
+10-value feature vector. `export_model` flattens the fitted components into
+plain arrays (scaler mean/scale, support vectors, dual coefficients,
+intercept, gamma, class labels), and FusedSVC evaluates scaling, the RBF
+kernel and the margin in one vectorized expression for a row or a batch:
+
+    z      = (x - mean) / scale
+    margin = dual_coef . exp(-gamma * |z - sv|^2) + intercept
+    label  = labels[margin > 0]
+
+Labels and ratings are identical to sklearn's. Margins agree to ~1e-14 and
+mostly bit for bit, but not always: libsvm sums |z - sv|^2 with the BLAS dot
+kernel picked for the CPU (FMA or not) and calls libm exp, so even sklearn's
+last bits depend on the machine. Only binary RBF SVCs are supported;
+`fused_model` returns None for anything else, and callers fall back to
+sklearn.
+"""
+
+import numpy as np
+
+CHUNK_ROWS = 4096  # rows per kernel evaluation, bounds the (rows, n_sv, n_features) temporary
+EXPORT_KEYS = ("mean", "scale", "support_vectors", "dual_coef", "intercept", "gamma", "labels",
+               "feature_names")
+
+
+def export_model(scaler, svm_model, label_encoder, path=None):
+    """
+    Flatten the fitted components into a dict of NumPy arrays (saved as an
+    .npz file if `path` is given). Raises ValueError for models FusedSVC
+    cannot reproduce.
+    """
+    if getattr(svm_model, "kernel", None) != "rbf" or len(svm_model.classes_) != 2:
+        raise ValueError("only binary SVCs with an RBF kernel can be exported")
+    if getattr(svm_model, "break_ties", False):
+        raise ValueError("break_ties is not supported")
+    n_features = svm_model.support_vectors_.shape[1]
+    names = getattr(scaler, "feature_names_in_", None)
+    arrays = {
+        "mean": np.zeros(n_features) if scaler.mean_ is None else np.asarray(scaler.mean_, dtype=np.float64),
+        "scale": np.ones(n_features) if scaler.scale_ is None else np.asarray(scaler.scale_, dtype=np.float64),
+        "support_vectors": np.asarray(svm_model.support_vectors_, dtype=np.float64),
+        "dual_coef": np.asarray(svm_model.dual_coef_[0], dtype=np.float64),
+        "intercept": np.float64(svm_model.intercept_[0]),
+        "gamma": np.float64(svm_model._gamma),  # resolved value of gamma="scale"/"auto"
+        "labels": np.asarray(label_encoder.inverse_transform(svm_model.classes_)).astype(str),
+        "feature_names": np.asarray([] if names is None else names).astype(str),
+    }
+    if path is not None:
+        np.savez(path, **arrays)
+    return arrays
+
+
+class FusedSVC:
+    """Scaler + binary RBF SVC + label decoding from exported arrays."""
+
+    def __init__(self, arrays):
+        self.mean = np.asarray(arrays["mean"], dtype=np.float64)
+        self.scale = np.asarray(arrays["scale"], dtype=np.float64)
+        self.support_vectors = np.ascontiguousarray(arrays["support_vectors"], dtype=np.float64)
+        self.dual_coef = np.asarray(arrays["dual_coef"], dtype=np.float64)
+        self.intercept = float(arrays["intercept"])
+        self.gamma = float(arrays["gamma"])
+        self.labels = np.asarray(arrays["labels"])
+        names = list(np.asarray(arrays["feature_names"]))
+        self.feature_names = names or None
+
+    @classmethod
+    def from_components(cls, scaler, svm_model, label_encoder):
+        return cls(export_model(scaler, svm_model, label_encoder))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({key: data[key] for key in EXPORT_KEYS})
+
+    def _rows(self, X):
+        """(n, n_features) float64 rows from an array, a DataFrame or one feature dict."""
+        if isinstance(X, dict):
+            X = [[X[name] for name in self.feature_names]]
+        elif hasattr(X, "columns"):
+            if self.feature_names is not None and list(X.columns) != self.feature_names:
+                X = X[self.feature_names]  # column selection is slow; skip it when in order
+            X = X.to_numpy(dtype=np.float64)
+        return np.atleast_2d(np.asarray(X, dtype=np.float64))
+
+    def decision_function(self, X):
+        X = self._rows(X)
+        margins = np.empty(len(X))
+        for start in range(0, len(X), CHUNK_ROWS):
+            z = X[start:start + CHUNK_ROWS] - self.mean
+            z /= self.scale
+            # Squared distances from the differences, as libsvm computes them
+            # (|z|^2 + |sv|^2 - 2 z.sv would lose digits near a support vector)
+            diff = z[:, None, :] - self.support_vectors
+            d2 = np.einsum("ijk,ijk->ij", diff, diff)
+            # cumsum adds the support vector terms left to right like libsvm's loop
+            terms = np.exp(-self.gamma * d2) * self.dual_coef
+            margins[start:start + CHUNK_ROWS] = np.cumsum(terms, axis=1)[:, -1] + self.intercept
+        return margins
+
+    def predict(self, X):
+        """(labels, margins) for the rows of X."""
+        margins = self.decision_function(X)
+        return self.labels[(margins > 0).astype(np.intp)], margins
+
+
+FUSED_CACHE_SIZE = 8  # models kept; hot-swapped registry versions replace old ones
+
+_fused_cache = {}
+
+
+def fused_model(scaler, svm_model, label_encoder):
+    """
+    FusedSVC for these fitted components, built once per model object, or
+    None if the model cannot be exported.
+    """
+    key = (id(scaler), id(svm_model), id(label_encoder))
+    if key not in _fused_cache:
+        try:
+            fused = FusedSVC.from_components(scaler, svm_model, label_encoder)
+        except (ValueError, AttributeError):
+            fused = None
+        # The entry keeps the components alive, so their ids are not reused
+        _fused_cache[key] = ((scaler, svm_model, label_encoder), fused)
+        while len(_fused_cache) > FUSED_CACHE_SIZE:
+            del _fused_cache[next(iter(_fused_cache))]
+    return _fused_cache[key][1]
@@ -0,0 +1,331 @@
+"""
+Multi-device acquisition hub.
+
+One AcquisitionEngine + LivePredictor per headset means two threads and a
+model load per device, and every script opens a single SERIAL_PORT, so a
+group session ran one process per headset. AcquisitionHub serves many
+devices from one asyncio event loop instead:
+
+    device reader (one task each)  port -> BulkLineParser -> RingBuffer
+                                   + AcquisitionMetrics -> RollingFeatures
+    classifier (one task)          windows from all devices, batched into
+                                   one classify_batch call on the shared
+                                   model (in a worker thread, so reading
+                                   carries on meanwhile)
+
+Readers never block the loop: each reads only what `in_waiting` reports
+(at most `read_size` bytes), then sleeps `poll_interval` seconds so lines
+arrive in batches, as the engine's read timeout does (pySerial, ptys,
+ReplayPort and SyntheticPort alike). Per-device work is the same as on the
+threaded path and the per-window model cost is shared, so the cost grows
+linearly with the number of devices (see benchmarks/bench_hub.py).
+
+    python -m eeg_core.hub COM3 COM4 --duration 60
+    python -m eeg_core.hub --synthetic 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from .acquisition import READ_TIMEOUT, RingBuffer
+from .live import DEFAULT_HOP_SECONDS, DEFAULT_WINDOW_SECONDS, RollingFeatures
+from .metrics import AcquisitionMetrics
+from .parser import BulkLineParser
+from .pipeline import FS, MODEL_NOT_FOUND, classify_batch, load_model_components
+from .schema import DEFAULT_SCHEMA, ChannelSchema
+from .service import MAX_BATCH
+from .sources import SYNTHETIC, open_port
+
+READ_SIZE = 65536  # bytes per read at most, so one fast device can't hog the loop
+
+# One prediction for one device; like LivePrediction plus the device name
+HubPrediction = namedtuple("HubPrediction", "device time label rating latency samples features")
+
+
+# ---------------------------------------------------------------------
+# 1) Devices
+# ---------------------------------------------------------------------
+class HubDevice:
+    """
+    One headset on the hub: its port, parser, ring buffer, metrics and
+    rolling window features, plus its most recent predictions. The consumer
+    API (`latest`, `read_since`, `stats`, `total_samples`) matches
+    AcquisitionEngine's.
+    """
+
+    def __init__(self, name, port, fs=FS, capacity_seconds=120, window_seconds=DEFAULT_WINDOW_SECONDS,
+                 hop_seconds=DEFAULT_HOP_SECONDS, filter_bank=True, max_results=1000, schema=DEFAULT_SCHEMA):
+        self.name = name
+        self.port = port
+        self.fs = fs
+        self.schema = schema
+        self.parser = BulkLineParser(len(schema.columns))
+        self.buffer = RingBuffer(int(capacity_seconds * fs), len(schema.columns))
+        self.metrics = AcquisitionMetrics(fs)
+        self.features = RollingFeatures(fs, window_seconds, hop_seconds, filter_bank, schema=schema)
+        self.predictions = deque(maxlen=max_results)
+        self.error = None
+        self.done = False
+        self.dropped = 0  # windows skipped because the classifier fell behind
+        self._latencies = deque(maxlen=max_results)
+
+    def feed(self, chunk, now):
+        """Parse and store a chunk read at `now`; returns the completed windows."""
+        block = self.parser.feed(chunk)
+        if not len(block):
+            return []
+        self.metrics.on_block(now, block)
+        self.buffer.write(block)
+        return self.features.update(block[:, 1:])
+
+    def _record(self, prediction):
+        self.predictions.append(prediction)
+        self._latencies.append(prediction.latency)
+
+    @property
+    def total_samples(self):
+        return self.buffer.count
+
+    def latest(self, seconds):
+        """Zero-copy view of the last `seconds` of [Timestamp, FP1, FP2] (schema.columns) rows."""
+        return self.buffer.latest(seconds * self.fs)
+
+    def read_since(self, cursor):
+        return self.buffer.read_since(cursor)
+
+    def latency_stats(self):
+        """Median / 95th percentile / max arrival-to-label latency in milliseconds."""
+        if not self._latencies:
+            return {"count": 0, "p50_ms": np.nan, "p95_ms": np.nan, "max_ms": np.nan}
+        ms = np.array(self._latencies) * 1000
+        return {"count": len(ms), "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)), "max_ms": float(ms.max())}
+
+    def stats(self):
+        """Acquisition metrics snapshot as a flat dict, like AcquisitionEngine.stats()."""
+        return dict(self.metrics.snapshot(), parse_failures=self.parser.dropped,
+                    windows_dropped=self.dropped, error=None if self.error is None else str(self.error))
+
+
+# ---------------------------------------------------------------------
+# 2) Hub
+# ---------------------------------------------------------------------
+class AcquisitionHub:
+    """
+    Reads every added device concurrently on one event loop and classifies
+    their windows with one shared model from `model_dir`. All devices
+    stream the channels of `schema`, the ones the model was trained on.
+
+    `run()` is the coroutine; `serve()` runs it with asyncio.run. Both stop
+    after `duration` seconds, when every device has ended (replayed
+    recordings, synthetic sources with a duration) or failed, or on
+    `stop()`. A device whose port fails gets `error` set and is dropped;
+    the others carry on. A failed classification sets the hub's `error`
+    and loses that batch. `on_prediction(HubPrediction)` is called on the
+    event loop for every prediction.
+    """
+
+    def __init__(self, fs=FS, model_dir=".", window_seconds=DEFAULT_WINDOW_SECONDS,
+                 hop_seconds=DEFAULT_HOP_SECONDS, filter_bank=True, poll_interval=READ_TIMEOUT,
+                 read_size=READ_SIZE, max_batch=MAX_BATCH, max_pending=1024, on_prediction=None,
+                 schema=DEFAULT_SCHEMA):
+        self.fs = fs
+        self.schema = schema
+        self.model_dir = model_dir
+        self.window_seconds = window_seconds
+        self.hop_seconds = hop_seconds
+        self.filter_bank = filter_bank
+        self.poll_interval = poll_interval
+        self.read_size = read_size
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.on_prediction = on_prediction
+        self.devices = {}
+        self.error = None  # last classification failure
+        self.batches = 0
+        self.windows = 0
+        self._loop = None
+        self._stopped = None
+
+    def add_port(self, name, port):
+        """Add a device reading an already open pySerial-like `port`."""
+        if name in self.devices:
+            raise ValueError(f"device {name!r} already added")
+        device = HubDevice(name, port, self.fs, window_seconds=self.window_seconds,
+                           hop_seconds=self.hop_seconds, filter_bank=self.filter_bank, schema=self.schema)
+        self.devices[name] = device
+        return device
+
+    def add_device(self, source, name=None, speed=1.0, baud_rate=500000, **kwargs):
+        """
+        Add a device on `source`: a serial port name, a recorded CSV replayed
+        at `speed`, or "synthetic" (see eeg_core.sources.open_port).
+        """
+        port = open_port(source, self.fs, speed, baud_rate, schema=self.schema, **kwargs)
+        return self.add_port(name or source, port)
+
+    def stop(self):
+        """Stop `run()`; safe to call from any thread."""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    def close(self):
+        for device in self.devices.values():
+            device.port.close()
+
+    def serve(self, duration=None):
+        return asyncio.run(self.run(duration))
+
+    async def run(self, duration=None):
+        """Acquire and classify until stopped; returns stats()."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        components = await self._loop.run_in_executor(None, self._load_model)
+        pending = asyncio.Queue(maxsize=self.max_pending)
+        readers = [asyncio.create_task(self._read(device, pending), name=f"eeg-hub-{name}")
+                   for name, device in self.devices.items()]
+        classifier = asyncio.create_task(self._classify(pending, components), name="eeg-hub-classifier")
+        waiters = [asyncio.create_task(self._stopped.wait()), asyncio.create_task(asyncio.wait(readers))]
+        try:
+            await asyncio.wait(waiters, timeout=duration, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in readers + waiters:
+                task.cancel()
+            await asyncio.gather(*readers, *waiters, return_exceptions=True)
+            await pending.join()  # classify the windows already cut
+            classifier.cancel()
+            await asyncio.gather(classifier, return_exceptions=True)
+        return self.stats()
+
+    def _load_model(self):
+        import pandas as pd
+
+        from .pipeline import classify_stress
+
+        names = self.schema.feature_names
+        scaler, svm_model, label_encoder = load_model_components(self.model_dir, schema=self.schema)
+        if svm_model is None:
+            raise FileNotFoundError(MODEL_NOT_FOUND)
+        # Warm-up calls, so first-call costs are not charged to the first windows
+        classify_stress(pd.DataFrame([dict.fromkeys(names, 0.0)]), scaler, svm_model, label_encoder)
+        classify_batch(np.zeros((1, len(names))), scaler, svm_model, label_encoder)
+        return scaler, svm_model, label_encoder
+
+    # -------------------- device readers --------------------
+    async def _read(self, device, pending):
+        port, metrics = device.port, device.metrics
+        try:
+            while True:
+                backlog = port.in_waiting
+                now = time.perf_counter()
+                chunk = port.read(min(backlog, self.read_size)) if backlog else b""
+                metrics.on_read(now, backlog, len(chunk))
+                for samples, features in device.feed(chunk, now) if chunk else ():
+                    try:
+                        pending.put_nowait((device, now, samples, features))
+                    except asyncio.QueueFull:
+                        device.dropped += 1
+                if len(chunk) == self.read_size:  # more waiting: read on after the other devices
+                    await asyncio.sleep(0)
+                elif not chunk and getattr(port, "exhausted", False):  # end of a replayed recording
+                    break
+                else:
+                    # Let lines pile up between reads, like the engine's read timeout
+                    await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # surfaced to the consumer through the device's `error`
+            device.error = e
+        finally:
+            device.done = True
+
+    # -------------------- classifier --------------------
+    async def _classify(self, pending, components):
+        while True:
+            batch = [await pending.get()]
+            while len(batch) < self.max_batch and not pending.empty():
+                batch.append(pending.get_nowait())
+            try:
+                names = self.schema.feature_names
+                X = np.array([[features[name] for name in names] for *_, features in batch])
+                labels, ratings, _ = await self._loop.run_in_executor(None, classify_batch, X, *components)
+                now, stamp = time.perf_counter(), datetime.now()
+                self.batches += 1
+                self.windows += len(batch)
+                for (device, arrival, samples, features), label, rating in zip(batch, labels, ratings):
+                    prediction = HubPrediction(device.name, stamp, label, rating, now - arrival,
+                                               samples, features)
+                    device._record(prediction)
+                    if self.on_prediction is not None:
+                        self.on_prediction(prediction)
+            except Exception as e:  # keep serving; surfaced through `error`
+                self.error = e
+            finally:
+                for _ in batch:
+                    pending.task_done()
+
+    # -------------------- consumer API --------------------
+    def latest_predictions(self):
+        """{device name: its most recent HubPrediction or None}."""
+        return {name: device.predictions[-1] if device.predictions else None
+                for name, device in self.devices.items()}
+
+    def stats(self):
+        """Hub totals plus each device's stats() and latency_stats()."""
+        return {"devices": len(self.devices), "windows": self.windows, "batches": self.batches,
+                "rows_per_batch": self.windows / self.batches if self.batches else np.nan,
+                "per_device": {name: dict(device.stats(), **device.latency_stats())
+                               for name, device in self.devices.items()}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Acquire and classify several EEG devices in one process.")
+    parser.add_argument("sources", nargs="*", help="serial ports or recorded CSV files")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N", help="add N synthetic devices")
+    parser.add_argument("--fs", type=int, default=FS)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay / synthetic speed")
+    parser.add_argument("--baud-rate", type=int, default=500000)
+    parser.add_argument("--duration", type=float, default=None, help="seconds (default: until Ctrl+C)")
+    parser.add_argument("--model-dir", default=".")
+    parser.add_argument("--channels", default=",".join(DEFAULT_SCHEMA.channels),
+                        help="comma-separated channel names after the timestamp (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    hub = AcquisitionHub(fs=args.fs, model_dir=args.model_dir, schema=ChannelSchema(args.channels.split(",")))
+    for source in args.sources:
+        hub.add_device(source, speed=args.speed, baud_rate=args.baud_rate)
+    for i in range(args.synthetic):
+        hub.add_device(SYNTHETIC, name=f"synthetic-{i}", speed=args.speed, seed=i)
+    if not hub.devices:
+        parser.error("no devices: give serial ports / recordings or --synthetic N")
+
+    async def report():
+        task = asyncio.create_task(hub.run(args.duration))
+        while not task.done():
+            await asyncio.wait([task], timeout=1.0)
+            latest = hub.latest_predictions()
+            print(" | ".join(f"{name}: {p.label} {p.rating}/10" if p else f"{name}: -"
+                             for name, p in latest.items()))
+        return task.result()
+
+    try:
+        stats = asyncio.run(report())
+    except KeyboardInterrupt:
+        stats = hub.stats()
+    finally:
+        hub.close()
+    print(f"\n{stats['windows']} windows in {stats['batches']} batches "
+          f"({stats['rows_per_batch']:.1f} per model call)")
+    for name, device in stats["per_device"].items():
+        print(f"{name}: {device['samples_received']} samples, {device['samples_missing']} missing, "
+              f"{device['count']} predictions, latency p50 {device['p50_ms']:.1f} ms "
+              f"p95 {device['p95_ms']:.1f} ms" + (f", error: {device['error']}" if device["error"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Approximate RBF kernel classifier trained by streaming minibatches.
+
+class.py treats every raw (FP1, FP2) sample as a training row, oversamples
+the minority class with SMOTE and fits an exact RBF SVC, which needs
+O(n^2) kernel time and memory: infeasible past a few hundred thousand
+samples, while one session at 256 Hz is already 46k. Here instead:
+
+    scaler       StandardScaler fitted chunk by chunk (partial_fit)
+    feature map  Nystroem (kernel rows against `n_components` landmarks
+                 drawn class-balanced from the data) or RBFSampler (random
+                 Fourier features); both approximate exp(-gamma |x - x'|^2)
+    classifier   linear SGDClassifier (hinge loss, i.e. a linear SVM in the
+                 mapped space, averaged weights), partial_fit on minibatches
+
+Every minibatch draws the same number of rows from each class (with
+replacement), which balances the classes the way SMOTE did without
+materializing synthetic rows. Memory is O(batch_size * n_components) and
+time is linear in the number of minibatches, whatever the row count.
+
+`fit_kernel_sgd` returns (scaler, model), where model is a Pipeline of the
+feature map and the SGD classifier with `predict` and `decision_function`,
+so it is registered and used in place of the SVC.
+"""
+
+import numpy as np
+
+KERNEL_MAPS = ("nystroem", "rbf_sampler")
+N_COMPONENTS = 256
+BATCH_SIZE = 1024
+EPOCHS = 3            # passes' worth of minibatches over the data
+MAX_BATCHES = 20_000  # caps the number of minibatches for very long recordings
+CHUNK_ROWS = 100_000  # rows per scaler.partial_fit
+
+
+def balanced_batches(y, batch_size, n_batches, rng):
+    """
+    Row indices of `n_batches` minibatches, each with batch_size // n_classes
+    rows of every class drawn with replacement, sorted (for memmap reads).
+    """
+    by_class = [np.flatnonzero(y == label) for label in np.unique(y)]
+    per_class = max(batch_size // len(by_class), 1)
+    for _ in range(n_batches):
+        idx = np.concatenate([rows[rng.integers(0, len(rows), per_class)] for rows in by_class])
+        idx.sort()
+        yield idx
+
+
+def fit_kernel_sgd(X, y, kernel="nystroem", n_components=N_COMPONENTS, gamma="scale", alpha=1e-4,
+                   batch_size=BATCH_SIZE, epochs=EPOCHS, max_batches=MAX_BATCHES, chunk_rows=CHUNK_ROWS,
+                   random_state=42):
+    """
+    Fit the scaler, kernel map and SGD classifier on (X, y) and return
+    (scaler, model).
+
+    Parameters:
+        X (array): (rows, n_features), may be a np.memmap; it is only read
+            in chunks and minibatches.
+        y (array): label per row.
+        kernel (str): "nystroem" or "rbf_sampler".
+        gamma (float or "scale"): RBF width on the standardized features;
+            "scale" is 1 / n_features, what SVC(gamma="scale") uses after a
+            StandardScaler.
+        alpha (float): SGD regularization (larger is smoother, like a smaller C).
+    """
+    from sklearn.kernel_approximation import Nystroem, RBFSampler
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    if kernel not in KERNEL_MAPS:
+        raise ValueError(f"kernel must be one of {KERNEL_MAPS}, not {kernel!r}")
+    y = np.asarray(y)
+    rng = np.random.default_rng(random_state)
+
+    scaler = StandardScaler()
+    for start in range(0, len(X), chunk_rows):
+        scaler.partial_fit(np.asarray(X[start:start + chunk_rows], dtype=np.float64))
+
+    n_features = X.shape[1]
+    gamma = 1.0 / n_features if gamma == "scale" else gamma
+    if kernel == "nystroem":
+        feature_map = Nystroem(gamma=gamma, n_components=n_components, random_state=random_state)
+    else:
+        feature_map = RBFSampler(gamma=gamma, n_components=n_components, random_state=random_state)
+    # Nystroem landmarks: a class-balanced sample of the data
+    landmarks = next(balanced_batches(y, max(n_components, 2 * len(np.unique(y))), 1, rng))
+    feature_map.fit(scaler.transform(np.asarray(X[landmarks], dtype=np.float64)))
+
+    classes = np.unique(y)
+    sgd = SGDClassifier(loss="hinge", alpha=alpha, average=True, random_state=random_state)
+    n_batches = int(min(max(epochs * len(y) // batch_size, 1), max_batches))
+    for idx in balanced_batches(y, batch_size, n_batches, rng):
+        mapped = feature_map.transform(scaler.transform(np.asarray(X[idx], dtype=np.float64)))
+        sgd.partial_fit(mapped, y[idx], classes=classes)
+
+    return scaler, Pipeline([("feature_map", feature_map), ("sgd", sgd)])
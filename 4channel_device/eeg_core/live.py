@@ -0,0 +1,318 @@
+"""
+Continuous real-time prediction over a rolling window.
+
+Instead of blocking for a fixed collection and predicting once, LivePredictor
+listens to an AcquisitionEngine and emits a prediction every `hop_seconds`
+over the last `window_seconds` of signal (e.g. a 4 s window every 0.5 s).
+
+Each new block is passed once through the causal bandpass + notch filter
+bank (the training preprocessing, see eeg_core.filters), and the features
+are kept up to date on the acquisition thread by RunningMoments and
+StreamingWelch, cut exactly at hop boundaries, so producing a feature
+vector costs nothing extra per hop. The scaler/SVM run on a separate
+prediction thread, and results reach the UI through a queue that it drains
+at its own refresh rate with `poll()`.
+
+Latency is measured per prediction from the host receiving the block that
+completed the window to the label being available.
+"""
+
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from .acquisition import DEFAULT_UI_REFRESH_HZ, AcquisitionEngine
+from .filters import StreamingFilter
+from .metrics import json_ready, metrics_panel
+from .moments import RunningMoments
+from .pipeline import FS, MODEL_NOT_FOUND, classify_stress, load_model_components
+from .schema import DEFAULT_SCHEMA
+from .sources import open_port
+from .spectral import StreamingWelch
+
+DEFAULT_WINDOW_SECONDS = 4.0
+DEFAULT_HOP_SECONDS = 0.5
+
+# One emitted prediction. `latency` is in seconds, `samples` is the total
+# sample count at the end of the window and `features` the feature dict
+# (FEATURE_NAMES, or the schema's feature names).
+LivePrediction = namedtuple("LivePrediction", "time label rating latency samples features")
+
+
+class RollingFeatures:
+    """
+    Features of the channels in `schema` (FEATURE_NAMES for FP1/FP2) over
+    the last `window_seconds` of a (samples, channels) block stream, every
+    `hop_seconds`. Every stage works on all channels at once.
+
+    When the hop is a multiple of half a second of samples (the Welch hop
+    for the default one-second segments) the window features equal
+    `extract_features` over the last `window_seconds` of the (causally
+    filtered) signal exactly; otherwise the alpha power trails the window
+    end by less than one Welch hop. `filter_bank=False` skips the filters.
+
+    `denoiser` is an optional eeg_core.wavelet.StreamingWaveletDenoiser run
+    after the filters, for models trained with one. It holds samples back by
+    up to `denoiser.delay`, which adds that much to every window's latency.
+    """
+
+    def __init__(self, fs=FS, window_seconds=DEFAULT_WINDOW_SECONDS, hop_seconds=DEFAULT_HOP_SECONDS,
+                 filter_bank=True, denoiser=None, schema=DEFAULT_SCHEMA):
+        self.schema = schema
+        self.window = int(round(window_seconds * fs))
+        self.hop = max(1, int(round(hop_seconds * fs)))
+        nperseg = min(self.window, int(fs))
+        if self.window < 2:
+            raise ValueError("window_seconds is too short for the sampling rate")
+        welch_hop = nperseg - nperseg // 2
+        n_channels = schema.n_channels
+        self.filter = StreamingFilter(fs, n_channels=n_channels) if filter_bank else None
+        self.denoiser = denoiser
+        self.moments = RunningMoments(n_channels, window=self.window)
+        self.welch = StreamingWelch(fs, nperseg=nperseg, n_channels=n_channels,
+                                    n_segments=(self.window - nperseg) // welch_hop + 1)
+        self.seen = 0
+
+    def reset(self):
+        self.moments.reset()
+        self.welch.reset()
+        if self.filter is not None:
+            self.filter.reset()
+        if self.denoiser is not None:
+            self.denoiser.reset()
+        self.seen = 0
+
+    def update(self, signals):
+        """
+        Feed an (n, channels) block; returns [(samples, features), ...] for
+        the windows it completed, `samples` being the total count at the end
+        of the window.
+        """
+        if self.filter is not None:
+            signals = self.filter.process(signals)
+        if self.denoiser is not None:
+            signals = self.denoiser.process(signals)
+        windows = []
+        while len(signals):
+            # Cut the block at the next hop boundary so the window ends exactly there
+            n = min(len(signals), self.hop - self.seen % self.hop)
+            part, signals = signals[:n], signals[n:]
+            self.moments.update(part)
+            self.welch.update(part)
+            self.seen += n
+            if self.seen % self.hop == 0 and self.seen >= self.window:
+                windows.append((self.seen, self.features()))
+        return windows
+
+    def features(self):
+        alpha = self.welch.alpha_power()
+        features = self.moments.features(self.schema.channels)
+        features.update({f"{ch}_alpha_power": float(alpha[i]) for i, ch in enumerate(self.schema.channels)})
+        return features
+
+
+class LivePredictor:
+    """
+    Rolling-window predictions from a running AcquisitionEngine: the
+    RollingFeatures of its blocks (see there for `window_seconds`,
+    `hop_seconds`, `filter_bank` and `denoiser`), classified on a separate
+    thread. The channels are the engine's schema, and the model in
+    `model_dir` must have been trained on their features.
+    """
+
+    def __init__(self, engine, window_seconds=DEFAULT_WINDOW_SECONDS,
+                 hop_seconds=DEFAULT_HOP_SECONDS, model_dir=".", max_results=1000,
+                 filter_bank=True, denoiser=None):
+        self.engine = engine
+        self.schema = engine.schema
+        self.features = RollingFeatures(engine.fs, window_seconds, hop_seconds, filter_bank, denoiser,
+                                        schema=self.schema)
+        self.window = self.features.window
+        self.hop = self.features.hop
+        self.model_dir = model_dir
+        self.error = None
+        self.dropped = 0  # windows skipped because the prediction thread fell behind
+        self._pending = queue.Queue(maxsize=8)
+        self._results = queue.Queue(maxsize=max_results)
+        self._latencies = deque(maxlen=max_results)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_source(cls, source, baud_rate=500000, fs=FS, speed=1.0, schema=DEFAULT_SCHEMA, **kwargs):
+        """
+        Predictor over a serial port name, a recorded CSV replayed at `speed`
+        times real time, or "synthetic" data (see eeg_core.sources), with
+        the channels of `schema`.
+        """
+        port = open_port(source, fs, speed, baud_rate, schema=schema)
+        return cls(AcquisitionEngine(port, fs=fs, schema=schema), **kwargs)
+
+    # -------------------- lifecycle --------------------
+    def start(self):
+        if self.running:
+            return self
+        import pandas as pd
+
+        self.scaler, self.svm_model, self.label_encoder = load_model_components(self.model_dir,
+                                                                                schema=self.schema)
+        if self.svm_model is None:
+            raise FileNotFoundError(MODEL_NOT_FOUND)
+        # Warm-up call, so imports and first-call costs are not charged to the first window
+        classify_stress(pd.DataFrame([dict.fromkeys(self.schema.feature_names, 0.0)]),
+                        self.scaler, self.svm_model, self.label_encoder)
+        self.features.reset()
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="eeg-live-prediction", daemon=True)
+        self._thread.start()
+        self.engine.add_listener(self._on_block)
+        self.engine.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self.engine.remove_listener(self._on_block)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.engine.close()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and self.engine.running
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------- acquisition thread --------------------
+    def _on_block(self, block):
+        arrival = time.perf_counter()
+        for samples, features in self.features.update(block[:, 1:]):
+            try:
+                self._pending.put_nowait((arrival, samples, features))
+            except queue.Full:
+                self.dropped += 1
+
+    # -------------------- prediction thread --------------------
+    def _run(self):
+        import pandas as pd
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    arrival, samples, features = self._pending.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                feature_df = pd.DataFrame([features], columns=self.schema.feature_names)
+                label, rating = classify_stress(feature_df, self.scaler, self.svm_model,
+                                                self.label_encoder)
+                latency = time.perf_counter() - arrival
+                self._latencies.append(latency)
+                result = LivePrediction(datetime.now(), label, rating, latency, samples, features)
+                if self._results.full():  # nobody is polling; keep the newest
+                    self._results.get_nowait()
+                self._results.put_nowait(result)
+        except Exception as e:  # surfaced to the consumer through `error`
+            self.error = e
+
+    # -------------------- consumer API --------------------
+    def poll(self):
+        """All predictions emitted since the last call, oldest first."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def latency_stats(self):
+        """Median / 95th percentile / max arrival-to-label latency in milliseconds."""
+        if not self._latencies:
+            return {"count": 0, "p50_ms": np.nan, "p95_ms": np.nan, "max_ms": np.nan}
+        ms = np.array(self._latencies) * 1000
+        return {"count": len(ms), "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)), "max_ms": float(ms.max())}
+
+
+# ---------------------------------------------------------------------
+# Streamlit panel shared by the app pages
+# ---------------------------------------------------------------------
+def live_prediction_panel(source, baud_rate=500000, fs=FS,
+                          window_seconds=DEFAULT_WINDOW_SECONDS, hop_seconds=DEFAULT_HOP_SECONDS):
+    """
+    Start/Stop controls plus a live label, stress-rating chart and latency
+    readout, with the acquisition health metrics (eeg_core.metrics) in an
+    expander. `source` is a serial port, a recorded CSV path to replay, or
+    "synthetic". The predictor lives in st.session_state across reruns; the page redraws
+    DEFAULT_UI_REFRESH_HZ times per second until Stop is pressed.
+    """
+    import pandas as pd
+    import streamlit as st
+
+    state = st.session_state
+    start_col, stop_col = st.columns(2)
+    if start_col.button("Start Live Monitoring") and state.get("live_predictor") is None:
+        try:
+            predictor = LivePredictor.from_source(source, baud_rate, fs=fs,
+                                                  window_seconds=window_seconds,
+                                                  hop_seconds=hop_seconds)
+            state.live_predictor = predictor.start()
+            state.live_history = []
+        except Exception as e:
+            st.error(f"Could not start live monitoring on {source}: {e}")
+    if stop_col.button("Stop") and state.get("live_predictor") is not None:
+        state.live_predictor.close()
+        state.live_predictor = None
+
+    predictor = state.get("live_predictor")
+    history = state.get("live_history", [])
+    label_box, chart_box, latency_box = st.empty(), st.empty(), st.empty()
+    metrics_box = st.expander("Acquisition health").empty()
+
+    def render():
+        if predictor is not None:
+            metrics_panel(predictor.engine.stats(), metrics_box)
+        if not history:
+            label_box.info(f"Waiting for the first {window_seconds:g} s window...")
+            return
+        last = history[-1]
+        label_box.success(f"**Current State:** {last.label} (Stress Rating: {last.rating}/10)")
+        chart_box.line_chart(pd.DataFrame({"Stress Rating": [p.rating for p in history[-240:]]}))
+        stats = predictor.latency_stats() if predictor is not None else None
+        if stats and stats["count"]:
+            latency_box.caption(f"Latency sample -> label: p50 {stats['p50_ms']:.1f} ms, "
+                                f"p95 {stats['p95_ms']:.1f} ms, max {stats['max_ms']:.1f} ms "
+                                f"({stats['count']} predictions)")
+
+    if predictor is None:
+        if history:
+            render()
+        return
+    while predictor.running:
+        history.extend(predictor.poll())
+        render()
+        time.sleep(1.0 / DEFAULT_UI_REFRESH_HZ)
+    history.extend(predictor.poll())
+    render()
+    with metrics_box.container():
+        stats = predictor.engine.stats()
+        metrics_panel(stats)
+        st.json(json_ready(stats), expanded=False)
+    error = predictor.error or predictor.engine.error
+    if error is not None:
+        st.error(f"Live monitoring stopped: {error}")
+    else:
+        st.info("Live source ended.")
+    predictor.close()
+    state.live_predictor = None
@@ -0,0 +1,286 @@
+"""
+Acquisition health metrics.
+
+The Arduino stamps every sample with its own Time(ms) clock, so the host can
+check that the stream advances at the expected 1000/fs ms spacing and that
+it keeps up. AcquisitionMetrics is updated by the AcquisitionEngine thread
+on every read and parsed block and tracks:
+
+    rate        effective samples/s, overall and over the last few seconds
+    gaps        missing samples from device timestamp steps, gap sizes,
+                device clock resets
+    jitter      spread of device sample spacing and of host block arrivals
+    backlog     serial `in_waiting` before each read
+    drift       device clock rate vs host clock (ppm), from a running
+                least-squares fit of device time against arrival time
+
+`snapshot()` is a flat dict of plain numbers (JSON-ready, see `dump`);
+`metrics_panel` renders it in Streamlit.
+"""
+
+import json
+import math
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+RATE_WINDOW = 5.0  # s of recent blocks for the current sample rate
+# Gap sizes in missing samples: 1, 2-9, 10-99, 100+
+GAP_BUCKETS = (1, 2, 10, 100)
+# Time(ms) comes from the Arduino's integer millis(), so a step between two
+# consecutive samples is only known to within this
+TIMESTAMP_RESOLUTION_MS = 1.0
+
+
+class TimestampStats:
+    """
+    Received vs expected samples from the device's Time(ms) column.
+
+    `expected` counts one sample per 1000/fs ms between the first and last
+    timestamp. A step longer than 1.5 sample periods plus the 1 ms
+    timestamp resolution is a gap of round(step / period) - 1 missing
+    samples; shorter steps are millis() jitter (3 ms steps at 512 Hz are
+    routine). A single lost sample can hide in that jitter, so `gaps`
+    undercounts on a coarse clock while `missing` stays exact. A step
+    backwards (Arduino reset) starts a new run instead of counting as a gap.
+    """
+
+    def __init__(self, fs):
+        self.fs = fs
+        self.period = 1000.0 / fs
+        self.gap_step = 1.5 * self.period + TIMESTAMP_RESOLUTION_MS
+        self.reset()
+
+    def reset(self):
+        self.received = 0
+        self.gaps = 0
+        self.gap_samples = 0
+        self.largest_gap = 0
+        self.gap_sizes = np.zeros(len(GAP_BUCKETS), dtype=np.int64)
+        self.resets = 0
+        self.first = None
+        self.last = None
+        self._expected_before = 0  # expected samples of runs before the last reset
+        # Running sums of regular (non-gap) timestamp steps, for jitter
+        self._steps = np.zeros(3)  # n, sum, sum of squares
+
+    def update(self, times):
+        if len(times) == 0:
+            return
+        times = np.asarray(times, dtype=np.float64)
+        steps = np.diff(times) if self.first is None else np.diff(times, prepend=self.last)
+        if self.first is None:
+            self.first = float(times[0])
+        backwards = np.flatnonzero(steps < 0)
+        if len(backwards):
+            # Close the current run at the sample before the last reset
+            k = backwards[-1] + (0 if len(steps) == len(times) else 1)
+            before = times[k - 1] if k > 0 else self.last
+            self._expected_before += self._run_expected(self.first, before)
+            self.first = float(times[k])
+            self.resets += len(backwards)
+            steps = steps[steps >= 0]
+        gap = steps > self.gap_step
+        if gap.any():
+            missing = np.rint(steps[gap] / self.period).astype(np.int64) - 1
+            self.gaps += len(missing)
+            self.gap_samples += int(missing.sum())
+            self.largest_gap = max(self.largest_gap, int(missing.max()))
+            self.gap_sizes += np.bincount(np.searchsorted(GAP_BUCKETS, missing, side="right") - 1,
+                                          minlength=len(GAP_BUCKETS))
+        regular = steps[~gap]
+        self._steps += (len(regular), regular.sum(), (regular * regular).sum())
+        self.received += len(times)
+        self.last = float(times[-1])
+
+    def _run_expected(self, first, last):
+        return int(round((last - first) / self.period)) + 1
+
+    @property
+    def expected(self):
+        if self.first is None:
+            return 0
+        return self._expected_before + self._run_expected(self.first, self.last)
+
+    @property
+    def missing(self):
+        return max(0, self.expected - self.received)
+
+    @property
+    def step_jitter_ms(self):
+        """Standard deviation of the regular device sample spacing (ms)."""
+        n, s, ss = self._steps
+        if n < 2:
+            return math.nan
+        return math.sqrt(max(ss / n - (s / n) ** 2, 0.0))
+
+    def summary(self):
+        return {"received": self.received, "expected": self.expected,
+                "missing": self.missing, "gaps": self.gaps}
+
+
+class AcquisitionMetrics:
+    """
+    Metrics of one acquisition stream, updated from the acquisition thread.
+
+    Readers on other threads get a snapshot that may mix values from two
+    consecutive blocks, which is fine for monitoring.
+    """
+
+    def __init__(self, fs):
+        self.fs = fs
+        self.timestamps = TimestampStats(fs)
+        self.reset()
+
+    def reset(self):
+        self.timestamps.reset()
+        self.reads = 0
+        self.empty_reads = 0
+        self.bytes = 0
+        self.blocks = 0
+        self.backlog = 0
+        self.max_backlog = 0
+        self._backlog_sum = 0
+        self._start = None
+        self._last_arrival = None
+        self._arrivals = np.zeros(3)  # n, sum, sum of squares of inter-block intervals
+        self._max_interval = 0.0
+        self._recent = deque()  # (host time, samples) of the last RATE_WINDOW seconds
+        self._recent_samples = 0
+        self._fit = np.zeros(5)  # n, sum x, sum y, sum xy, sum xx (host ms vs device ms)
+        self._fit_origin = None
+        self._resets_seen = 0
+
+    # -------------------- updates (acquisition thread) --------------------
+    def on_read(self, now, backlog, n_bytes):
+        """Record one serial read: bytes waiting before it and bytes returned."""
+        self.reads += 1
+        self.empty_reads += n_bytes == 0
+        self.bytes += n_bytes
+        self.backlog = backlog
+        self.max_backlog = max(self.max_backlog, backlog)
+        self._backlog_sum += backlog
+
+    def on_block(self, now, block):
+        """Record a parsed (n, 3) [Timestamp, ...] block that arrived at host time `now` (s)."""
+        n = len(block)
+        if n == 0:
+            return
+        self.blocks += 1
+        if self._start is None:
+            self._start = now
+        if self._last_arrival is not None:
+            interval = now - self._last_arrival
+            self._arrivals += (1, interval, interval * interval)
+            self._max_interval = max(self._max_interval, interval)
+        self._last_arrival = now
+
+        self._recent.append((now, n))
+        self._recent_samples += n
+        while self._recent and now - self._recent[0][0] > RATE_WINDOW:
+            self._recent_samples -= self._recent.popleft()[1]
+
+        stamps = self.timestamps
+        stamps.update(block[:, 0])
+        # Device clock vs host clock: fit device ms = a + slope * host ms over
+        # the last sample of each block; restart after a device reset
+        if stamps.resets != self._resets_seen or self._fit_origin is None:
+            self._resets_seen = stamps.resets
+            self._fit[:] = 0
+            self._fit_origin = (now, stamps.last)
+        x = (now - self._fit_origin[0]) * 1000.0
+        y = stamps.last - self._fit_origin[1]
+        self._fit += (1, x, y, x * y, x * x)
+
+    # -------------------- results --------------------
+    @property
+    def drift_ppm(self):
+        """How much faster (+) or slower (-) the device clock runs than the host's."""
+        n, sx, sy, sxy, sxx = self._fit
+        denominator = n * sxx - sx * sx
+        if n < 3 or denominator <= 0 or sxx < 1e6:  # need ~1 s of data
+            return math.nan
+        slope = (n * sxy - sx * sy) / denominator
+        return (slope - 1.0) * 1e6
+
+    def snapshot(self):
+        """Flat dict of the current metrics (plain numbers, JSON-ready)."""
+        stamps = self.timestamps
+        elapsed = (self._last_arrival - self._start) if self._start is not None else 0.0
+        recent_span = (self._recent[-1][0] - self._recent[0][0]) if len(self._recent) > 1 else 0.0
+        n_int, s_int, ss_int = self._arrivals
+        mean_interval = s_int / n_int if n_int else math.nan
+        jitter = math.sqrt(max(ss_int / n_int - mean_interval ** 2, 0.0)) if n_int > 1 else math.nan
+        snapshot = {
+            "time": time.time(),
+            "fs_nominal": self.fs,
+            "samples_received": stamps.received,
+            "samples_expected": stamps.expected,
+            "samples_missing": stamps.missing,
+            "effective_rate_hz": stamps.received / elapsed if elapsed > 0 else math.nan,
+            "recent_rate_hz": (self._recent_samples - self._recent[0][1]) / recent_span
+                              if recent_span > 0 else math.nan,
+            "gaps": stamps.gaps,
+            "gap_samples": stamps.gap_samples,
+            "largest_gap_samples": stamps.largest_gap,
+            "device_resets": stamps.resets,
+            "sample_step_jitter_ms": stamps.step_jitter_ms,
+            "block_interval_mean_ms": mean_interval * 1000,
+            "block_interval_jitter_ms": jitter * 1000,
+            "block_interval_max_ms": self._max_interval * 1000,
+            "serial_backlog_bytes": self.backlog,
+            "serial_backlog_max_bytes": self.max_backlog,
+            "serial_backlog_mean_bytes": self._backlog_sum / self.reads if self.reads else 0.0,
+            "reads": self.reads,
+            "empty_reads": self.empty_reads,
+            "bytes_received": self.bytes,
+            "clock_drift_ppm": self.drift_ppm,
+        }
+        for lo, count in zip(GAP_BUCKETS, stamps.gap_sizes):
+            snapshot[f"gaps_{lo}plus_samples"] = int(count)
+        return snapshot
+
+
+def json_ready(snapshot):
+    """Copy of a snapshot with NaN (not measured yet) replaced by None."""
+    return {k: (None if isinstance(v, float) and math.isnan(v) else v) for k, v in snapshot.items()}
+
+
+def dump(snapshot, path):
+    """Write a metrics snapshot as JSON, replacing `path` atomically."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(json_ready(snapshot), f, indent=2)
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------
+# Streamlit panel
+# ---------------------------------------------------------------------
+def metrics_panel(snapshot, container=None):
+    """Render a metrics snapshot as Streamlit metric tiles in `container`."""
+    import streamlit as st
+
+    def fmt(value, spec):
+        return "-" if value is None or (isinstance(value, float) and math.isnan(value)) else format(value, spec)
+
+    box = (container or st).container()
+    s = snapshot
+    row1 = box.columns(4)
+    row1[0].metric("Sample rate", f"{fmt(s['recent_rate_hz'], '.1f')} Hz",
+                   help=f"Overall {fmt(s['effective_rate_hz'], '.1f')} Hz, nominal {s['fs_nominal']} Hz")
+    row1[1].metric("Missing samples", f"{s['samples_missing']}",
+                   help=f"{s['samples_received']} received of {s['samples_expected']} expected")
+    row1[2].metric("Gaps", f"{s['gaps']}", help=f"Largest {s['largest_gap_samples']} samples, "
+                                                 f"{s['device_resets']} device resets")
+    row1[3].metric("Parse failures", f"{s.get('parse_failures', 0)}")
+    row2 = box.columns(4)
+    row2[0].metric("Sample jitter", f"{fmt(s['sample_step_jitter_ms'], '.2f')} ms")
+    row2[1].metric("Block interval", f"{fmt(s['block_interval_mean_ms'], '.1f')} ms",
+                   help=f"Jitter {fmt(s['block_interval_jitter_ms'], '.1f')} ms, "
+                        f"max {fmt(s['block_interval_max_ms'], '.1f')} ms")
+    row2[2].metric("Serial backlog", f"{s['serial_backlog_bytes']} B",
+                   help=f"Max {s['serial_backlog_max_bytes']} B")
+    row2[3].metric("Clock drift", f"{fmt(s['clock_drift_ppm'], '+.0f')} ppm")
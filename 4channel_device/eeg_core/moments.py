@@ -0,0 +1,152 @@
+"""
+Incremental mean / std / skew / kurtosis per channel.
+
+The live apps used to recompute these over the whole collected DataFrame;
+RunningMoments keeps the first four central moments up to date as blocks of
+samples arrive, using Pebay's pairwise update formulas, so the statistical
+features are available at any instant:
+
+    mean      = DataFrame.mean()
+    std       = DataFrame.std()            (ddof=1)
+    skew      = scipy.stats.skew(x)        (biased)
+    kurtosis  = scipy.stats.kurtosis(x)    (Fisher, biased)
+
+which are the definitions the trained scaler/SVM were fitted on.
+"""
+
+import numpy as np
+
+from .acquisition import RingBuffer
+from .schema import DEFAULT_SCHEMA, STATISTICS
+
+
+def block_moments(block):
+    """(n, mean, M2, M3, M4) of a (n, channels) block, M_k = sum((x - mean)^k)."""
+    x = np.asarray(block, dtype=np.float64)
+    mean = x.mean(axis=0)
+    d = x - mean
+    d2 = d * d
+    return len(x), mean, d2.sum(axis=0), (d2 * d).sum(axis=0), (d2 * d2).sum(axis=0)
+
+
+def merge_moments(a, b):
+    """Combine the moments of two disjoint sample sets (Pebay 2008)."""
+    na, mean_a, M2a, M3a, M4a = a
+    nb, mean_b, M2b, M3b, M4b = b
+    if na == 0:
+        return b
+    if nb == 0:
+        return a
+    n = na + nb
+    delta = mean_b - mean_a
+    d_n = delta / n
+    mean = mean_a + nb * d_n
+    M2 = M2a + M2b + delta * d_n * na * nb
+    M3 = (M3a + M3b + delta * d_n * d_n * na * nb * (na - nb)
+          + 3 * d_n * (na * M2b - nb * M2a))
+    M4 = (M4a + M4b + delta * d_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+          + 6 * d_n * d_n * (na * na * M2b + nb * nb * M2a)
+          + 4 * d_n * (na * M3b - nb * M3a))
+    return n, mean, M2, M3, M4
+
+
+def remove_moments(ab, b):
+    """Inverse of `merge_moments`: the moments of `ab` without the samples of `b`."""
+    n, mean, M2, M3, M4 = ab
+    nb, mean_b, M2b, M3b, M4b = b
+    na = n - nb
+    if na <= 0:
+        return 0, np.zeros_like(mean), np.zeros_like(M2), np.zeros_like(M3), np.zeros_like(M4)
+    mean_a = (n * mean - nb * mean_b) / na
+    delta = mean_b - mean_a
+    d_n = delta / n
+    M2a = M2 - M2b - delta * d_n * na * nb
+    M3a = (M3 - M3b - delta * d_n * d_n * na * nb * (na - nb)
+           - 3 * d_n * (na * M2b - nb * M2a))
+    M4a = (M4 - M4b - delta * d_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+           - 6 * d_n * d_n * (na * na * M2b + nb * nb * M2a)
+           - 4 * d_n * (na * M3b - nb * M3a))
+    return na, mean_a, M2a, M3a, M4a
+
+
+class RunningMoments:
+    """
+    Running moments of a (samples, channels) stream.
+
+    With `window=None` the statistics cover every sample seen so far. With
+    `window=N` they cover the last N samples: new blocks are merged in and
+    the samples that fall out are removed with the inverse update, and the
+    state is recomputed exactly from the buffered window once every N
+    samples so rounding errors cannot accumulate. Both cost O(1) per sample.
+
+    `update` can run on the acquisition thread while another thread reads
+    the statistics: the state is replaced as one tuple, so readers always
+    see a consistent snapshot.
+    """
+
+    def __init__(self, n_channels=2, window=None):
+        self.n_channels = n_channels
+        self.window = window
+        self._buffer = RingBuffer(window, n_channels, dtype=np.float64) if window else None
+        self._since_recompute = 0
+        self._state = self._empty()
+
+    def _empty(self):
+        zeros = np.zeros(self.n_channels)
+        return 0, zeros, zeros, zeros, zeros
+
+    def reset(self):
+        self._state = self._empty()
+        if self._buffer is not None:
+            self._buffer = RingBuffer(self.window, self.n_channels, dtype=np.float64)
+        self._since_recompute = 0
+
+    def update(self, block):
+        """Add a (n, n_channels) block of samples."""
+        block = np.asarray(block, dtype=np.float64).reshape(-1, self.n_channels)
+        if len(block) == 0:
+            return
+        if self._buffer is None:
+            self._state = merge_moments(self._state, block_moments(block))
+            return
+
+        window = self.window
+        held = min(self._buffer.count, window)
+        n_remove = max(0, held + len(block) - window)
+        removed = self._buffer.latest(held)[:n_remove].copy() if n_remove < held else None
+        self._buffer.write(block)
+        self._since_recompute += len(block)
+
+        if removed is None or self._since_recompute >= window:
+            self._state = block_moments(self._buffer.latest(window))
+            self._since_recompute = 0
+        else:
+            state = merge_moments(self._state, block_moments(block))
+            if len(removed):
+                state = remove_moments(state, block_moments(removed))
+            self._state = state
+
+    # -------------------- statistics --------------------
+    @property
+    def count(self):
+        return self._state[0]
+
+    def stats(self):
+        """(n_channels, 4) array of [mean, std, skew, kurtosis] per channel."""
+        n, mean, M2, M3, M4 = self._state
+        if n == 0:
+            return np.full((self.n_channels, 4), np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(M2 / (n - 1)) if n > 1 else np.full(self.n_channels, np.nan)
+            skew = np.sqrt(n) * M3 / M2 ** 1.5
+            kurt = n * M4 / (M2 * M2) - 3.0
+        return np.column_stack([mean, std, skew, kurt])
+
+    def features(self, channels=DEFAULT_SCHEMA.channels):
+        """The statistics as a dict keyed like `extract_features` ("FP1_mean", ...)."""
+        stats = self.stats()
+        return {
+            f"{ch}_{name}": float(stats[i, j])
+            for i, ch in enumerate(channels)
+            for j, name in enumerate(STATISTICS)
+        }
@@ -0,0 +1,122 @@
+"""
+Parsers for the Arduino's "Time(ms),Fp1(uV),Fp2(uV)" CSV line stream.
+
+Both parsers take raw bytes as returned by `ser.read(...)`, carry partial
+lines over to the next chunk, skip empty lines and "Time..." header lines,
+and count malformed rows in `dropped`.
+"""
+
+import io
+
+import numpy as np
+
+COMMA, NEWLINE, CR = ord(","), ord("\n"), ord("\r")
+HEADER_PREFIX = b"Time"
+
+
+class LineParser:
+    """
+    Reference parser: one `decode` / `split` / `float()` per line, exactly
+    like the original `collect_eeg_data` loops. Used as the fallback for
+    batches the bulk parser cannot convert in one go.
+    """
+
+    def __init__(self, n_columns=3):
+        self.n_columns = n_columns
+        self.dropped = 0
+        self._partial = b""
+
+    def feed(self, chunk):
+        """Parse a chunk of bytes and return a float32 (n, n_columns) array."""
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        return self.parse_lines(lines)
+
+    def parse_lines(self, lines):
+        rows = []
+        for raw in lines:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line or line.startswith("Time"):
+                continue
+            parts = line.split(",")
+            if len(parts) < self.n_columns:
+                self.dropped += 1
+                continue
+            try:
+                rows.append([float(p) for p in parts[:self.n_columns]])
+            except ValueError:
+                self.dropped += 1
+        return np.array(rows, dtype=np.float32).reshape(-1, self.n_columns)
+
+
+class BulkLineParser:
+    """
+    Vectorized parser for large `ser.read(ser.in_waiting)` chunks.
+
+    Line boundaries, header lines and field counts are found with NumPy
+    operations over the raw bytes, the valid lines are cut out with one
+    boolean mask, and the whole batch is converted by NumPy's C CSV reader.
+    Only if that conversion fails (a line with enough commas but a
+    non-numeric field) does the batch go through `LineParser`.
+
+    Like `LineParser`, a valid row has at least `n_columns` fields and only
+    the first `n_columns` are kept, so the extra Blink column of 123.ino's
+    "Time,Fp1,Fp2,Blink" lines is ignored.
+    """
+
+    def __init__(self, n_columns=3):
+        self.n_columns = n_columns
+        self.lines = 0     # complete lines seen
+        self.skipped = 0   # empty and header lines
+        self._partial = b""
+        self._fallback = LineParser(n_columns)
+        self._bad_fields = 0
+
+    @property
+    def dropped(self):
+        return self._bad_fields + self._fallback.dropped
+
+    def feed(self, chunk):
+        """Parse a chunk of bytes and return a float32 (n, n_columns) array."""
+        data = self._partial + chunk
+        cut = data.rfind(b"\n") + 1
+        self._partial = data[cut:]
+        if cut == 0:
+            return np.empty((0, self.n_columns), dtype=np.float32)
+        return self.parse_block(data[:cut])
+
+    def parse_block(self, block):
+        """Parse a block of complete, newline-terminated lines."""
+        buf = np.frombuffer(block, dtype=np.uint8)
+        ends = np.flatnonzero(buf == NEWLINE)
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        lengths = ends - starts
+        self.lines += len(ends)
+
+        n_commas = np.add.reduceat(buf == COMMA, starts)
+        # blank lines, including the "\r" left over from "\r\n" endings
+        blank = (lengths == 0) | ((lengths == 1) & (buf[starts] == CR))
+        header = np.zeros(len(ends), dtype=bool)
+        if HEADER_PREFIX in block:
+            header = lengths >= len(HEADER_PREFIX)
+            for k, byte in enumerate(HEADER_PREFIX):
+                header &= buf[np.minimum(starts + k, len(buf) - 1)] == byte
+        valid = ~blank & ~header & (n_commas >= self.n_columns - 1)
+
+        self.skipped += int(np.count_nonzero(blank | header))
+        self._bad_fields += int(np.count_nonzero(~blank & ~header & ~valid))
+        n_valid = int(np.count_nonzero(valid))
+        if n_valid == 0:
+            return np.empty((0, self.n_columns), dtype=np.float32)
+        if n_valid < len(ends):
+            # keep the bytes (including the newline) of valid lines only
+            block = buf[np.repeat(valid, lengths + 1)].tobytes()
+
+        try:
+            values = np.loadtxt(io.BytesIO(block), delimiter=",", dtype=np.float32, ndmin=2,
+                                usecols=range(self.n_columns))
+        except ValueError:
+            return self._fallback.parse_lines(block.split(b"\n")[:-1])
+        return values.reshape(-1, self.n_columns)
@@ -0,0 +1,260 @@
+"""
+The EEG prediction pipeline shared by every front end (str.py, str2.py,
+str3.py, streamlit.py, eeg_prediction.py): collect -> extract features ->
+load model -> predict -> log.
+
+Heavy dependencies (scipy, joblib/sklearn, pandas, streamlit, pySerial) are
+imported inside the functions that need them, so importing this module, and
+therefore starting a Streamlit app, does not pay for them up front.
+"""
+
+import csv
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from .acquisition import AcquisitionEngine
+from .fused import fused_model
+from .schema import DEFAULT_SCHEMA
+
+# Canonical parameters. The copies had drifted (alpha 8-12 vs 8-13 Hz, fs
+# 256 vs 512, nperseg 256 vs 512); nperseg is one second of samples, which
+# reproduces both the training script (256 @ 256 Hz) and the apps (512 @ 512 Hz).
+FS = 512
+ALPHA_BAND = (8.0, 13.0)
+# FP1/FP2 features; other boards pass their eeg_core.schema.ChannelSchema
+FEATURE_NAMES = DEFAULT_SCHEMA.feature_names
+MODEL_FILES = ("scaler.joblib", "svm_eeg_model.joblib", "label_encoder.joblib")
+MODEL_NOT_FOUND = "Model components not found."
+MODEL_REGISTRY = "models"  # eeg_core.registry directory inside the model dir
+MODEL_NAME = "stress"      # registered model the apps load (FEATURE_NAMES inputs)
+
+# np.trapz was renamed to np.trapezoid in NumPy 2.0
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+_model_cache = {}
+
+
+# ---------------------------------------------------------------------
+# 1) Collect EEG Data from Arduino (Streamlit UI)
+# ---------------------------------------------------------------------
+def collect_eeg_data(duration_seconds=60, port="COM3", baud_rate=500000, fs=FS, schema=DEFAULT_SCHEMA):
+    """
+    Read real-time EEG data from Arduino over serial for 'duration_seconds'.
+    Expects lines formatted as: "Time(ms),Fp1(uV),Fp2(uV)" (one column per
+    channel of `schema`).
+
+    The port is read on a background thread (see AcquisitionEngine); this
+    function only refreshes the Streamlit progress bar a few times per second.
+
+    Returns a pandas DataFrame with columns ["Timestamp", "FP1", "FP2"]
+    (`schema.columns`).
+    """
+    import pandas as pd
+    import streamlit as st
+
+    st.write(f"Attempting connection to {port} at {baud_rate} baud...")
+    try:
+        engine = AcquisitionEngine.from_serial(port, baud_rate, fs=fs, schema=schema,
+                                               capacity_seconds=duration_seconds + 5)
+    except Exception as e:
+        st.error(f"Could not open serial port {port}: {e}")
+        return pd.DataFrame(columns=list(schema.columns))  # empty
+
+    start_time = time.time()
+    st.write(f"Collecting data at ~{fs} Hz for {duration_seconds} seconds...")
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+
+    def show_progress(progress_fraction):
+        progress_bar.progress(progress_fraction)
+        status_text.text(f"Collecting data... {int(progress_fraction * 100)}%")
+
+    with engine:
+        samples = engine.collect(duration_seconds, on_progress=show_progress)
+
+    st.success(f"Data collection completed in {time.time()-start_time:.2f} seconds.")
+    st.write(f"Total samples collected: **{len(samples)}**")
+    return pd.DataFrame(samples, columns=list(schema.columns))
+
+
+# ---------------------------------------------------------------------
+# 2) Feature Extraction
+# ---------------------------------------------------------------------
+def compute_alpha_power(signal, fs=FS, band=ALPHA_BAND):
+    """
+    Alpha-band power from Welch's PSD, integrated with the trapezoid rule.
+    A (samples, channels) signal gives one power per channel, in one call.
+    """
+    from scipy.signal import welch
+
+    f, Pxx = welch(signal, fs=fs, nperseg=min(len(signal), int(fs)), axis=0)
+    alpha_mask = (f >= band[0]) & (f <= band[1])
+    return _trapezoid(Pxx[alpha_mask], x=f[alpha_mask], axis=0)
+
+
+def extract_features(df_window, fs=FS, schema=DEFAULT_SCHEMA):
+    """
+    Extract statistical + alpha-band power features from the entire
+    DataFrame window (a column per channel of `schema`, by default "FP1"
+    and "FP2"), in `schema.feature_names` (FEATURE_NAMES) order. Every
+    statistic is computed for all channels at once.
+    """
+    from scipy.stats import kurtosis, skew
+
+    x = schema.signals(df_window)
+    stats = np.stack([x.mean(axis=0), x.std(axis=0, ddof=1), skew(x, axis=0), kurtosis(x, axis=0)], axis=1)
+    values = np.concatenate([stats.ravel(), compute_alpha_power(x, fs=fs)])
+    return dict(zip(schema.feature_names, values.tolist()))
+
+
+# ---------------------------------------------------------------------
+# 3) Load Model & Predict
+# ---------------------------------------------------------------------
+def load_model_components(model_dir=".", on_error=print, schema=DEFAULT_SCHEMA):
+    """
+    Load the scaler, SVM model, and label encoder from `model_dir`, for
+    features of the channels in `schema`.
+
+    If `model_dir` has a model registry (MODEL_REGISTRY) with an active
+    MODEL_NAME version, that version is loaded: hash-checked, memory-mapped
+    and cached, with the active version re-checked on every call so a newly
+    trained model is picked up without restarting the app. Otherwise the bare
+    MODEL_FILES in `model_dir` are loaded, cached per process after the first
+    successful load. On failure, or when the model was trained on other
+    features than `schema.feature_names`, `on_error` (e.g. st.error) is
+    called and Nones are returned.
+    """
+    from .registry import ModelRegistry
+
+    registry = ModelRegistry(os.path.join(model_dir, MODEL_REGISTRY))
+    if registry.active_version(MODEL_NAME) is not None:
+        try:
+            model = registry.load(MODEL_NAME)
+        except (OSError, KeyError, ValueError) as e:
+            on_error(f"Could not load model {MODEL_NAME}: {e}")
+            return None, None, None
+        problem = schema.check_features(model.manifest["feature_schema"])
+        if problem is not None:
+            on_error(f"Model {MODEL_NAME} {model.manifest['version']}: {problem}")
+            return None, None, None
+        return model.components
+
+    components = _model_cache.get(model_dir)
+    if components is None:
+        import joblib
+
+        try:
+            components = tuple(joblib.load(os.path.join(model_dir, name)) for name in MODEL_FILES)
+        except FileNotFoundError as e:
+            on_error(f"Could not load model files: {e}")
+            return None, None, None
+        _model_cache[model_dir] = components
+    problem = schema.check_model(components[0])
+    if problem is not None:
+        on_error(f"Model in {model_dir}: {problem}")
+        return None, None, None
+    return components
+
+
+def make_prediction(feature_df, scaler, svm_model, label_encoder):
+    """
+    Predict the label from the single-row DF using the provided scaler and model.
+    """
+    if scaler is None or svm_model is None or label_encoder is None:
+        return MODEL_NOT_FOUND
+    fused = fused_model(scaler, svm_model, label_encoder)
+    if fused is not None:
+        return fused.predict(feature_df)[0][0]
+    X_scaled = scaler.transform(feature_df)
+    pred_encoded = svm_model.predict(X_scaled)
+    return label_encoder.inverse_transform(pred_encoded)[0]
+
+
+def stress_rating(predicted_label, distance):
+    """
+    Stress rating from the SVM margin: the logistic of the decision_function
+    distance, forced into [6, 10] for "Stressed" and [1, 5] for "Relaxed".
+    """
+    logistic_val = 1 / (1 + np.exp(-distance))  # maps to [0,1]
+
+    if predicted_label.lower() == "stressed":
+        rating = 6 + round(logistic_val * 4)
+        return max(6, min(10, rating))
+    p_relaxed = 1 - logistic_val
+    rating = 1 + round(p_relaxed * 4)
+    return max(1, min(5, rating))
+
+
+def classify_stress(feature_df, scaler, svm_model, label_encoder):
+    """
+    1) Predict the label ("Relaxed" or "Stressed") from the features.
+    2) Use the SVM's decision_function (with logistic transform) to estimate the strength
+       of the prediction.
+    3) Force the final stress rating:
+         - If "Stressed", rating in [6,10]
+         - If "Relaxed", rating in [1,5]
+    The scaler + SVM run as one fused NumPy expression (eeg_core.fused) when
+    the model allows it, instead of four sklearn calls.
+    Returns: (predicted_label, stress_rating)
+    """
+    if scaler is None or svm_model is None or label_encoder is None:
+        return MODEL_NOT_FOUND, 0
+
+    fused = fused_model(scaler, svm_model, label_encoder)
+    if fused is not None:
+        labels, distances = fused.predict(feature_df)
+        return labels[0], stress_rating(labels[0], distances[0])
+
+    X_scaled = scaler.transform(feature_df)
+    pred_encoded = svm_model.predict(X_scaled)
+    predicted_label = label_encoder.inverse_transform(pred_encoded)[0]
+
+    # Use decision_function to get a margin distance
+    distance = svm_model.decision_function(X_scaled)[0]
+    return predicted_label, stress_rating(predicted_label, distance)
+
+
+def classify_batch(features, scaler, svm_model, label_encoder):
+    """
+    classify_stress for many rows at once: `features` is an (n, n_features)
+    array in the model's feature order (FEATURE_NAMES for FP1/FP2). One
+    fused evaluation (or one scaler.transform and one decision_function
+    call) for the whole batch; the label is the sign of the (binary) SVM
+    margin, which is what `predict` returns.
+    Returns (labels, ratings, distances).
+    """
+    fused = fused_model(scaler, svm_model, label_encoder)
+    if fused is not None:
+        labels, distances = fused.predict(features)
+    else:
+        import pandas as pd
+
+        names = getattr(scaler, "feature_names_in_", None)
+        X_scaled = scaler.transform(features if names is None else pd.DataFrame(features, columns=names))
+        distances = svm_model.decision_function(X_scaled)
+        labels = label_encoder.inverse_transform(svm_model.classes_[(distances > 0).astype(int)])
+    ratings = [stress_rating(label, d) for label, d in zip(labels, distances)]
+    return labels, ratings, distances
+
+
+# ---------------------------------------------------------------------
+# 4) Save the Prediction to CSV
+# ---------------------------------------------------------------------
+def save_prediction_to_csv(pred_label, output_csv="predictions_log.csv"):
+    """
+    Append the timestamp + predicted label to `output_csv` as a log.
+    The apps log to eeg_core.predictions (log_prediction) instead, which
+    imports these CSV logs once.
+    """
+    prediction_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    row = [prediction_time, pred_label]
+
+    file_exists = os.path.isfile(output_csv)
+    with open(output_csv, "a", newline="") as f:
+        writer = csv.writer(f)
+        if not file_exists:
+            writer.writerow(["Timestamp", "Predicted State"])
+        writer.writerow(row)
@@ -0,0 +1,370 @@
+"""
+Indexed prediction log.
+
+save_prediction_to_csv opened, appended to and closed predictions_log.csv
+for every prediction, and the apps' "Prediction History" sections re-read
+the whole file with pandas on every Streamlit rerun just to show its last
+ten rows or chart it, so a page got slower with every prediction ever made.
+PredictionLog keeps the log in SQLite instead (WAL mode, so apps in other
+processes can read while one writes):
+
+    predictions     (id, time, label), indexed by time
+    minute_counts   (minute, label, n): rows per label and minute, updated
+                    in the same transaction as every insert
+    imports         CSV logs already imported, so each is imported once
+
+`time` is seconds since 1970-01-01 in local wall-clock time, like the
+naive timestamps the CSV logs had. Appends are buffered and written in
+batches, at most MAX_DELAY seconds after they were made; `tail(n)` reads
+the last n rows through the index and `aggregate` sums minute counts over
+a fixed number of buckets, so neither depends on how long the history is.
+
+    python -m eeg_core.predictions import predictions_log.csv predictions_log1.csv eeg_predictions.csv test.csv
+    python -m eeg_core.predictions tail -n 20
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+PREDICTIONS_DB = "predictions.db"
+# CSV logs the apps wrote before; open_prediction_log imports them once.
+# str.py appended its predictions to its recording, test.csv
+LEGACY_LOGS = ("predictions_log.csv", "predictions_log1.csv", "eeg_predictions.csv", "test.csv")
+TIME_COLUMN, LABEL_COLUMN = "Timestamp", "Predicted State"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Formats seen in the CSV logs (predictions_log1.csv was edited in a spreadsheet)
+CSV_TIME_FORMATS = (TIME_FORMAT, "%d-%m-%Y %H:%M", "%d-%m-%Y %H:%M:%S")
+BATCH_SIZE = 256     # buffered rows that trigger a write
+MAX_DELAY = 1.0      # s a buffered row may wait for more before it is written
+ROLLUP_SECONDS = 60  # minute_counts granularity; aggregate buckets are multiples
+
+_EPOCH = datetime(1970, 1, 1)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY, time REAL NOT NULL, label TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS predictions_time ON predictions (time);
+CREATE TABLE IF NOT EXISTS minute_counts (
+    minute INTEGER NOT NULL, label TEXT NOT NULL, n INTEGER NOT NULL,
+    PRIMARY KEY (minute, label)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY, rows INTEGER NOT NULL, skipped INTEGER NOT NULL, imported REAL NOT NULL);
+"""
+
+_logs = {}  # absolute path -> PredictionLog, see open_prediction_log
+_logs_lock = threading.Lock()
+
+
+def to_seconds(when):
+    """Local wall-clock seconds of a naive datetime (the `time` column)."""
+    return (when - _EPOCH).total_seconds()
+
+
+def format_time(seconds):
+    """A `time` value as the CSV logs' "%Y-%m-%d %H:%M:%S" string."""
+    return (_EPOCH + timedelta(seconds=seconds)).strftime(TIME_FORMAT)
+
+
+class PredictionLog:
+    """
+    Append-only prediction log in the SQLite database at `path`.
+
+    Safe to share between threads (Streamlit reruns, acquisition threads).
+    `append` buffers rows and writes them once `batch_size` are pending, or
+    from a timer thread once the oldest has waited `max_delay` seconds, so
+    other processes see a prediction within `max_delay` even if nothing else
+    is logged. Queries and `close` write whatever is pending first. A failed
+    timed write keeps the rows pending and is surfaced through `error`.
+    """
+
+    def __init__(self, path=PREDICTIONS_DB, batch_size=BATCH_SIZE, max_delay=MAX_DELAY):
+        import sqlite3
+
+        self.path = path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._lock = threading.RLock()
+        self._pending = []
+        self._timer = None  # writes the pending rows max_delay after the first
+        self.error = None
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; WAL keeps it consistent
+        self._conn.executescript(_SCHEMA)
+
+    # -------------------- writing --------------------
+    def append(self, label, when=None):
+        """Log one prediction made at `when` (naive local datetime, default now)."""
+        seconds = to_seconds(when or datetime.now())
+        with self._lock:
+            self._pending.append((seconds, str(label)))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def extend(self, rows):
+        """Log (seconds, label) rows at once (e.g. from `import_csv`)."""
+        with self._lock:
+            self.flush()
+            self._insert([(float(t), str(label)) for t, label in rows])
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending:
+                rows, self._pending = self._pending, []
+                try:
+                    self._insert(rows)
+                except Exception:
+                    self._pending = rows + self._pending  # retried on the next write
+                    raise
+
+    def _flush_on_timer(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self.flush()
+            except Exception as e:  # e.g. the database stayed locked; kept for the caller
+                self.error = e
+
+    def _insert(self, rows):
+        with self._conn:  # one transaction
+            self._write(rows)
+
+    def _write(self, rows):
+        """Insert rows and their minute counts in the current transaction."""
+        if not rows:
+            return
+        counts = Counter((int(t // ROLLUP_SECONDS) * ROLLUP_SECONDS, label) for t, label in rows)
+        self._conn.executemany("INSERT INTO predictions (time, label) VALUES (?, ?)", rows)
+        self._conn.executemany(
+            "INSERT INTO minute_counts VALUES (?, ?, ?) "
+            "ON CONFLICT (minute, label) DO UPDATE SET n = n + excluded.n",
+            [(minute, label, n) for (minute, label), n in counts.items()])
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------- queries --------------------
+    def _query(self, sql, params=()):
+        with self._lock:
+            self.flush()
+            return self._conn.execute(sql, params).fetchall()
+
+    def latest_time(self):
+        """`time` of the newest prediction, or None if the log is empty."""
+        return self._query("SELECT MAX(time) FROM predictions")[0][0]
+
+    def tail(self, n=10):
+        """
+        The last `n` predictions, oldest first, as a DataFrame with the CSV
+        log's "Timestamp" (string) and "Predicted State" columns.
+        """
+        import pandas as pd
+
+        rows = self._query("SELECT time, label FROM predictions ORDER BY time DESC, id DESC LIMIT ?", (n,))
+        rows.reverse()
+        return pd.DataFrame([(format_time(t), label) for t, label in rows], columns=[TIME_COLUMN, LABEL_COLUMN])
+
+    def aggregate(self, bucket_seconds=3600, n_buckets=48, end=None):
+        """
+        Predictions per label in the `n_buckets` buckets of `bucket_seconds`
+        up to the one holding `end` (seconds, default: the newest prediction),
+        as a DataFrame indexed by bucket start ("Timestamp") with one count
+        column per label. Buckets without predictions are left out.
+        """
+        import pandas as pd
+
+        if bucket_seconds <= 0 or bucket_seconds % ROLLUP_SECONDS:
+            raise ValueError(f"bucket_seconds must be a positive multiple of {ROLLUP_SECONDS}")
+        if end is None:
+            end = self.latest_time()
+        if end is None:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name=TIME_COLUMN))
+        last = int(end // bucket_seconds) * bucket_seconds
+        rows = self._query(
+            "SELECT minute / ?1 * ?1 AS bucket, label, SUM(n) FROM minute_counts "
+            "WHERE minute >= ?2 AND minute < ?3 GROUP BY bucket, label",
+            (bucket_seconds, last - (n_buckets - 1) * bucket_seconds, last + bucket_seconds))
+        df = pd.DataFrame(rows, columns=["bucket", "label", "n"])
+        counts = df.pivot(index="bucket", columns="label", values="n").fillna(0).astype(int)
+        counts.index = pd.to_datetime(counts.index, unit="s").rename(TIME_COLUMN)
+        counts.columns.name = None
+        return counts
+
+    def export_csv(self, path_or_buf=None, chunk_rows=100_000):
+        """
+        Write the whole log as a CSV in the old predictions_log.csv format;
+        returns it as a string when `path_or_buf` is None. Reads all rows,
+        so call it on request (e.g. a download button), not on every render.
+        """
+        import csv
+        import io
+
+        if path_or_buf is None:
+            out = io.StringIO()
+        elif isinstance(path_or_buf, str):
+            out = open(path_or_buf, "w", newline="")
+        else:
+            out = path_or_buf
+        writer = csv.writer(out)
+        writer.writerow([TIME_COLUMN, LABEL_COLUMN])
+        with self._lock:
+            self.flush()
+            cursor = self._conn.execute("SELECT time, label FROM predictions ORDER BY time, id")
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                writer.writerows([(format_time(t), label) for t, label in rows])
+        if path_or_buf is None:
+            return out.getvalue()
+        if out is not path_or_buf:
+            out.close()
+        return None
+
+    # -------------------- importing --------------------
+    def imported(self, csv_path):
+        return bool(self._query("SELECT 1 FROM imports WHERE path = ?", (os.path.abspath(csv_path),)))
+
+    def import_csv(self, csv_path, chunk_rows=100_000):
+        """
+        Import a CSV log written by save_prediction_to_csv ("Timestamp",
+        "Predicted State"), once: a file already imported is skipped.
+        Returns (rows imported, rows skipped for an unreadable timestamp or
+        missing label), or None if the file had been imported before.
+
+        A file without a "Predicted State" column is a recording that str.py
+        appended its predictions to (test.csv): their labels are in its
+        second column, and its sample rows are skipped.
+
+        The rows and the file's `imports` entry are written in one
+        transaction, which takes the write lock before checking `imports`:
+        a failed import leaves nothing behind, and of two processes
+        importing the same file at once only the first does.
+        """
+        import pandas as pd
+
+        path = os.path.abspath(csv_path)
+        with self._lock:
+            self.flush()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM imports WHERE path = ?", (path,)).fetchone():
+                    self._conn.rollback()
+                    return None
+                header = pd.read_csv(csv_path, nrows=0).columns
+                label_column = LABEL_COLUMN if LABEL_COLUMN in header else header[1]
+                rows = skipped = 0
+                for chunk in pd.read_csv(csv_path, usecols=[TIME_COLUMN, label_column], dtype=str,
+                                         chunksize=chunk_rows):
+                    chunk = chunk.dropna(how="all")  # blank spreadsheet rows
+                    times = _parse_times(chunk[TIME_COLUMN])
+                    labels = chunk[label_column].str.strip()
+                    ok = times.notna() & labels.notna() & (labels != "")
+                    seconds = (times[ok] - pd.Timestamp(_EPOCH)).dt.total_seconds()
+                    self._write(list(zip(seconds.tolist(), labels[ok].tolist())))
+                    rows += int(ok.sum())
+                    skipped += int((~ok).sum())
+                self._conn.execute("INSERT INTO imports VALUES (?, ?, ?, ?)",
+                                   (path, rows, skipped, time.time()))
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+        return rows, skipped
+
+
+def _parse_times(values):
+    """Timestamps in any of CSV_TIME_FORMATS (NaT where none matches)."""
+    import pandas as pd
+
+    values = values.str.strip()
+    times = pd.to_datetime(values, format=CSV_TIME_FORMATS[0], errors="coerce")
+    for fmt in CSV_TIME_FORMATS[1:]:
+        missing = times.isna()
+        if not missing.any():
+            break
+        times[missing] = pd.to_datetime(values[missing], format=fmt, errors="coerce")
+    return times
+
+
+def open_prediction_log(path=PREDICTIONS_DB, legacy=LEGACY_LOGS):
+    """
+    The process-wide PredictionLog for `path`, opened on first use (pending
+    rows are written at interpreter exit). Existing `legacy` CSV logs are
+    imported into it once.
+    """
+    key = os.path.abspath(path)
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = PredictionLog(path)
+            atexit.register(log.close)
+            for csv_path in legacy:
+                if os.path.isfile(csv_path):
+                    log.import_csv(csv_path)
+    return log
+
+
+def log_prediction(pred_label, path=PREDICTIONS_DB):
+    """Append the predicted label, timestamped now, to the prediction log at `path`."""
+    open_prediction_log(path).append(pred_label)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import, inspect and export the EEG prediction log.")
+    parser.add_argument("--db", default=PREDICTIONS_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="CSV prediction logs -> database (each file once)")
+    imp.add_argument("paths", nargs="+")
+    tail = sub.add_parser("tail", help="print the latest predictions")
+    tail.add_argument("-n", type=int, default=10)
+    agg = sub.add_parser("aggregate", help="print predictions per label and time bucket")
+    agg.add_argument("--bucket-minutes", type=int, default=60)
+    agg.add_argument("--buckets", type=int, default=24)
+    exp = sub.add_parser("export", help="database -> CSV")
+    exp.add_argument("csv")
+    args = parser.parse_args(argv)
+
+    with PredictionLog(args.db) as log:
+        if args.command == "import":
+            for csv_path in args.paths:
+                result = log.import_csv(csv_path)
+                if result is None:
+                    print(f"{csv_path}: already imported")
+                else:
+                    print(f"{csv_path}: {result[0]} predictions imported, {result[1]} rows skipped")
+        elif args.command == "tail":
+            print(log.tail(args.n).to_string(index=False))
+        elif args.command == "aggregate":
+            print(log.aggregate(args.bucket_minutes * 60, args.buckets).to_string())
+        else:
+            log.export_csv(args.csv)
+            print(f"{args.db} -> {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
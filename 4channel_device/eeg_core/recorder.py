@@ -0,0 +1,162 @@
+"""
+Labelled session recorder.
+
+collect.py used to read, write and print every sample on one thread; the
+console output alone kept it well below 512 Hz. SessionRecorder splits the
+work: the AcquisitionEngine thread drains the port into its ring buffer, a
+writer thread moves new rows into an .eegrec recording in large blocks, and
+the caller only changes labels and shows a throttled status line.
+
+Labels are start/stop markers taken at the sample count when they are set,
+stored once per segment in the recording header (eeg_core.recording).
+Received vs expected sample counts are derived from the device timestamps,
+to show whether anything was dropped.
+"""
+
+import threading
+import time
+
+from .metrics import TimestampStats
+from .recording import RecordingWriter
+
+FLUSH_INTERVAL = 0.5    # s between writer-thread drains of the ring buffer
+HEADER_INTERVAL = 5.0   # s between header rewrites (crash safety)
+STATUS_INTERVAL = 1.0   # s between console status lines
+
+
+class SessionRecorder:
+    """
+    Record an AcquisitionEngine's stream to an .eegrec recording.
+
+    Use as a context manager (or start/stop), and call `start_label` /
+    `stop_label` as the session progresses. `lost` counts rows that were
+    overwritten in the ring buffer before the writer reached them.
+    """
+
+    def __init__(self, engine, path, flush_interval=FLUSH_INTERVAL, **header):
+        self.engine = engine
+        self.writer = RecordingWriter(path, fs=engine.fs, **header)
+        self.flush_interval = flush_interval
+        self.total = TimestampStats(engine.fs)
+        self.segment = TimestampStats(engine.fs)  # current label segment
+        self.label = None
+        self.completed = []  # (label, TimestampStats summary) per finished segment
+        self.lost = 0
+        self.error = None
+        self._markers = []  # (sample index, label or None), applied by the writer
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._cursor = None
+
+    # -------------------- lifecycle --------------------
+    def start(self):
+        self.engine.start()
+        self._cursor = self.engine.total_samples
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="eeg-recorder", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Write everything acquired so far and close the recording."""
+        if self.label is not None:
+            self.stop_label()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.engine.close()
+        self.writer.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # -------------------- labels --------------------
+    def start_label(self, label):
+        """Label every sample from now on with `label`."""
+        with self._lock:
+            self._markers.append((self.engine.total_samples, label))
+        self.label = label
+
+    def stop_label(self):
+        with self._lock:
+            self._markers.append((self.engine.total_samples, None))
+        self.label = None
+
+    # -------------------- writer thread --------------------
+    def _run(self):
+        last_header = time.monotonic()
+        try:
+            while True:
+                stopping = self._stop.wait(self.flush_interval)
+                self._drain()
+                if time.monotonic() - last_header >= HEADER_INTERVAL:
+                    self.writer.flush()
+                    last_header = time.monotonic()
+                if stopping:
+                    return
+        except Exception as e:  # surfaced to the caller through `error`
+            self.error = e
+
+    def _drain(self):
+        with self._lock:
+            block, cursor = self.engine.read_since(self._cursor)
+            markers, self._markers = self._markers, []
+        first = cursor - len(block)  # sample index of block[0]
+        self.lost += first - self._cursor
+        self._cursor = cursor
+        position = 0
+        for index, label in markers:
+            split = min(max(index - first, position), len(block))
+            self._write(block[position:split])
+            position = split
+            if self._segment_open():
+                self.completed.append((self.writer.header["labels"][-1]["label"], self.segment.summary()))
+            if label is None:
+                self.writer.stop_label()
+            else:
+                self.writer.start_label(label)
+                self.segment.reset()
+        self._write(block[position:])
+
+    def _write(self, rows):
+        if len(rows) == 0:
+            return
+        self.writer.append(rows)
+        self.total.update(rows[:, 0])
+        if self._segment_open():
+            self.segment.update(rows[:, 0])
+
+    def _segment_open(self):
+        labels = self.writer.header["labels"]
+        return bool(labels) and labels[-1]["stop"] is None
+
+    # -------------------- status --------------------
+    def wait(self, seconds, on_status=print, status_interval=STATUS_INTERVAL):
+        """
+        Block for `seconds` while recording, calling `on_status(text)` at
+        most once per `status_interval`. Raises if acquisition or writing failed.
+        """
+        end = time.monotonic() + seconds
+        while True:
+            for error in (self.engine.error, self.error):
+                if error is not None:
+                    raise error
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(status_interval, remaining))
+            if on_status is not None:
+                on_status(self.status())
+
+    def status(self):
+        s = self.segment
+        span = (s.last - s.first) / 1000.0 if s.first is not None else 0.0
+        rate = s.received / span if span > 0 else 0.0
+        return (f"{self.label or '-'}: {s.received} samples ({rate:.1f} Hz), "
+                f"expected {s.expected}, missing {s.missing}, gaps {s.gaps}, "
+                f"lost in buffer {self.lost}")
@@ -0,0 +1,316 @@
+"""
+Columnar binary recording format for raw EEG.
+
+A recording is a directory (conventionally named *.eegrec) holding one raw
+little-endian file per column plus a JSON header:
+
+    header.json      fs, gain, channel names, session id, label segments, ...
+    timestamp.f8     float64 device time in ms, one value per sample
+    <channel>.f32    float32 samples of each channel (e.g. FP1.f32, FP2.f32)
+
+Samples are appended in blocks through a buffer, so writing costs a few
+large `write` calls instead of one formatted CSV row per sample, and the
+columns are read back with np.memmap: opening a recording parses nothing,
+and any sample or time range is a zero-copy slice.
+
+Label segments are stored once in the header as [start, stop) row ranges
+instead of repeating the label on every row.
+
+Convert existing CSV files (test.csv, extracted_segments/, test_chunks/,
+eeg_emotion_data.csv) with:
+
+    python -m eeg_core.recording import test.csv extracted_segments test_chunks
+    python -m eeg_core.recording export test.eegrec test_copy.csv
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+
+import numpy as np
+
+from .acquisition import COLUMNS
+
+FORMAT = "eegrec"
+VERSION = 1
+SUFFIX = ".eegrec"
+HEADER_FILE = "header.json"
+TIMESTAMP_FILE = "timestamp.f8"
+BUFFER_ROWS = 16384
+CHUNK_ROWS = 100_000
+
+
+def is_recording(path):
+    return os.path.isfile(os.path.join(path, HEADER_FILE))
+
+
+def _channel_file(name):
+    return f"{name}.f32"
+
+
+# ---------------------------------------------------------------------
+# 1) Writer
+# ---------------------------------------------------------------------
+class RecordingWriter:
+    """
+    Append [Timestamp, ch...] rows to a new recording.
+
+    Rows are collected in a preallocated column-major buffer of
+    `buffer_rows` and written one column at a time when it fills (and on
+    `flush`/`close`). `start_label`/`stop_label` mark label segments at the
+    current row. The header is rewritten on every flush, so a recording cut
+    short by a crash is still readable up to the last flush.
+    """
+
+    def __init__(self, path, channels=COLUMNS[1:], fs=512, gain=1.0, session_id=None,
+                 buffer_rows=BUFFER_ROWS, **extra):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.channels = list(channels)
+        self.header = {
+            "format": FORMAT, "version": VERSION, "fs": fs, "gain": gain,
+            "channels": self.channels, "timestamp_unit": "ms",
+            "session_id": session_id or uuid.uuid4().hex,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "rows": 0, "labels": [], **extra,
+        }
+        self._files = [open(os.path.join(path, TIMESTAMP_FILE), "wb")]
+        self._files += [open(os.path.join(path, _channel_file(ch)), "wb") for ch in self.channels]
+        self._times = np.empty(buffer_rows, dtype="<f8")
+        self._values = np.empty((len(self.channels), buffer_rows), dtype="<f4")
+        self._n = 0  # rows in the buffer
+        self.rows = 0  # rows appended in total
+        self._write_header()
+
+    def append(self, block):
+        """Append a (n, 1 + n_channels) block of [Timestamp, ch...] rows."""
+        block = np.asarray(block)
+        n = len(block)
+        if n == 0:
+            return
+        if n > len(self._times) - self._n:
+            self._flush_buffer()
+        if n >= len(self._times):
+            self._write_columns(block[:, 0].astype("<f8"), block[:, 1:].T.astype("<f4"))
+        else:
+            self._times[self._n:self._n + n] = block[:, 0]
+            self._values[:, self._n:self._n + n] = block[:, 1:].T
+            self._n += n
+        self.rows += n
+
+    # -------------------- labels --------------------
+    def start_label(self, label):
+        """Start a label segment at the next appended row (ends any open one)."""
+        self.stop_label()
+        self.header["labels"].append({"label": label, "start": self.rows, "stop": None})
+
+    def stop_label(self):
+        labels = self.header["labels"]
+        if labels and labels[-1]["stop"] is None:
+            labels[-1]["stop"] = self.rows
+
+    # -------------------- output --------------------
+    def _write_columns(self, times, values):
+        self._files[0].write(times.tobytes())
+        for f, column in zip(self._files[1:], values):
+            f.write(np.ascontiguousarray(column).tobytes())
+
+    def _flush_buffer(self):
+        if self._n:
+            self._write_columns(self._times[:self._n], self._values[:, :self._n])
+            self._n = 0
+
+    def _write_header(self):
+        header = dict(self.header, rows=self.rows)
+        tmp = os.path.join(self.path, HEADER_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(header, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, HEADER_FILE))
+
+    def flush(self):
+        self._flush_buffer()
+        for f in self._files:
+            f.flush()
+        self._write_header()
+
+    def close(self):
+        if not self._files:
+            return
+        self.stop_label()
+        self.flush()
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------------------
+# 2) Reader
+# ---------------------------------------------------------------------
+class Recording:
+    """
+    Read-only, memory-mapped view of a recording.
+
+    `timestamps` and `channel(name)` are np.memmap columns; `slice_time`
+    returns zero-copy views of a time range. Rows present on disk but not
+    yet in the header (writer still running) are included.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, HEADER_FILE)) as f:
+            self.header = json.load(f)
+        self.channels = list(self.header["channels"])
+        self.fs = self.header["fs"]
+        self.gain = self.header.get("gain", 1.0)
+        sizes = [os.path.getsize(os.path.join(path, TIMESTAMP_FILE)) // 8]
+        sizes += [os.path.getsize(os.path.join(path, _channel_file(ch))) // 4 for ch in self.channels]
+        self.rows = min(sizes)
+        self.timestamps = self._map(TIMESTAMP_FILE, "<f8")
+        self._columns = {ch: self._map(_channel_file(ch), "<f4") for ch in self.channels}
+
+    def _map(self, name, dtype):
+        if self.rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=(self.rows,))
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def labels(self):
+        """List of (label, start_row, stop_row) segments."""
+        return [(s["label"], s["start"], self.rows if s["stop"] is None else s["stop"])
+                for s in self.header.get("labels", [])]
+
+    def channel(self, name):
+        return self._columns[name]
+
+    def rows_between(self, t_start, t_stop):
+        """Row range [start, stop) whose timestamps fall in [t_start, t_stop) ms."""
+        start, stop = np.searchsorted(self.timestamps, [t_start, t_stop])
+        return int(start), int(stop)
+
+    def slice_time(self, t_start, t_stop):
+        """Zero-copy {"Timestamp": ..., channel: ...} views of [t_start, t_stop) ms."""
+        start, stop = self.rows_between(t_start, t_stop)
+        views = {"Timestamp": self.timestamps[start:stop]}
+        views.update({ch: column[start:stop] for ch, column in self._columns.items()})
+        return views
+
+    def samples(self, start=0, stop=None, channels=None):
+        """Rows [start, stop) as a float64 (n, 1 + n_channels) [Timestamp, ch...] array."""
+        channels = channels or self.channels
+        stop = self.rows if stop is None else min(stop, self.rows)
+        out = np.empty((max(stop - start, 0), 1 + len(channels)))
+        out[:, 0] = self.timestamps[start:stop]
+        for i, ch in enumerate(channels, start=1):
+            out[:, i] = self._columns[ch][start:stop]
+        return out
+
+
+# ---------------------------------------------------------------------
+# 3) CSV Import / Export
+# ---------------------------------------------------------------------
+def import_csv(csv_path, out_path=None, fs=512, label_column="Emotion", chunk_rows=CHUNK_ROWS):
+    """
+    Convert a CSV recording to the binary format and return the output path
+    (default: the CSV path with an .eegrec suffix).
+
+    Handles the layouts in this repo: Timestamp + channels (test.csv,
+    extracted_segments/), channels only (test_chunks/, timestamps are
+    synthesised from `fs`) and labelled recordings (eeg_emotion_data.csv,
+    whose label column becomes label segments). Rows that are not numeric,
+    like the prediction line appended to test.csv, are skipped.
+    """
+    import pandas as pd
+
+    out_path = out_path or os.path.splitext(csv_path)[0] + SUFFIX
+    columns = list(pd.read_csv(csv_path, nrows=0).columns)
+    has_time = columns[0] == "Timestamp"
+    has_label = label_column in columns
+    channels = [c for c in columns if c not in ("Timestamp", label_column)]
+
+    with RecordingWriter(out_path, channels, fs=fs, source=os.path.basename(csv_path)) as writer:
+        current = None
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=str):
+            numeric = chunk[[c for c in columns if c != label_column]].apply(pd.to_numeric, errors="coerce")
+            valid = numeric.notna().all(axis=1).to_numpy()
+            values = numeric.to_numpy(dtype=np.float64)[valid]
+            if not has_time:
+                t0 = writer.rows
+                values = np.column_stack([(t0 + np.arange(len(values))) * (1000.0 / fs), values])
+            if not has_label:
+                writer.append(values)
+                continue
+            labels = chunk[label_column].to_numpy()[valid]
+            # Split at label changes and open a segment for each run
+            changes = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+            for a, b in zip(np.concatenate([[0], changes]), np.concatenate([changes, [len(labels)]])):
+                if b > a and labels[a] != current:
+                    current = labels[a]
+                    writer.start_label(current)
+                writer.append(values[a:b])
+    return out_path
+
+
+def export_csv(rec_path, csv_path, chunk_rows=CHUNK_ROWS, append=False, labelled_only=False):
+    """
+    Write a recording back to CSV with a Timestamp column, the channels and,
+    if it has label segments, an Emotion column. With `append=True` rows
+    are added to an existing CSV (header only if it is new), and with
+    `labelled_only=True` rows outside every label segment are left out.
+    """
+    rec = Recording(rec_path)
+    has_label = bool(rec.labels)
+    ranges = [(start, stop) for _, start, stop in rec.labels] if labelled_only else [(0, len(rec))]
+    new_file = not append or not os.path.isfile(csv_path) or os.path.getsize(csv_path) == 0
+    with open(csv_path, "a" if append else "w", newline="") as f:
+        if new_file:
+            f.write(",".join(["Timestamp", *rec.channels] + (["Emotion"] if has_label else [])) + "\n")
+        fmt = ["%.15g"] + ["%.9g"] * len(rec.channels)
+        for range_start, range_stop in ranges:
+            for start in range(range_start, range_stop, chunk_rows):
+                rows = rec.samples(start, min(start + chunk_rows, range_stop))
+                if not has_label:
+                    np.savetxt(f, rows, fmt=fmt, delimiter=",")
+                    continue
+                labels = np.full(len(rows), "", dtype=object)
+                for label, a, b in rec.labels:
+                    labels[max(a - start, 0):max(b - start, 0)] = label
+                np.savetxt(f, np.column_stack([rows.astype(object), labels]), fmt=fmt + ["%s"], delimiter=",")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert EEG recordings between CSV and .eegrec.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="CSV files or directories of CSVs -> .eegrec")
+    imp.add_argument("paths", nargs="+")
+    imp.add_argument("--fs", type=int, default=512)
+    exp = sub.add_parser("export", help=".eegrec -> CSV")
+    exp.add_argument("recording")
+    exp.add_argument("csv")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        export_csv(args.recording, args.csv)
+        print(f"{args.recording} -> {args.csv}")
+        return
+    for path in args.paths:
+        files = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".csv")] \
+            if os.path.isdir(path) else [path]
+        for csv_path in files:
+            out = import_csv(csv_path, fs=args.fs)
+            print(f"{csv_path} -> {out} ({len(Recording(out))} samples)")
+
+
+if __name__ == "__main__":
+    main()
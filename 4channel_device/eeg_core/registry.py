@@ -0,0 +1,229 @@
+"""
+Versioned model registry.
+
+class.py (2 raw-sample features) and classification.py (10 window features)
+used to overwrite the same scaler.joblib / svm_eeg_model.joblib /
+label_encoder.joblib, so the apps silently loaded whichever script ran
+last. Trained models are now registered under a name, one directory per
+version:
+
+    models/
+        stress/
+            ACTIVE                          version the apps load
+            20261018-142233-3f9c2a1b/
+                manifest.json               feature schema, fs, window, training
+                                            data hash, metrics, file hashes
+                scaler.joblib
+                svm_eeg_model.joblib
+                label_encoder.joblib
+
+Loading checks the file hashes against the manifest once, memory-maps the
+arrays (joblib mmap_mode="r") and keeps the last MODEL_CACHE_SIZE versions
+in an in-process LRU cache. `load(name)` re-reads ACTIVE on every call, so
+`activate` (or registering a new version) switches running apps over on
+their next prediction, without a restart.
+
+    python -m eeg_core.registry list
+    python -m eeg_core.registry activate stress 20261018-142233-3f9c2a1b
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+from .pipeline import MODEL_FILES
+
+MANIFEST = "manifest.json"
+ACTIVE = "ACTIVE"
+MODEL_CACHE_SIZE = 4
+
+_cache = OrderedDict()  # version directory -> LoadedModel, least recently used first
+_cache_lock = threading.Lock()
+
+
+class LoadedModel(namedtuple("LoadedModel", "scaler svm_model label_encoder manifest")):
+    @property
+    def components(self):
+        return self.scaler, self.svm_model, self.label_encoder
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 of a file, or of every file in a directory (e.g. an .eegrec recording)."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            digest.update(name.encode("utf-8"))
+            digest.update(file_sha256(os.path.join(path, name)).encode("ascii"))
+        return digest.hexdigest()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    """A registry directory of named, versioned models."""
+
+    def __init__(self, root="models"):
+        self.root = root
+
+    def _dir(self, name, version=None):
+        return os.path.join(self.root, name) if version is None else os.path.join(self.root, name, version)
+
+    # -------------------- registering --------------------
+    def register(self, name, scaler, svm_model, label_encoder, feature_schema, fs,
+                 window_size=None, step_size=None, training_data=None, metrics=None,
+                 activate=True, **extra):
+        """
+        Save the fitted components as a new version of `name` and return the
+        version string. `feature_schema` is the list of input feature names in
+        order; `training_data` the path of the data the model was trained on
+        (hashed into the manifest); `metrics` a JSON-serializable dict.
+        """
+        import joblib
+
+        created = datetime.now()
+        staging = self._dir(name, f".staging-{os.getpid()}-{created:%H%M%S%f}")
+        os.makedirs(staging)
+        try:
+            for filename, component in zip(MODEL_FILES, (scaler, svm_model, label_encoder)):
+                joblib.dump(component, os.path.join(staging, filename))  # uncompressed: mmap-able
+            hashes = {filename: file_sha256(os.path.join(staging, filename)) for filename in MODEL_FILES}
+            version = f"{created:%Y%m%d-%H%M%S}-{hashes[MODEL_FILES[1]][:8]}"
+            manifest = {
+                "name": name, "version": version, "created": created.isoformat(timespec="seconds"),
+                "feature_schema": list(feature_schema), "fs": fs,
+                "window": {"size": window_size, "step": step_size},
+                "training_data": None if training_data is None else {
+                    "path": os.path.abspath(training_data), "sha256": file_sha256(training_data)},
+                "metrics": metrics or {}, "files": hashes, **extra,
+            }
+            _write_json(os.path.join(staging, MANIFEST), manifest)
+            os.replace(staging, self._dir(name, version))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if activate:
+            self.activate(name, version)
+        return version
+
+    def activate(self, name, version):
+        """Point `name` at `version`; running apps switch on their next load."""
+        if not os.path.isfile(os.path.join(self._dir(name, version), MANIFEST)):
+            raise KeyError(f"{name} has no version {version}")
+        tmp = os.path.join(self._dir(name), ACTIVE + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(version + "\n")
+        os.replace(tmp, os.path.join(self._dir(name), ACTIVE))
+
+    # -------------------- queries --------------------
+    def names(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(n for n in os.listdir(self.root) if os.path.isdir(self._dir(n)))
+
+    def versions(self, name):
+        """Versions of `name`, oldest first."""
+        directory = self._dir(name)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(v for v in os.listdir(directory)
+                      if not v.startswith(".") and os.path.isfile(os.path.join(directory, v, MANIFEST)))
+
+    def active_version(self, name):
+        try:
+            with open(os.path.join(self._dir(name), ACTIVE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def manifest(self, name, version=None):
+        version = version or self.active_version(name)
+        if version is None:
+            raise KeyError(f"no active version of {name}")
+        with open(os.path.join(self._dir(name, version), MANIFEST)) as f:
+            return json.load(f)
+
+    def verify(self, name, version=None):
+        """Raise ValueError if a model file does not match its manifest hash."""
+        manifest = self.manifest(name, version)
+        directory = self._dir(name, manifest["version"])
+        for filename, expected in manifest["files"].items():
+            if file_sha256(os.path.join(directory, filename)) != expected:
+                raise ValueError(f"{name} {manifest['version']}: {filename} does not match its manifest hash")
+        return manifest
+
+    # -------------------- loading --------------------
+    def load(self, name, version=None):
+        """
+        LoadedModel (scaler, svm_model, label_encoder, manifest) of `version`,
+        default the active one. Hashes are verified on the first load of a
+        version; later loads come from the LRU cache.
+        """
+        import joblib
+
+        version = version or self.active_version(name)
+        if version is None:
+            raise KeyError(f"no active version of {name} in {self.root}")
+        directory = os.path.abspath(self._dir(name, version))
+        with _cache_lock:
+            if directory in _cache:
+                _cache.move_to_end(directory)
+                return _cache[directory]
+        manifest = self.verify(name, version)
+        components = [joblib.load(os.path.join(directory, filename), mmap_mode="r") for filename in MODEL_FILES]
+        model = LoadedModel(*components, manifest)
+        with _cache_lock:
+            _cache[directory] = model
+            while len(_cache) > MODEL_CACHE_SIZE:
+                _cache.popitem(last=False)
+        return model
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect and switch registered EEG models.")
+    parser.add_argument("--root", default="models")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="models, versions and their metrics")
+    act = sub.add_parser("activate", help="make a version the one the apps load")
+    act.add_argument("name")
+    act.add_argument("version")
+    ver = sub.add_parser("verify", help="check model files against their manifest hashes")
+    ver.add_argument("name")
+    ver.add_argument("version", nargs="?")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.root)
+    if args.command == "activate":
+        registry.activate(args.name, args.version)
+        print(f"{args.name}: active version is now {args.version}")
+    elif args.command == "verify":
+        manifest = registry.verify(args.name, args.version)
+        print(f"{args.name} {manifest['version']}: all files match")
+    else:
+        for name in registry.names():
+            active = registry.active_version(name)
+            print(name)
+            for version in registry.versions(name):
+                manifest = registry.manifest(name, version)
+                accuracy = manifest["metrics"].get("accuracy")
+                print(f"  {'*' if version == active else ' '} {version}  "
+                      f"{len(manifest['feature_schema'])} features @ {manifest['fs']} Hz"
+                      + ("" if accuracy is None else f"  accuracy {accuracy:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+File-replay stand-in for the Arduino serial port.
+
+Replays a recorded CSV (test.csv, extracted_segments/*.csv,
+test_chunks/*.csv) or .eegrec recording as the same
+"Time(ms),Fp1(uV),Fp2(uV)" byte stream the firmware prints (a column per
+channel of an eeg_core.schema.ChannelSchema), so the acquisition code can
+be exercised without hardware.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .parser import LineParser
+from .recording import Recording, is_recording
+from .schema import DEFAULT_SCHEMA, ChannelSchema
+
+
+def load_recording(path, fs=512, schema=None):
+    """
+    Load a recorded CSV as a float (n, 3) array of [Timestamp, FP1, FP2],
+    or with `schema`, of `schema.columns` picked by name.
+    Files without a Timestamp column (test_chunks/) get synthetic timestamps.
+    Rows that do not parse (e.g. prediction log lines appended to test.csv)
+    are skipped, just like on the live stream. A binary .eegrec recording
+    is read from its memory-mapped columns instead.
+    """
+    if is_recording(path):
+        recording = Recording(path)
+        if schema is None:
+            return recording.samples()[:, :3]
+        return recording.samples(channels=schema.channels)
+    with open(path, "rb") as f:
+        header = f.readline().decode("utf-8").strip().split(",")
+        values = LineParser(n_columns=len(header)).feed(f.read() + b"\n")
+    if header[0] != "Timestamp":
+        t_ms = np.arange(len(values)) * (1000.0 / fs)
+        values = np.column_stack([t_ms, values])
+        header = ["Timestamp", *header]
+    if schema is None:
+        return values[:, :3]
+    return values[:, [header.index(column) for column in schema.columns]]
+
+
+def encode_lines(samples, header=True):
+    """
+    Format rows of [Timestamp, FP1, FP2] (or any number of channels) the
+    way the firmware prints them. `header` is True for the firmware header
+    (the FP1/FP2 one for two channels, CH1..CHn otherwise), False for none,
+    or a ChannelSchema.
+    """
+    samples = np.asarray(samples)
+    n_channels = samples.shape[1] - 1
+    if header is True:
+        header = DEFAULT_SCHEMA if n_channels == DEFAULT_SCHEMA.n_channels else ChannelSchema.of(n_channels)
+    lines = [header.header()] if header else []
+    line = "{:.0f}" + ",{:.6f}" * n_channels
+    lines += [line.format(*row) for row in samples.tolist()]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class ReplayPort:
+    """
+    Minimal pySerial look-alike (`read`, `in_waiting`, `close`) over bytes.
+
+    With `fs` set, bytes are released at the rate the recorded samples would
+    arrive (`speed` times real time); with `fs=None` or `speed=None`
+    everything is available immediately. Samples are newline-terminated
+    lines, or fixed-size binary frames when `record_size` is given. Like
+    pySerial, `read(size)` blocks until `size` bytes are available or
+    `timeout` seconds have passed, then returns what it has.
+
+    `gaps` is a sequence of (first, count) line (or record) ranges to drop
+    from the stream (line 0 is the CSV header), as if they were lost on the
+    link: the samples after a gap still arrive on time, so the device
+    timestamps jump. Together with a `speed` slightly off 1.0 (clock drift)
+    this exercises eeg_core.metrics.
+
+    A recording path is replayed with the FP1/FP2 columns, or with the
+    channels of `schema` (an eeg_core.schema.ChannelSchema) when given.
+    """
+
+    def __init__(self, data, fs=512, speed=1.0, timeout=0.1, record_size=None, gaps=(), schema=None):
+        if not isinstance(data, bytes):
+            data = encode_lines(load_recording(data, fs=fs or 512, schema=schema), header=schema or True)
+        self._data = data
+        self.timeout = timeout
+        self.is_open = True
+        self._pos = 0
+        self._closed = threading.Event()
+        # Byte offset at which each sample ends, for rate limiting
+        if record_size:
+            self._line_ends = np.arange(record_size, len(data) + 1, record_size)
+        else:
+            self._line_ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n")) + 1
+        self._sent = None  # samples kept among the first k of the original stream
+        if gaps:
+            self._drop(gaps)
+        self._rate = fs * speed if fs and speed else None
+        self._t0 = time.monotonic()
+
+    def _drop(self, gaps):
+        ends = self._line_ends
+        keep = np.ones(len(ends), dtype=bool)
+        for first, count in gaps:
+            keep[first:first + count] = False
+        starts = np.concatenate([[0], ends[:-1]])
+        self._data = b"".join(self._data[a:b] for a, b in zip(starts[keep], ends[keep]))
+        self._line_ends = np.cumsum(ends[keep] - starts[keep])
+        self._sent = np.cumsum(keep)
+
+    def _available_end(self):
+        if self._rate is None:
+            return len(self._data)
+        n_lines = int((time.monotonic() - self._t0) * self._rate) + 1
+        if self._sent is not None:
+            n_lines = int(self._sent[min(n_lines, len(self._sent)) - 1])
+        n_lines = min(n_lines, len(self._line_ends))
+        return int(self._line_ends[n_lines - 1]) if n_lines else 0
+
+    @property
+    def in_waiting(self):
+        return max(0, self._available_end() - self._pos)
+
+    @property
+    def exhausted(self):
+        return self._pos >= len(self._data)
+
+    def read(self, size=1):
+        deadline = time.monotonic() + (self.timeout or 0)
+        while True:
+            end = min(self._available_end(), self._pos + size)
+            if end - self._pos >= size or end >= len(self._data) or self._closed.is_set():
+                break
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.001)
+        chunk = self._data[self._pos:end]
+        self._pos = end
+        return chunk
+
+    def close(self):
+        self.is_open = False
+        self._closed.set()
@@ -0,0 +1,117 @@
+"""
+Channel schema: which EEG channels a device streams and a model expects.
+
+The firmware and the apps grew up with two frontal channels, so "FP1" /
+"FP2" were spelled out everywhere. A ChannelSchema carries the channel
+names instead, and everything that depends on them derives from it:
+
+    columns          ("Timestamp", *channels): recorded CSVs, ring buffer rows
+    feature_names    per-channel mean/std/skew/kurtosis, then per-channel
+                     alpha power (the FEATURE_NAMES order for FP1/FP2)
+    header           the firmware's "Time(ms),Fp1(uV),Fp2(uV)" line
+
+Signals are (samples, channels) arrays in schema order, so feature code
+works along an axis for any channel count. A model is compatible with a
+schema when its feature names (registry manifest, or the scaler's
+`feature_names_in_` / `n_features_in_`) match `feature_names`; a board
+with more channels is a new schema and needs its own model.
+"""
+
+import re
+
+TIMESTAMP = "Timestamp"
+STATISTICS = ("mean", "std", "skew", "kurtosis")
+_UNITS = re.compile(r"\s*\(.*\)\s*$")  # "Fp1(uV)" -> "Fp1"
+
+
+class ChannelSchema:
+    """An ordered, immutable set of channel names."""
+
+    def __init__(self, channels):
+        channels = tuple(str(ch) for ch in channels)
+        if not channels:
+            raise ValueError("a schema needs at least one channel")
+        if len(set(channels)) != len(channels):
+            raise ValueError(f"duplicate channel names in {channels}")
+        self.channels = channels
+
+    @classmethod
+    def of(cls, n_channels):
+        """Generic names CH1..CHn for a board that does not name its inputs."""
+        return cls(f"CH{i + 1}" for i in range(n_channels))
+
+    @classmethod
+    def from_header(cls, line):
+        """
+        Schema of a firmware header line such as "Time(ms),Fp1(uV),Fp2(uV)"
+        (channel names upper-cased, like the DataFrame columns: FP1, FP2).
+        """
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        fields = [_UNITS.sub("", field).strip().upper() for field in line.strip().split(",")]
+        return cls(fields[1:])
+
+    @classmethod
+    def from_feature_names(cls, names):
+        """Schema a model's feature list was built for (inverse of `feature_names`)."""
+        channels = [name[:-len("_mean")] for name in names if name.endswith("_mean")]
+        schema = cls(channels)
+        if schema.feature_names != list(names):
+            raise ValueError(f"not a ChannelSchema feature list: {list(names)}")
+        return schema
+
+    @property
+    def n_channels(self):
+        return len(self.channels)
+
+    @property
+    def columns(self):
+        return (TIMESTAMP, *self.channels)
+
+    @property
+    def feature_names(self):
+        names = [f"{ch}_{stat}" for ch in self.channels for stat in STATISTICS]
+        return names + [f"{ch}_alpha_power" for ch in self.channels]
+
+    def header(self):
+        """The firmware header line for these channels (no newline)."""
+        return ",".join(["Time(ms)", *(f"{ch.capitalize()}(uV)" for ch in self.channels)])
+
+    def signals(self, df):
+        """The channel columns of a DataFrame as a float64 (samples, channels) array."""
+        import numpy as np
+
+        return np.asarray(df[list(self.channels)], dtype=np.float64)
+
+    def check_features(self, names):
+        """
+        None if a model taking features `names` (None: unknown) fits this
+        schema, else a message saying why not.
+        """
+        if names is None or list(names) == self.feature_names:
+            return None
+        return (f"model expects {len(names)} features {list(names)}, not the "
+                f"{len(self.feature_names)} of channels {', '.join(self.channels)}")
+
+    def check_model(self, scaler):
+        """check_features for a fitted scaler: its feature names, or at least their count."""
+        names = getattr(scaler, "feature_names_in_", None)
+        if names is not None:
+            return self.check_features([str(name) for name in names])
+        n_features = getattr(scaler, "n_features_in_", None)
+        if n_features is None or n_features == len(self.feature_names):
+            return None
+        return (f"model expects {n_features} features, not the {len(self.feature_names)} "
+                f"of channels {', '.join(self.channels)}")
+
+    def __eq__(self, other):
+        return isinstance(other, ChannelSchema) and self.channels == other.channels
+
+    def __hash__(self):
+        return hash(self.channels)
+
+    def __repr__(self):
+        return f"ChannelSchema({self.channels!r})"
+
+
+DEFAULT_SCHEMA = ChannelSchema(("FP1", "FP2"))
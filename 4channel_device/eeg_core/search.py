@@ -0,0 +1,144 @@
+"""
+Parallel hyperparameter search with time-blocked cross-validation.
+
+The training scripts fitted one SVC(C=1, gamma="scale") on a shuffled
+80/20 split. With windows of 500 samples every 250, a shuffled split puts
+the neighbours of every test window (sharing half its samples) into the
+training set, so the test score mostly measured memorization. Here folds
+are cut along time:
+
+- A label recorded in at least `n_splits` sessions (FeatureStore segments)
+  is split by whole sessions, in recording order.
+- Otherwise each of its sessions is cut into `n_splits` contiguous blocks,
+  fold k testing on block k of every session, and the `purge` rows next to
+  a test block are left out of training (rows that overlap it in time).
+
+Every (parameters, fold) fit is one task for a joblib process pool. The
+feature matrix is not copied to the workers: a FeatureStore's np.memmap is
+sent as a file reference, and other arrays over 1 MB are dumped once to a
+shared memmap by joblib.
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+DEFAULT_GRID = {"kernel": ["rbf"], "C": [0.1, 1, 10, 100], "gamma": ["scale", 0.01, 0.1, 1]}
+
+SearchResult = namedtuple("SearchResult", "summary folds best_params seconds")
+
+
+def overlap_purge(window_size, step_size):
+    """Neighbouring windows on each side that share samples with a window."""
+    return max(-(-window_size // step_size) - 1, 0)
+
+
+def time_blocked_folds(groups, y, n_splits=5, purge=0):
+    """
+    List of (train, test) row index arrays, cut along time as described in
+    the module docstring. `groups` is the session id of every row (rows of a
+    session in time order), `y` its label.
+    """
+    groups, y = np.asarray(groups), np.asarray(y)
+    fold = np.full(len(groups), -1, dtype=np.intp)
+    blocked = []  # (rows of one session, block bounds) for purging
+    for label in np.unique(y):
+        rows = np.flatnonzero(y == label)
+        order, first = np.unique(groups[rows], return_index=True)
+        sessions = order[np.argsort(first)]  # recording order
+        if len(sessions) >= n_splits:
+            for k, part in enumerate(np.array_split(sessions, n_splits)):
+                fold[rows[np.isin(groups[rows], part)]] = k
+            continue
+        for session in sessions:
+            session_rows = rows[groups[rows] == session]
+            bounds = np.linspace(0, len(session_rows), n_splits + 1).astype(np.intp)
+            for k in range(n_splits):
+                fold[session_rows[bounds[k]:bounds[k + 1]]] = k
+            blocked.append((session_rows, bounds))
+
+    folds = []
+    for k in range(n_splits):
+        train = fold != k
+        for session_rows, bounds in blocked:
+            if bounds[k] == bounds[k + 1]:
+                continue
+            train[session_rows[max(bounds[k] - purge, 0):bounds[k]]] = False
+            train[session_rows[bounds[k + 1]:bounds[k + 1] + purge]] = False
+        folds.append((np.flatnonzero(train), np.flatnonzero(fold == k)))
+    return folds
+
+
+def _evaluate(X, y, train, test, params, resampler):
+    """Fit scaler + SVC on the train rows, score on the test rows (runs in a worker)."""
+    from sklearn.base import clone
+    from sklearn.metrics import accuracy_score, balanced_accuracy_score
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+
+    start = time.perf_counter()
+    X_train, y_train = np.asarray(X[train]), y[train]
+    if resampler is not None:
+        X_train, y_train = clone(resampler).fit_resample(X_train, y_train)
+    scaler = StandardScaler()
+    svm_model = SVC(random_state=42, **params).fit(scaler.fit_transform(X_train), y_train)
+    fitted = time.perf_counter()
+    y_pred = svm_model.predict(scaler.transform(np.asarray(X[test])))
+    scored = time.perf_counter()
+    return {"accuracy": accuracy_score(y[test], y_pred),
+            "balanced_accuracy": balanced_accuracy_score(y[test], y_pred),
+            "fit_seconds": fitted - start, "score_seconds": scored - fitted,
+            "n_train": len(y_train), "n_test": len(test), "n_support": int(svm_model.n_support_.sum())}
+
+
+def grid_search(X, y, groups, param_grid=None, n_splits=5, purge=0, rows=None,
+                resampler=None, n_jobs=-1, verbose=0):
+    """
+    Cross-validate every SVC parameter combination of `param_grid` (a dict
+    or list of dicts, as for sklearn's ParameterGrid; default DEFAULT_GRID)
+    on time-blocked folds, fitting in parallel over `n_jobs` processes.
+
+    Parameters:
+        X (array): (rows, n_features) features, ideally a FeatureStore memmap.
+        y (array): integer-encoded labels.
+        groups (array): session id of every row.
+        rows (array): restrict the search to these row indices (e.g. the
+            training part of a holdout split) without copying X.
+        resampler: an imblearn-style object with fit_resample, applied to
+            the training rows of each fold only (e.g. SMOTE).
+
+    Returns SearchResult(summary, folds, best_params, seconds): one row per
+    fit and per parameter combination (mean/std accuracy, balanced
+    accuracy and fit time; best balanced accuracy first, ties broken by
+    fewer support vectors) as DataFrames, the best parameters, and the wall
+    time of the search.
+    """
+    import pandas as pd
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import ParameterGrid
+
+    y = np.asarray(y)
+    rows = np.arange(len(y)) if rows is None else np.asarray(rows)
+    folds = [(rows[train], rows[test])
+             for train, test in time_blocked_folds(np.asarray(groups)[rows], y[rows], n_splits, purge)]
+    candidates = list(ParameterGrid(DEFAULT_GRID if param_grid is None else param_grid))
+
+    start = time.perf_counter()
+    scores = Parallel(n_jobs=n_jobs, verbose=verbose)(
+        delayed(_evaluate)(X, y, train, test, params, resampler)
+        for params in candidates for train, test in folds)
+    seconds = time.perf_counter() - start
+
+    records = []
+    for i, score in enumerate(scores):
+        params = candidates[i // len(folds)]
+        records.append({"params": str(params), "fold": i % len(folds), **score})
+    fold_table = pd.DataFrame(records)
+    summary = (fold_table.groupby("params", sort=False)
+               .agg(accuracy=("accuracy", "mean"), accuracy_std=("accuracy", "std"),
+                    balanced_accuracy=("balanced_accuracy", "mean"),
+                    fit_seconds=("fit_seconds", "mean"), n_support=("n_support", "mean"))
+               .sort_values(["balanced_accuracy", "n_support"], ascending=[False, True]))
+    best = candidates[[str(p) for p in candidates].index(summary.index[0])]
+    return SearchResult(summary, fold_table, best, seconds)
@@ -0,0 +1,321 @@
+"""
+Local prediction service.
+
+Every app process loads scaler.joblib / svm_eeg_model.joblib /
+label_encoder.joblib itself and classifies one row per call. This service
+loads them once and answers JSON over HTTP on localhost or a Unix socket:
+
+    POST /predict   {"features": [[10 values], ...]}       rows in FEATURE_NAMES (schema) order
+                    {"features": [{"FP1_mean": ...}, ...]} or dicts by feature name
+                    {"windows": [{"FP1": [...], "FP2": [...]}, ...], "fs": 512}
+                                                           raw sample windows
+                 -> {"predictions": [{"label", "rating", "distance"}, ...]}
+    GET  /health -> {"status": "ok", "requests": ..., "batches": ..., ...}
+
+Requests are handled on one thread each; their rows are queued to a
+MicroBatcher, which waits up to `max_wait` seconds after the first request
+for others and classifies everything queued (up to `max_batch` rows) in a
+single call (pipeline.classify_batch).
+
+    python -m eeg_core.service --port 8765
+    python -m eeg_core.service --unix /tmp/eeg_predict.sock
+
+PredictionClient talks to either from another process.
+"""
+
+import http.client
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .pipeline import FS, MODEL_NOT_FOUND, classify_batch, extract_features, load_model_components
+from .schema import DEFAULT_SCHEMA, ChannelSchema
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BATCH = 256     # rows per decision_function call
+MAX_WAIT = 0.002    # s to wait for more requests after the first one
+
+
+# ---------------------------------------------------------------------
+# 1) Micro-batching
+# ---------------------------------------------------------------------
+class MicroBatcher:
+    """
+    Collect rows from concurrent `submit` calls into batches for one
+    `predict_batch(X)` call each, which returns per-row sequences.
+
+    `submit` returns a Future resolving to the caller's slice of every
+    returned sequence. If `predict_batch` raises on a batch of several
+    requests, each is retried on its own, so the exception is only set on
+    the future of the request that caused it.
+    """
+
+    def __init__(self, predict_batch, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="eeg-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, X):
+        future = Future()
+        self._queue.put((np.atleast_2d(np.asarray(X, dtype=np.float64)), future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch, rows = [item], len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            while rows < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # finish this batch, then stop
+                    break
+                batch.append(item)
+                rows += len(item[0])
+            self._predict(batch)
+
+    def _predict(self, batch):
+        try:
+            results = self.predict_batch(np.vstack([X for X, _ in batch]))
+        except Exception as e:  # surfaced to the caller through its future
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                for item in batch:
+                    self._predict([item])
+            return
+        start = 0
+        for X, future in batch:
+            future.set_result(tuple(r[start:start + len(X)] for r in results))
+            start += len(X)
+        self.requests += len(batch)
+        self.rows += start
+        self.batches += 1
+
+    def stats(self):
+        return {"requests": self.requests, "rows": self.rows, "batches": self.batches,
+                "mean_batch_rows": self.rows / self.batches if self.batches else 0.0}
+
+
+# ---------------------------------------------------------------------
+# 2) HTTP Server
+# ---------------------------------------------------------------------
+def _feature_rows(payload, schema=DEFAULT_SCHEMA):
+    """
+    (n, n_features) feature array from a /predict request body. Raises
+    ValueError (a 400) for rows without exactly one value per feature name
+    and for non-finite values.
+    """
+    names = schema.feature_names
+    if "windows" in payload:
+        import pandas as pd
+
+        fs = payload.get("fs", FS)
+        rows = [extract_features(pd.DataFrame(window), fs=fs, schema=schema) for window in payload["windows"]]
+    else:
+        rows = payload["features"]
+        if isinstance(rows, dict) or (rows and not isinstance(rows[0], (dict, list))):
+            rows = [rows]  # a single vector
+    X = np.array([[row[name] for name in names] if isinstance(row, dict) else row
+                  for row in rows], dtype=np.float64)
+    if len(X) and X.shape[1:] != (len(names),):
+        raise ValueError(f"expected rows of {len(names)} features ({', '.join(names)}), got shape {X.shape}")
+    if not np.isfinite(X).all():
+        raise ValueError("features must be finite numbers")
+    return X.reshape(-1, len(names))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, one connection per client
+    # Headers and body go out in two writes; without TCP_NODELAY the second
+    # one waits for the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, {"error": f"unknown path {self.path}"})
+        self._send(200, dict(status="ok", model_dir=self.server.model_dir, **self.server.batcher.stats()))
+
+    def do_POST(self):
+        if self.path != "/predict":
+            return self._send(404, {"error": f"unknown path {self.path}"})
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            X = _feature_rows(payload, self.server.schema)
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            return self._send(400, {"error": f"bad request: {e}"})
+        try:
+            labels, ratings, distances = self.server.batcher.submit(X).result()
+        except Exception as e:
+            return self._send(500, {"error": str(e)})
+        self._send(200, {"predictions": [{"label": str(label), "rating": int(rating), "distance": float(d)}
+                                         for label, rating, d in zip(labels, ratings, distances)]})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        return str(self.client_address or "unix")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _UnixHandler(_Handler):
+    disable_nagle_algorithm = False  # not a TCP socket
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ""
+
+
+def make_server(model_dir=".", host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None,
+                max_batch=MAX_BATCH, max_wait=MAX_WAIT, verbose=False, schema=DEFAULT_SCHEMA):
+    """
+    Load the model components for the channels of `schema` from `model_dir`
+    and return a server bound to host:port (or `unix_socket`); call
+    `serve_forever()` on it, and `shutdown()` + `server_close()` to stop.
+    """
+    scaler, svm_model, label_encoder = load_model_components(model_dir, schema=schema)
+    if svm_model is None:
+        raise FileNotFoundError(MODEL_NOT_FOUND)
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = _UnixHTTPServer(unix_socket, _UnixHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+    server.model_dir = os.path.abspath(model_dir)
+    server.schema = schema
+    server.verbose = verbose
+    server.batcher = MicroBatcher(lambda X: classify_batch(X, scaler, svm_model, label_encoder),
+                                  max_batch=max_batch, max_wait=max_wait)
+    return server
+
+
+# ---------------------------------------------------------------------
+# 3) Client
+# ---------------------------------------------------------------------
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=10):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class PredictionClient:
+    """
+    Client for the prediction service at "host:port" or a Unix socket path.
+    Keeps one connection open; use one client per thread.
+    """
+
+    def __init__(self, address=f"{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=10):
+        if os.path.sep in address:
+            self._connection = _UnixHTTPConnection(address, timeout=timeout)
+        else:
+            host, port = address.rsplit(":", 1)
+            self._connection = http.client.HTTPConnection(host, int(port), timeout=timeout)
+
+    def _request(self, method, path, body=None):
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        headers = {} if data is None else {"Content-Type": "application/json"}
+        self._connection.request(method, path, body=data, headers=headers)
+        response = self._connection.getresponse()
+        result = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(f"prediction service: {result.get('error', response.status)}")
+        return result
+
+    def predict(self, features):
+        """
+        Predictions for one feature vector / dict or a list of them, as
+        [{"label", "rating", "distance"}, ...].
+        """
+        if hasattr(features, "to_dict"):  # pandas DataFrame of FEATURE_NAMES columns
+            features = features.to_dict(orient="records")
+        elif isinstance(features, np.ndarray):
+            features = features.tolist()
+        return self._request("POST", "/predict", {"features": features})["predictions"]
+
+    def predict_windows(self, windows, fs=FS, channels=DEFAULT_SCHEMA.channels):
+        """Predictions for raw windows given as {"FP1": [...], "FP2": [...]} (or DataFrames)."""
+        windows = [{ch: np.asarray(w[ch], dtype=float).tolist() for ch in channels} for w in windows]
+        return self._request("POST", "/predict", {"windows": windows, "fs": fs})["predictions"]
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def close(self):
+        self._connection.close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve EEG stress predictions over HTTP.")
+    parser.add_argument("--model-dir", default=".")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="serve on this Unix socket path instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT * 1000)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    parser.add_argument("--channels", default=",".join(DEFAULT_SCHEMA.channels),
+                        help="comma-separated channels the model was trained on (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.model_dir, args.host, args.port, args.unix,
+                         args.max_batch, args.max_wait_ms / 1000, args.verbose,
+                         schema=ChannelSchema(args.channels.split(",")))
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Serving predictions from {server.model_dir} on {where} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+
+
+if __name__ == "__main__":
+    main()
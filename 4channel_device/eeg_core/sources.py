@@ -0,0 +1,228 @@
+"""
+Pluggable EEG data sources.
+
+Everything downstream of the serial port (AcquisitionEngine, LivePredictor,
+SessionRecorder, ...) reads a pySerial-like port, so a source is just a
+port. `open_port` picks the backend from the source string:
+
+    "synthetic"                 SyntheticPort: generated alpha/beta EEG with
+                                blink artifacts, no files or hardware
+    a CSV or .eegrec path       ReplayPort: test.csv, extracted_segments/*.csv,
+                                test_chunks/*.csv, recordings
+    anything else               the serial port of that name (COM3, /dev/ttyACM0)
+
+Synthetic and replayed data are released in blocks at `speed` times real
+time (1.0 = real time, N = N times faster) or, with `speed=None`, as fast as
+the consumer reads. The serial port always runs at the device's rate.
+"""
+
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+from .acquisition import READ_TIMEOUT, AcquisitionEngine
+from .filters import design_bandpass
+from .replay import ReplayPort, encode_lines
+from .schema import DEFAULT_SCHEMA
+from .spectral import BANDS
+
+SYNTHETIC = "synthetic"
+BLINK_SECONDS = 0.3
+CHANNEL_CORRELATION = 0.8  # share of each band's power common to all channels
+
+
+# ---------------------------------------------------------------------
+# 1) Synthetic Signal
+# ---------------------------------------------------------------------
+class SyntheticEEG:
+    """
+    Stateful generator of [Timestamp, FP1, FP2] blocks (`n_channels`
+    channels after the timestamp).
+
+    Each channel is band-limited alpha and beta activity (white noise through
+    Butterworth bandpasses, filter state carried across blocks, so blocks of
+    any size join seamlessly) plus broadband noise and eye blinks: Poisson
+    events at `blinks_per_minute`, each a BLINK_SECONDS raised-cosine bump of
+    about `blink_uv` on every channel. Amplitudes are RMS in uV.
+    """
+
+    def __init__(self, fs=512, alpha_uv=8.0, beta_uv=4.0, noise_uv=3.0,
+                 blinks_per_minute=12.0, blink_uv=100.0, seed=None, n_channels=2):
+        self.fs = fs
+        self.n_channels = n_channels
+        self.rng = np.random.default_rng(seed)
+        self.blink_rate = blinks_per_minute / 60.0 / fs  # per sample
+        self.blink_uv = blink_uv
+        self.noise_uv = noise_uv
+        n = int(BLINK_SECONDS * fs)
+        self._blink = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n) / max(n - 1, 1))
+        self._bands = []  # (sos, zi, gain) per band; zi is per [shared, channel...] source
+        for band, amplitude in ((BANDS["alpha"], alpha_uv), (BANDS["beta"], beta_uv)):
+            sos = design_bandpass(fs, *band, order=2).copy()  # scipy wants a writable SOS
+            # White noise of unit variance keeps ~2 * bandwidth / fs of it after the bandpass
+            gain = amplitude * math.sqrt(fs / (2.0 * (band[1] - band[0])))
+            self._bands.append((sos, np.zeros((sos.shape[0], 2, 1 + n_channels)), gain))
+        self.reset()
+
+    def reset(self):
+        self.position = 0  # samples generated so far
+        for _, zi, _ in self._bands:
+            zi[:] = 0
+        self._blinks = []  # onset sample of blinks that may still overlap new blocks
+        self._next_blink = self._draw_blink(0)
+
+    def _draw_blink(self, after):
+        if self.blink_rate <= 0:
+            return math.inf
+        return after + int(self.rng.exponential(1.0 / self.blink_rate))
+
+    def generate(self, n):
+        """Next `n` samples as a float64 (n, 1 + n_channels) [Timestamp, FP1, FP2] block."""
+        from scipy.signal import sosfilt
+
+        start = self.position
+        out = np.empty((n, 1 + self.n_channels))
+        out[:, 0] = (start + np.arange(n)) * (1000.0 / self.fs)
+        shared = math.sqrt(CHANNEL_CORRELATION)
+        own = math.sqrt(1.0 - CHANNEL_CORRELATION)
+        signal = self.rng.normal(0.0, self.noise_uv, (n, self.n_channels))
+        for sos, zi, gain in self._bands:
+            sources, zi[:] = sosfilt(sos, self.rng.standard_normal((n, 1 + self.n_channels)), axis=0, zi=zi)
+            signal += gain * (shared * sources[:, :1] + own * sources[:, 1:])
+
+        end = start + n
+        while self._next_blink < end:
+            self._blinks.append(self._next_blink)
+            self._next_blink = self._draw_blink(self._next_blink)
+        blink_len = len(self._blink)
+        for onset in self._blinks:
+            a, b = max(onset, start), min(onset + blink_len, end)
+            if a < b:
+                signal[a - start:b - start] += self.blink_uv * self._blink[a - onset:b - onset, None]
+        self._blinks = [onset for onset in self._blinks if onset + blink_len > end]
+
+        out[:, 1:] = signal
+        self.position = end
+        return out
+
+
+# ---------------------------------------------------------------------
+# 2) Synthetic Port
+# ---------------------------------------------------------------------
+class SyntheticPort:
+    """
+    pySerial look-alike streaming SyntheticEEG lines in the firmware format.
+
+    Samples are generated in blocks when read: at `speed` times real time
+    (`speed=None`: as many as the read asks for). `duration` seconds of
+    signal, or endless with `duration=None`. The lines carry the channels
+    of `schema` (an eeg_core.schema.ChannelSchema). Extra keyword arguments
+    go to SyntheticEEG.
+    """
+
+    BYTES_PER_VALUE = 8  # rough size of one encoded column, for sizing blocks
+
+    def __init__(self, fs=512, speed=1.0, duration=None, timeout=0.1, schema=DEFAULT_SCHEMA, **signal):
+        self.fs = fs
+        self.timeout = timeout
+        self.is_open = True
+        self.schema = schema
+        self.signal = SyntheticEEG(fs, n_channels=schema.n_channels, **signal)
+        self._total = None if duration is None else int(duration * fs)
+        self._rate = fs * speed if speed else None
+        self._pending = bytearray(f"{schema.header()}\n".encode("utf-8"))
+        self._closed = threading.Event()
+        self._t0 = time.monotonic()
+
+    def _due(self):
+        """Samples that should have been sent by now."""
+        if self._rate is None:
+            return math.inf
+        return int((time.monotonic() - self._t0) * self._rate) + 1
+
+    def _fill(self, size):
+        due = self._due()
+        if self._total is not None:
+            due = min(due, self._total)
+        n = due - self.signal.position
+        if math.isinf(n):  # as fast as possible: a second of signal, or enough for this read
+            line_bytes = self.BYTES_PER_VALUE * len(self.schema.columns)
+            n = 0 if len(self._pending) >= max(size, 1) else max(size // line_bytes + 1, self.fs)
+            if self._total is not None:
+                n = min(n, self._total - self.signal.position)
+        if n > 0:
+            self._pending += encode_lines(self.signal.generate(int(n)), header=False)
+
+    @property
+    def in_waiting(self):
+        self._fill(0)
+        return len(self._pending)
+
+    @property
+    def exhausted(self):
+        return self._total is not None and self.signal.position >= self._total and not self._pending
+
+    def read(self, size=1):
+        deadline = time.monotonic() + (self.timeout or 0)
+        while True:
+            self._fill(size)
+            ended = self._total is not None and self.signal.position >= self._total
+            if len(self._pending) >= size or ended or self._closed.is_set():
+                break
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.001)
+        chunk = bytes(self._pending[:size])
+        del self._pending[:size]
+        return chunk
+
+    def close(self):
+        self.is_open = False
+        self._closed.set()
+
+
+# ---------------------------------------------------------------------
+# 3) Source Selection
+# ---------------------------------------------------------------------
+def open_port(source, fs=512, speed=1.0, baud_rate=500000, schema=None, **kwargs):
+    """
+    Port for `source`: SYNTHETIC, a recorded CSV/.eegrec path, or a serial
+    port name. `speed` applies to synthetic and replayed sources, `schema`
+    (the channels to generate or replay; default FP1/FP2) to those too, as
+    a serial port streams whatever its firmware sends. Extra keyword
+    arguments go to the backend (e.g. `duration`, `seed`, `gaps`).
+    """
+    if source == SYNTHETIC:
+        return SyntheticPort(fs=fs, speed=speed, schema=schema or DEFAULT_SCHEMA, **kwargs)
+    if os.path.exists(source):
+        return ReplayPort(source, fs=fs, speed=speed, schema=schema, **kwargs)
+    import serial  # PySerial
+
+    return serial.Serial(source, baud_rate, timeout=READ_TIMEOUT, **kwargs)
+
+
+def read_samples(source, duration_seconds, fs=512, speed=1.0, schema=DEFAULT_SCHEMA, **kwargs):
+    """
+    Acquire `duration_seconds` of signal (by sample count, not wall time)
+    from `source` and return it as a float32 (n, 3) [Timestamp, FP1, FP2]
+    (`schema.columns`) array. Stops early when a replayed recording runs out.
+    """
+    n = int(duration_seconds * fs)
+    if source == SYNTHETIC:
+        kwargs.setdefault("duration", duration_seconds)
+    engine = AcquisitionEngine(open_port(source, fs, speed, schema=schema, **kwargs), fs=fs, schema=schema)
+    # Blocks are kept from the listener rather than the ring buffer, which an
+    # as-fast-as-possible source could overrun before this thread wakes up
+    blocks = []
+    engine.add_listener(blocks.append)
+    with engine:
+        while engine.running and sum(map(len, blocks)) < n:
+            time.sleep(0.01)
+        if engine.error is not None:
+            raise engine.error
+    if not blocks:
+        return np.empty((0, len(schema.columns)), dtype=np.float32)
+    return np.concatenate(blocks)[:n].astype(np.float32)
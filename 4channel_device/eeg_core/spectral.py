@@ -0,0 +1,139 @@
+"""
+Streaming Welch PSD and EEG band powers.
+
+`compute_alpha_power` runs scipy's `welch` over the whole signal for every
+prediction. StreamingWelch instead keeps the incomplete segment per channel,
+runs one rfft per completed segment (every `hop` samples) and maintains the
+averaged periodogram, so band powers cost a small matrix product at any
+time. Over the same samples it reproduces `scipy.signal.welch` with its
+defaults (Hann window, 50% overlap, constant detrend, density scaling).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .pipeline import ALPHA_BAND, FS
+
+BANDS = {
+    "delta": (0.5, 4.0),
+    "theta": (4.0, 8.0),
+    "alpha": ALPHA_BAND,
+    "beta": (13.0, 30.0),
+    "gamma": (30.0, 45.0),
+}
+
+
+@lru_cache(maxsize=None)
+def _welch_plan(fs, nperseg):
+    """Window, frequency axis and per-bin density scaling for one (fs, nperseg)."""
+    from scipy.signal import get_window
+
+    window = get_window("hann", nperseg)
+    freqs = np.fft.rfftfreq(nperseg, 1.0 / fs)
+    scale = np.full(len(freqs), 2.0 / (fs * np.sum(window ** 2)))
+    scale[0] /= 2  # DC and Nyquist are not doubled in a one-sided PSD
+    if nperseg % 2 == 0:
+        scale[-1] /= 2
+    return window, freqs, scale
+
+
+def band_weights(freqs, bands):
+    """
+    (n_bins, n_bands) matrix W such that psd @ W integrates each band with
+    the trapezoid rule over the bins inside it, like `np.trapz(P[mask], f[mask])`.
+    """
+    weights = np.zeros((len(freqs), len(bands)))
+    for k, (lo, hi) in enumerate(bands):
+        idx = np.flatnonzero((freqs >= lo) & (freqs <= hi))
+        for i, j in zip(idx[:-1], idx[1:]):
+            half = (freqs[j] - freqs[i]) / 2
+            weights[i, k] += half
+            weights[j, k] += half
+    return weights
+
+
+class StreamingWelch:
+    """
+    Averaged periodogram of a (samples, channels) stream.
+
+    With `n_segments=None` every completed segment is averaged (same as
+    `welch` over everything seen so far); with `n_segments=K` only the
+    last K segments are, for continuous monitoring.
+    """
+
+    def __init__(self, fs=FS, nperseg=None, noverlap=None, n_channels=2,
+                 n_segments=None, bands=None):
+        self.fs = fs
+        self.nperseg = int(nperseg or fs)
+        self.hop = self.nperseg - (self.nperseg // 2 if noverlap is None else noverlap)
+        self.n_channels = n_channels
+        self.n_segments = n_segments
+        self.bands = dict(bands or BANDS)
+        self._window, self.freqs, self._scale = _welch_plan(fs, self.nperseg)
+        self._weights = band_weights(self.freqs, list(self.bands.values()))
+        self.reset()
+
+    def reset(self):
+        n_bins = len(self.freqs)
+        self._tail = np.empty((0, self.n_channels))
+        self._psd_sum = np.zeros((self.n_channels, n_bins))
+        self._count = 0  # segments in the average
+        if self.n_segments:
+            self._history = np.zeros((self.n_segments, self.n_channels, n_bins))
+            self._next = 0
+            self._since_recompute = 0
+
+    @property
+    def segments(self):
+        return self._count
+
+    def update(self, block):
+        """Add a (n, n_channels) block; returns the number of new segments."""
+        data = np.concatenate([self._tail, np.asarray(block, dtype=np.float64).reshape(-1, self.n_channels)])
+        if len(data) < self.nperseg:
+            self._tail = data
+            return 0
+        n_new = (len(data) - self.nperseg) // self.hop + 1
+        # (n_new, channels, nperseg) view of the completed segments
+        segments = sliding_window_view(data, self.nperseg, axis=0)[::self.hop][:n_new]
+        segments = segments - segments.mean(axis=-1, keepdims=True)
+        spectrum = np.fft.rfft(segments * self._window, axis=-1)
+        periodograms = (spectrum.real ** 2 + spectrum.imag ** 2) * self._scale
+        self._tail = data[n_new * self.hop:]
+        self._accumulate(periodograms)
+        return n_new
+
+    def _accumulate(self, periodograms):
+        if not self.n_segments:
+            self._psd_sum += periodograms.sum(axis=0)
+            self._count += len(periodograms)
+            return
+        K = self.n_segments
+        periodograms = periodograms[-K:]
+        for p in periodograms:
+            self._psd_sum += p - self._history[self._next]
+            self._history[self._next] = p
+            self._next = (self._next + 1) % K
+        self._count = min(self._count + len(periodograms), K)
+        self._since_recompute += len(periodograms)
+        if self._since_recompute >= K:  # flush accumulated rounding error
+            self._psd_sum = self._history.sum(axis=0)
+            self._since_recompute = 0
+
+    # -------------------- results --------------------
+    def psd(self):
+        """(freqs, (n_channels, n_bins) averaged PSD); NaN before the first segment."""
+        if self._count == 0:
+            return self.freqs, np.full_like(self._psd_sum, np.nan)
+        return self.freqs, self._psd_sum / self._count
+
+    def band_powers(self):
+        """Dict band -> (n_channels,) power, integrated like compute_alpha_power."""
+        _, Pxx = self.psd()
+        powers = Pxx @ self._weights
+        return {name: powers[:, k] for k, name in enumerate(self.bands)}
+
+    def alpha_power(self):
+        return self.band_powers()["alpha"]
@@ -0,0 +1,279 @@
+"""
+Out-of-core training data pipeline.
+
+classification.py used to read all of eeg_emotion_data.csv into pandas,
+sort it globally by Timestamp and keep several full-length filtered copies
+of every channel. Here the recording is read in chunks and split into
+contiguous label segments (one per recording session). Each segment is
+filtered with carried state, windowed incrementally and its window features
+are appended to an on-disk FeatureStore, so peak memory depends on the
+chunk size and window length, not on how many sessions were recorded.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .filters import BANDPASS, BANDPASS_ORDER, NOTCH_FREQ, NOTCH_QUALITY, StreamingFilter
+from .recording import Recording, is_recording
+from .schema import DEFAULT_SCHEMA
+from .windows import feature_names, sliding_window_features
+
+CHANNELS = DEFAULT_SCHEMA.channels
+LABEL_COLUMN = "Emotion"
+CHUNK_ROWS = 100_000
+# A new segment also starts when the Arduino clock jumps back (reset) or
+# pauses for longer than this
+MAX_GAP_MS = 1000.0
+# What the default make_stages applies, recorded with the features
+DEFAULT_STAGES = [{"stage": "StreamingFilter", "band": list(BANDPASS), "order": BANDPASS_ORDER,
+                   "notch": NOTCH_FREQ, "quality": NOTCH_QUALITY}]
+
+
+# ---------------------------------------------------------------------
+# 1) Feature Store
+# ---------------------------------------------------------------------
+class FeatureStore:
+    """
+    Append-only feature matrix on disk.
+
+    A directory with three raw little-endian arrays that grow row by row,
+    read back as np.memmap without loading them:
+        features.f32   float32 (rows, n_columns)
+        labels.i2      int16 index into meta["labels"]
+        segments.i4    int32 id of the recording segment each row came from
+    plus meta.json (column names, label names, row count, build parameters).
+    """
+
+    FILES = {"features": ("features.f32", "<f4"), "labels": ("labels.i2", "<i2"),
+             "segments": ("segments.i4", "<i4")}
+
+    def __init__(self, path, columns=None, params=None):
+        self.path = path
+        meta_path = os.path.join(path, "meta.json")
+        if columns is None:
+            with open(meta_path) as f:
+                self.meta = json.load(f)
+            self._files = None
+            return
+        os.makedirs(path, exist_ok=True)
+        self.meta = {"columns": list(columns), "labels": [], "rows": 0, "segments": 0,
+                     "samples_per_label": {}, "params": params or {}}
+        # Truncate: a store is built in one pass
+        self._files = {key: open(os.path.join(path, name), "wb") for key, (name, _) in self.FILES.items()}
+
+    @property
+    def columns(self):
+        return self.meta["columns"]
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def append(self, features, label, segment):
+        """Append a (n, n_columns) block of feature rows from one segment."""
+        if label not in self.meta["labels"]:
+            self.meta["labels"].append(label)
+        n = len(features)
+        if n == 0:
+            return
+        code = self.meta["labels"].index(label)
+        self._files["features"].write(np.ascontiguousarray(features, dtype="<f4").tobytes())
+        self._files["labels"].write(np.full(n, code, dtype="<i2").tobytes())
+        self._files["segments"].write(np.full(n, segment, dtype="<i4").tobytes())
+        self.meta["rows"] += n
+
+    def close(self):
+        if self._files is None:
+            return
+        for f in self._files.values():
+            f.close()
+        self._files = None
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(self.meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _array(self, key, shape):
+        name, dtype = self.FILES[key]
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=shape)
+
+    def load(self):
+        """
+        (X, y, groups): memory-mapped (rows, n_columns) float32 features, the
+        label names per row, and the segment id per row (for grouped CV).
+        """
+        rows = self.meta["rows"]
+        X = self._array("features", (rows, len(self.columns)))
+        codes = self._array("labels", (rows,))
+        groups = self._array("segments", (rows,))
+        y = np.asarray(self.meta["labels"], dtype=object)[codes] if rows else np.empty(0, dtype=object)
+        return X, y, groups
+
+
+# ---------------------------------------------------------------------
+# 2) Segments & Windows
+# ---------------------------------------------------------------------
+def _read_chunks(path, channels, label_column, chunk_rows):
+    """(times, labels, values) chunks of a labelled CSV or .eegrec recording."""
+    if is_recording(path):
+        rec = Recording(path)
+        for label, start, stop in rec.labels:
+            for a in range(start, stop, chunk_rows):
+                rows = rec.samples(a, min(a + chunk_rows, stop), channels)
+                yield rows[:, 0], np.full(len(rows), label, dtype=object), rows[:, 1:]
+        return
+
+    import pandas as pd
+
+    reader = pd.read_csv(path, usecols=["Timestamp", *channels, label_column], chunksize=chunk_rows)
+    for chunk in reader:
+        chunk = chunk.dropna()
+        yield (chunk["Timestamp"].to_numpy(dtype=np.float64),
+               chunk[label_column].astype(str).to_numpy(),
+               chunk[list(channels)].to_numpy(dtype=np.float64))
+
+
+def iter_label_segments(path, channels=CHANNELS, label_column=LABEL_COLUMN,
+                        chunk_rows=CHUNK_ROWS, max_gap_ms=MAX_GAP_MS):
+    """
+    Read a labelled recording in chunks of `chunk_rows` and yield
+    (segment_id, label, samples) pieces, where samples is a float64
+    (n, n_channels) array. Consecutive pieces with the same segment_id are
+    contiguous in time. Rows keep their file order; nothing is sorted.
+
+    `path` is a CSV with Timestamp, channel and label columns, or an
+    .eegrec recording with label segments (eeg_core.recording).
+    """
+    segment = -1
+    last_label, last_time = None, None
+    for times, labels, values in _read_chunks(path, channels, label_column, chunk_rows):
+        if len(times) == 0:
+            continue
+        # Row i starts a new segment if the label changes or the clock jumps
+        prev_times = np.concatenate([[np.nan if last_time is None else last_time], times[:-1]])
+        prev_labels = np.concatenate([[last_label], labels[:-1]])
+        dt = times - prev_times
+        starts = (labels != prev_labels) | (dt < 0) | (dt > max_gap_ms)
+        bounds = np.concatenate([np.flatnonzero(starts), [len(times)]])
+        if bounds[0] != 0:
+            yield segment, labels[0], values[:bounds[0]]
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            segment += 1
+            yield segment, labels[a], values[a:b]
+        last_label, last_time = labels[-1], times[-1]
+
+
+def label_segments(times, labels, max_gap_ms=MAX_GAP_MS):
+    """
+    Segment id of every row of an in-memory recording, by the same rule as
+    iter_label_segments (label change, clock reset or gap > max_gap_ms).
+    """
+    times, labels = np.asarray(times, dtype=np.float64), np.asarray(labels)
+    if len(times) == 0:
+        return np.empty(0, dtype=np.intp)
+    dt = np.diff(times)
+    starts = (labels[1:] != labels[:-1]) | (dt < 0) | (dt > max_gap_ms)
+    return np.concatenate([[0], np.cumsum(starts)])
+
+
+class SegmentWindower:
+    """
+    Incremental sliding windows over one segment.
+
+    Fed consecutive blocks, it emits the features of the windows that start
+    at 0, step_size, ... exactly as `sliding_window_features` would over the
+    whole segment (including its `range(0, n - window_size, step)` rule), and
+    keeps only the samples the next window still needs.
+    """
+
+    def __init__(self, window_size, step_size, fs):
+        self.window_size = window_size
+        self.step_size = step_size
+        self.fs = fs
+        self._tail = None  # samples from the next window's start onwards
+
+    def feed(self, block):
+        data = block if self._tail is None else np.concatenate([self._tail, block])
+        features = sliding_window_features(data, self.window_size, self.step_size, fs=self.fs)
+        self._tail = data[len(features) * self.step_size:].copy()
+        return features
+
+
+def flush_stages(stages):
+    """
+    Samples still held back by delaying stages (those with a `flush()`, e.g.
+    eeg_core.wavelet.StreamingWaveletDenoiser) at the end of a segment,
+    passed through the stages after them; None if there are none.
+    """
+    out = None
+    for stage in stages:
+        if out is not None:
+            out = stage.process(out)
+        tail = stage.flush() if hasattr(stage, "flush") else None
+        if tail is not None and len(tail):
+            out = tail if out is None or not len(out) else np.concatenate([out, tail])
+    return out
+
+
+def build_feature_store(path, store_path, fs=256, window_size=500, step_size=250,
+                        channels=CHANNELS, label_column=LABEL_COLUMN, chunk_rows=CHUNK_ROWS,
+                        max_gap_ms=MAX_GAP_MS, make_stages=None, stage_params=None):
+    """
+    Stream the labelled recording at `path` (CSV or .eegrec) into a
+    FeatureStore at `store_path` and return it.
+
+    Parameters:
+        fs, window_size, step_size: as in the old classification.extract_features.
+        make_stages (callable): returns the list of preprocessing stages
+            (objects with `process(block)`, and `flush()` if they hold
+            samples back) for a new segment. The default
+            is a causal bandpass + notch StreamingFilter, the live filter.
+        stage_params (list): JSON-serializable description of the stages
+            make_stages returns (kept in the store's params and part of the
+            eeg_core.cache key). Defaults to DEFAULT_STAGES for the default
+            make_stages.
+
+    Windows never span two segments, so recordings of different sessions
+    or labels are not stitched together.
+    """
+    if stage_params is None and make_stages is None:
+        stage_params = DEFAULT_STAGES
+    if make_stages is None:
+        def make_stages():
+            return [StreamingFilter(fs, n_channels=len(channels))]
+
+    params = {"source": os.path.abspath(path), "fs": fs, "window_size": window_size,
+              "step_size": step_size, "channels": list(channels), "max_gap_ms": max_gap_ms,
+              "stages": stage_params}
+    store = FeatureStore(store_path, columns=feature_names(channels), params=params)
+    current, current_label, stages, windower = None, None, None, None
+
+    def end_segment():
+        tail = flush_stages(stages)
+        if tail is not None:
+            store.append(windower.feed(tail), current_label, current)
+
+    with store:
+        for segment, label, samples in iter_label_segments(path, channels, label_column,
+                                                           chunk_rows, max_gap_ms):
+            if segment != current:
+                if stages is not None:
+                    end_segment()
+                current, current_label, stages = segment, label, make_stages()
+                windower = SegmentWindower(window_size, step_size, fs)
+                store.meta["segments"] += 1
+            counts = store.meta["samples_per_label"]
+            counts[label] = counts.get(label, 0) + len(samples)
+            for stage in stages:
+                samples = stage.process(samples)
+            store.append(windower.feed(samples), label, segment)
+        if stages is not None:
+            end_segment()
+    return store
@@ -0,0 +1,134 @@
+"""
+Block-wise streaming wavelet denoiser.
+
+classification.wavelet_denoise ran pywt.wavedec / waverec over a whole
+recording, with one noise sigma (MAD of the finest details) and one
+universal threshold sigma * sqrt(2 log n) for all of it: memory grew with
+the recording and the threshold rose as data was added (n is the total
+length). StreamingWaveletDenoiser instead works on overlapping frames:
+
+    | pad | block | pad |      frame of block + 2 * pad samples
+          ^^^^^^^              only the middle block is emitted
+
+`pad` covers the support of the coarsest basis function at `level`
+((dec_len - 1) * (2**level - 1) + 1 samples, rounded up), so the emitted
+samples do not see the frame edges, and frames start on multiples of
+2**level, so the decomposition stays aligned with the whole-signal one.
+Each frame's sigma (per channel) joins a running median over the last
+`sigma_frames` frames, which follows slow changes in the noise floor but
+ignores short bursts such as blinks, and the threshold uses the fixed frame
+length for n.
+
+Output lags input by `delay` samples (pad + up to one block); `flush()`
+emits the rest at the end of a stream. Memory is O(block + pad) per
+channel. The denoiser is a `process(block)` stage, so it plugs into
+eeg_core.training.build_feature_store (make_stages) and LivePredictor.
+"""
+
+from collections import deque
+
+import numpy as np
+
+WAVELET = "db4"
+LEVEL = 1
+BLOCK_SIZE = 256   # samples emitted per frame (rounded up to a multiple of 2**level)
+SIGMA_FRAMES = 16  # frames in the running median noise estimate
+
+
+class StreamingWaveletDenoiser:
+    """Soft-threshold wavelet denoising of a (samples,) or (samples, channels) stream."""
+
+    def __init__(self, wavelet=WAVELET, level=LEVEL, block_size=BLOCK_SIZE, sigma_frames=SIGMA_FRAMES,
+                 mode="soft"):
+        import pywt
+
+        self._pywt = pywt
+        self.wavelet = pywt.Wavelet(wavelet)
+        self.level = level
+        self.mode = mode
+        align = 2 ** level
+        support = (self.wavelet.dec_len - 1) * (align - 1) + 1
+        self.pad = -(-support // align) * align
+        self.block_size = -(-block_size // align) * align
+        self.sigma_frames = sigma_frames
+        # Universal threshold factor for a full frame
+        self.factor = np.sqrt(2 * np.log(self.block_size + 2 * self.pad))
+        self.reset()
+
+    @property
+    def delay(self):
+        """Worst-case samples between a sample arriving and it being emitted."""
+        return self.pad + self.block_size - 1
+
+    @property
+    def params(self):
+        """JSON-serializable description (stage_params / cache keys)."""
+        return {"stage": "StreamingWaveletDenoiser", "wavelet": self.wavelet.name, "level": self.level,
+                "block_size": self.block_size, "pad": self.pad, "sigma_frames": self.sigma_frames,
+                "mode": self.mode}
+
+    def reset(self):
+        self._buf = None     # samples from `pad` before the next emitted one
+        self._next = 0       # index in _buf of the next sample to emit
+        self._sigmas = deque(maxlen=self.sigma_frames)
+        self._squeeze = False  # stream of 1-D blocks
+
+    @property
+    def sigma(self):
+        """Current running noise estimate per channel (None before the first frame)."""
+        return np.median(np.stack(self._sigmas), axis=0) if self._sigmas else None
+
+    def _denoise(self, frame):
+        pywt = self._pywt
+        level = min(self.level, pywt.dwt_max_level(len(frame), self.wavelet.dec_len))
+        if level == 0:  # a stream shorter than the wavelet passes through
+            return frame.copy()
+        coeffs = pywt.wavedec(frame, self.wavelet, level=level, axis=0)
+        self._sigmas.append(np.median(np.abs(coeffs[-1]), axis=0) / 0.6745)
+        threshold = self.sigma * self.factor
+        for i in range(1, len(coeffs)):
+            coeffs[i] = pywt.threshold(coeffs[i], threshold, mode=self.mode)
+        return pywt.waverec(coeffs, self.wavelet, axis=0)[:len(frame)]
+
+    def _run(self, final):
+        out = []
+        buf = self._buf
+        while True:
+            end = self._next + self.block_size + self.pad
+            if end > len(buf) and not (final and self._next < len(buf)):
+                break
+            start = max(self._next - self.pad, 0)
+            frame = buf[start:min(end, len(buf))]
+            emit = self._denoise(frame)[self._next - start:self._next - start + self.block_size]
+            out.append(emit)
+            self._next += len(emit)
+        # Keep the left context of the next frame only
+        keep = max(self._next - self.pad, 0)
+        self._buf, self._next = buf[keep:], self._next - keep
+        # (not buf[:0]: an empty view would keep the whole buffer alive)
+        return np.concatenate(out) if out else np.empty((0, buf.shape[1]))
+
+    def process(self, block):
+        """Denoised samples that are complete, in order; usually not len(block) of them."""
+        block = np.asarray(block, dtype=np.float64)
+        self._squeeze = block.ndim == 1
+        if self._squeeze:
+            block = block[:, None]
+        self._buf = block.copy() if self._buf is None else np.concatenate([self._buf, block])
+        out = self._run(final=False)
+        return out[:, 0] if self._squeeze else out
+
+    def flush(self):
+        """Emit the remaining samples (end of stream) and reset."""
+        if self._buf is None:
+            return np.empty(0)
+        squeeze = self._squeeze
+        out = self._run(final=True)
+        self.reset()
+        return out[:, 0] if squeeze else out
+
+    def denoise(self, signal):
+        """Whole signal in, whole signal out (same length), in bounded frames."""
+        signal = np.asarray(signal, dtype=np.float64)
+        self.reset()
+        return np.concatenate([self.process(signal), self.flush()])